@@ -0,0 +1,18 @@
+#!/usr/bin/env python
+"""
+Schedule Migration Script
+
+This script imports an existing content_schedule.json into the SQLite schedule store.
+"""
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+# Import the migration module
+from src.utils.migrate_schedule import main
+
+if __name__ == "__main__":
+    main()
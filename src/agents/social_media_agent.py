@@ -1,11 +1,12 @@
 import logging
 from crewai import Agent
 from crewai.tools import BaseTool
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from src.tools.gemini_image_tool import GeminiImageTool
 from src.tools.linkedin_tool import LinkedInTool
 from src.tools.twitter_tool import TwitterTool
 from src.tools.scheduler_tool import SchedulerTool
+from src.utils.image_variants import prepare_variants
 from datetime import datetime, timedelta
 from langchain_openai import ChatOpenAI
 from .content_strategy_agent import ContentStrategyAgent
@@ -576,13 +577,14 @@ class SocialMediaAgent:
             logger.error(f"Error posting content: {str(e)}")
             return {"success": False, "error": f"Error posting content: {str(e)}"}
 
-    def generate_image(self, prompt: str, reference_image_path: Optional[str] = None) -> str:
+    def generate_image(self, prompt: str, reference_image_path: Optional[str] = None, use_cache: bool = True) -> str:
         """
         Generate an image based on the prompt.
         
         Args:
             prompt (str): Description of the image to generate
             reference_image_path (Optional[str]): Path to a reference image
+            use_cache (bool): Reuse an image already generated for the same request
             
         Returns:
             str: Path to the generated image
@@ -596,7 +598,8 @@ class SocialMediaAgent:
                 # Use the image tool to generate the image
                 result = image_tool._run(
                     prompt=prompt,
-                    reference_image_path=reference_image_path
+                    reference_image_path=reference_image_path,
+                    use_cache=use_cache
                 )
                 return result
             else:
@@ -606,6 +609,88 @@ class SocialMediaAgent:
             logger.error(f"Error generating image: {str(e)}")
             return f"Error generating image: {str(e)}"
 
+    def generate_images(
+        self,
+        prompts: List[Any],
+        reference_image_path: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True
+    ) -> Iterator[dict]:
+        """
+        Generate images for many prompts concurrently.
+        
+        Args:
+            prompts (List[Any]): Prompts, or dicts with a "prompt" and any keys to pass through
+            reference_image_path (Optional[str]): Reference image for prompts that do not set their own
+            max_concurrency (Optional[int]): Generations running at once
+            use_cache (bool): Reuse images already generated for the same request
+            
+        Yields:
+            dict: The result of each generation as soon as it finishes, with
+            "index" and "request" identifying the prompt
+        """
+        logger.info(f"Generating {len(prompts)} images")
+        image_tool = next((tool for tool in self.tools if isinstance(tool, GeminiImageTool)), None)
+        if not image_tool:
+            logger.error("Image generation tool not found")
+            for index, prompt in enumerate(prompts):
+                yield {"success": False, "error": "Image generation tool not found", "index": index, "request": prompt}
+            return
+        
+        requests = []
+        for prompt in prompts:
+            request = dict(prompt) if isinstance(prompt, dict) else {"prompt": prompt}
+            if reference_image_path:
+                request.setdefault("reference_image_path", reference_image_path)
+            requests.append(request)
+        
+        for result in image_tool.generate_batch(requests, max_concurrency=max_concurrency, use_cache=use_cache):
+            if not result.get("success", False):
+                logger.error(f"Error generating image {result['index']}: {result.get('error')}")
+            yield result
+    
+    def generate_plan_images(
+        self,
+        content_items: List[dict],
+        reference_image_path: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True
+    ) -> Iterator[dict]:
+        """
+        Generate an image for each content plan item, streaming the items back as their image is ready.
+        
+        Items with an "image_prompt" use it; other items get a prompt built
+        from their platform, theme and content. Items can be scheduled as they
+        arrive instead of after the whole batch; the upload variant for the
+        item's platform is prepared in the background.
+        
+        Args:
+            content_items (List[dict]): Items from execute_content_plan
+            reference_image_path (Optional[str]): Reference image for every item
+            max_concurrency (Optional[int]): Generations running at once
+            use_cache (bool): Reuse images already generated for the same request
+            
+        Yields:
+            dict: Each content item, with "image_path" set when its image was generated
+            or "image_error" when it failed
+        """
+        prompts = []
+        for item in content_items:
+            prompt = item.get("image_prompt") or (
+                f"An engaging image for a {item.get('platform', 'social media')} post "
+                f"about {item.get('theme', 'the topic')}: {item.get('content', '')[:500]}"
+            )
+            prompts.append({"prompt": prompt})
+        
+        for result in self.generate_images(prompts, reference_image_path, max_concurrency, use_cache):
+            item = dict(content_items[result["index"]])
+            if result.get("success", False):
+                item["image_path"] = result.get("image_path")
+                prepare_variants(item["image_path"], [item.get("platform", "")])
+            else:
+                item["image_error"] = result.get("error")
+            yield item
+
     def check_engagement(self, platform: str, post_id: str) -> dict:
         """
         Check engagement metrics for a post.
@@ -7,6 +7,19 @@ load_dotenv()
 # API Keys
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_IMAGE_MODEL = os.getenv("GEMINI_IMAGE_MODEL", "gemini-2.0-flash-exp-image-generation")
+# Create the Gemini client and open its connection when the web UI starts
+GEMINI_WARMUP = os.getenv("GEMINI_WARMUP", "true").lower() == "true"
+# Image generations running at once in a batch, and generation requests allowed per minute (0 for no limit)
+GEMINI_BATCH_CONCURRENCY = int(os.getenv("GEMINI_BATCH_CONCURRENCY", "4"))
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "10"))
+# Uploaded reference images are reused until Gemini expires them (48 hours); used when the upload reports no expiry
+GEMINI_FILE_TTL = int(os.getenv("GEMINI_FILE_TTL", str(47 * 3600)))
+# Generated images are cached on disk; images unused for GEMINI_IMAGE_CACHE_MIN_AGE
+# seconds are evicted, least recently used first, once the cache exceeds its size
+GENERATED_IMAGES_DIR = os.getenv("GENERATED_IMAGES_DIR", "generated_images")
+GEMINI_IMAGE_CACHE_MAX_BYTES = int(os.getenv("GEMINI_IMAGE_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+GEMINI_IMAGE_CACHE_MIN_AGE = int(os.getenv("GEMINI_IMAGE_CACHE_MIN_AGE", str(30 * 24 * 3600)))
 
 # Social Media API Keys
 LINKEDIN_CLIENT_ID = os.getenv("LINKEDIN_CLIENT_ID")
@@ -18,6 +31,66 @@ TWITTER_API_SECRET = os.getenv("TWITTER_API_SECRET")
 TWITTER_ACCESS_TOKEN = os.getenv("TWITTER_ACCESS_TOKEN")
 TWITTER_ACCESS_TOKEN_SECRET = os.getenv("TWITTER_ACCESS_TOKEN_SECRET")
 
+# Schedule storage backend: "json" (content_schedule.json) or "sqlite"
+SCHEDULE_BACKEND = os.getenv("SCHEDULE_BACKEND", "json")
+
+# Scheduler publishing engine: "threads" (worker pool) or "asyncio" (requires aiohttp)
+SCHEDULER_ENGINE = os.getenv("SCHEDULER_ENGINE", "threads")
+# Posts published at once, in total and per platform, by the thread engine
+SCHEDULER_MAX_WORKERS = int(os.getenv("SCHEDULER_MAX_WORKERS", "8"))
+SCHEDULER_PLATFORM_CONCURRENCY = int(os.getenv("SCHEDULER_PLATFORM_CONCURRENCY", "4"))
+# The same limits for the asyncio engine, where an in-flight post doesn't tie up a thread
+SCHEDULER_ASYNC_MAX_TASKS = int(os.getenv("SCHEDULER_ASYNC_MAX_TASKS", "64"))
+SCHEDULER_ASYNC_PLATFORM_CONCURRENCY = int(os.getenv("SCHEDULER_ASYNC_PLATFORM_CONCURRENCY", "16"))
+
+# HTTP connection pooling for the platform APIs
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+
+# Caching of API lookups (identities, permissions, uploaded media)
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+LINKEDIN_IDENTITY_TTL = int(os.getenv("LINKEDIN_IDENTITY_TTL", "86400"))
+# Keep the resolved LinkedIn identity in CACHE_DIR across restarts
+LINKEDIN_PERSIST_IDENTITY = os.getenv("LINKEDIN_PERSIST_IDENTITY", "false").lower() == "true"
+# How long the LinkedIn posting endpoint that worked for an author is used before probing the others again
+LINKEDIN_ENDPOINT_REPROBE_INTERVAL = int(os.getenv("LINKEDIN_ENDPOINT_REPROBE_INTERVAL", "86400"))
+# How long a granted / denied permission to post as a LinkedIn organization is remembered
+LINKEDIN_ORG_PERMISSION_TTL = int(os.getenv("LINKEDIN_ORG_PERMISSION_TTL", "3600"))
+LINKEDIN_ORG_PERMISSION_DENIED_TTL = int(os.getenv("LINKEDIN_ORG_PERMISSION_DENIED_TTL", "300"))
+
+# Media uploads
+# Files larger than this (in bytes) are uploaded to LinkedIn in parts
+LINKEDIN_MULTIPART_THRESHOLD = int(os.getenv("LINKEDIN_MULTIPART_THRESHOLD", str(50 * 1024 * 1024)))
+LINKEDIN_UPLOAD_CONCURRENCY = int(os.getenv("LINKEDIN_UPLOAD_CONCURRENCY", "4"))
+# How long an uploaded file is reused for later posts instead of being uploaded again
+LINKEDIN_MEDIA_TTL = int(os.getenv("LINKEDIN_MEDIA_TTL", str(7 * 24 * 3600)))
+# Twitter media IDs expire 24 hours after upload
+TWITTER_MEDIA_TTL = int(os.getenv("TWITTER_MEDIA_TTL", str(23 * 3600)))
+# Chunked Twitter uploads: segment size (at most 5 MB), segments sent in parallel,
+# retries of unacknowledged segments and how long to wait for video processing
+TWITTER_UPLOAD_CHUNK_SIZE = int(os.getenv("TWITTER_UPLOAD_CHUNK_SIZE", str(4 * 1024 * 1024)))
+TWITTER_UPLOAD_CONCURRENCY = int(os.getenv("TWITTER_UPLOAD_CONCURRENCY", "3"))
+TWITTER_UPLOAD_RETRIES = int(os.getenv("TWITTER_UPLOAD_RETRIES", "3"))
+TWITTER_PROCESSING_TIMEOUT = int(os.getenv("TWITTER_PROCESSING_TIMEOUT", "300"))
+# Images are resized and re-encoded for each platform before upload, in a pool of
+# IMAGE_PROCESS_WORKERS processes; variants unused for IMAGE_VARIANT_MAX_AGE seconds are deleted
+IMAGE_OPTIMIZATION = os.getenv("IMAGE_OPTIMIZATION", "true").lower() == "true"
+IMAGE_VARIANTS_DIR = os.getenv("IMAGE_VARIANTS_DIR", os.path.join(CACHE_DIR, "image_variants"))
+IMAGE_PROCESS_WORKERS = int(os.getenv("IMAGE_PROCESS_WORKERS", "2"))
+IMAGE_VARIANT_MAX_AGE = int(os.getenv("IMAGE_VARIANT_MAX_AGE", str(30 * 24 * 3600)))
+
+# Engagement monitoring
+# Pages of 100 replies fetched per conversation and check
+TWITTER_REPLY_MAX_PAGES = int(os.getenv("TWITTER_REPLY_MAX_PAGES", "10"))
+# How long the newest seen reply of a conversation is remembered (recent search covers 7 days)
+TWITTER_REPLY_CURSOR_TTL = int(os.getenv("TWITTER_REPLY_CURSOR_TTL", str(8 * 24 * 3600)))
+# Comments per page of a LinkedIn post, and how long the newest seen comment of a post is remembered
+LINKEDIN_COMMENTS_PAGE_SIZE = int(os.getenv("LINKEDIN_COMMENTS_PAGE_SIZE", "100"))
+LINKEDIN_COMMENT_MARK_TTL = int(os.getenv("LINKEDIN_COMMENT_MARK_TTL", str(8 * 24 * 3600)))
+
 # Memory Configuration
 CREWAI_STORAGE_DIR = os.getenv("CREWAI_STORAGE_DIR", "./memory_storage")
 
@@ -14,6 +14,7 @@ from typing import Dict, Any, List
 from src.tools.linkedin_tool import LinkedInTool
 from src.tools.twitter_tool import TwitterTool
 from src.agents.social_media_agent import SocialMediaAgent
+from src.utils.schedule_store import create_schedule_store
 from langchain_openai import ChatOpenAI
 
 # Configure logging
@@ -32,17 +33,20 @@ class SocialMediaMonitor:
     A monitor for checking for comments on social media posts.
     """
     
-    def __init__(self, schedule_file: str = "content_schedule.json", check_interval: int = 300):
+    def __init__(self, schedule_file: str = "content_schedule.json", check_interval: int = 300, engagement_window: int = 7 * 24 * 3600):
         """
         Initialize the social media monitor.
         
         Args:
             schedule_file: Path to the schedule file
             check_interval: Interval in seconds to check for comments
+            engagement_window: How long after publication (in seconds) a post is checked for comments
         """
         self.schedule_file = schedule_file
         self.check_interval = check_interval
+        self.engagement_window = engagement_window
         self.is_running = False
+        self.store = create_schedule_store(schedule_file)
         
         try:
             # Initialize the social media tools
@@ -72,33 +76,15 @@ class SocialMediaMonitor:
         os.makedirs(self.comments_dir, exist_ok=True)
         os.makedirs(self.responses_dir, exist_ok=True)
         
-    def _load_schedule(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Load the schedule from the file."""
-        try:
-            if not os.path.exists(self.schedule_file):
-                return {"scheduled_posts": []}
-                
-            with open(self.schedule_file, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading schedule: {str(e)}")
-            return {"scheduled_posts": []}
-            
-    def _save_schedule(self, schedule: Dict[str, List[Dict[str, Any]]]):
-        """Save the schedule to the file."""
-        try:
-            with open(self.schedule_file, "w") as f:
-                json.dump(schedule, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving schedule: {str(e)}")
-            
-    def _get_comments(self, platform: str, post_id: str) -> List[Dict[str, Any]]:
+    def _get_comments(self, platform: str, post_id: str, new_only: bool = False) -> List[Dict[str, Any]]:
         """
         Get comments on a post.
         
         Args:
             platform: The platform to get comments from
             post_id: The ID of the post to get comments from
+            new_only: Only fetch comments newer than the previous new_only
+                fetch, and move that mark forward (used by the monitor loop)
             
         Returns:
             A list of comments
@@ -109,11 +95,11 @@ class SocialMediaMonitor:
             
         try:
             if platform == "linkedin":
-                result = self.linkedin_tool.get_post_comments(post_id)
+                result = self.linkedin_tool.get_post_comments(post_id, new_only=new_only)
                 if result.get("success", False):
                     return result.get("comments", [])
             elif platform == "twitter":
-                result = self.twitter_tool.get_tweet_replies(post_id)
+                result = self.twitter_tool.get_tweet_replies(post_id, new_only=new_only)
                 if result.get("success", False):
                     return result.get("replies", [])
         except Exception as e:
@@ -178,6 +164,41 @@ class SocialMediaMonitor:
             logger.error(f"Error saving responses: {str(e)}")
             return None
             
+    def _load_responses(self, post_id: str) -> List[Dict[str, Any]]:
+        """
+        Load responses from a file.
+        
+        Args:
+            post_id: The ID of the post the responses are for
+            
+        Returns:
+            A list of responses
+        """
+        try:
+            responses_file = os.path.join(self.responses_dir, f"{post_id}_responses.json")
+            if not os.path.exists(responses_file):
+                return []
+                
+            with open(responses_file, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading responses: {str(e)}")
+            return []
+            
+    def _new_comments(self, post_id: str, current_comments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Get the comments that have not been processed yet.
+        
+        Args:
+            post_id: The ID of the post to check
+            current_comments: Comments fetched from the platform (all of them or only recent ones)
+            
+        Returns:
+            The comments not in the saved comments of the post
+        """
+        known_ids = {comment.get("id") for comment in self._load_comments(post_id)}
+        return [comment for comment in current_comments if comment.get("id") not in known_ids]
+            
     def _has_new_comments(self, post_id: str, current_comments: List[Dict[str, Any]]) -> bool:
         """
         Check if there are new comments.
@@ -189,64 +210,68 @@ class SocialMediaMonitor:
         Returns:
             True if there are new comments, False otherwise
         """
-        # Load the previous comments
-        previous_comments = self._load_comments(post_id)
-        
-        # Check if there are more comments now
-        return len(current_comments) > len(previous_comments)
+        return bool(self._new_comments(post_id, current_comments))
             
-    def check_for_comments(self, platform: str, post_id: str) -> Dict[str, Any]:
+    def check_for_comments(self, platform: str, post_id: str, new_only: bool = False) -> Dict[str, Any]:
         """
         Check for new comments on a post and generate responses.
         
         Args:
             platform: The platform to check
             post_id: The ID of the post to check
+            new_only: Only fetch comments newer than the previous new_only check
+                and move that mark forward. Only the monitor loop sets this;
+                checks from the web UI fetch every comment and leave the mark alone.
             
         Returns:
-            A dictionary with the results of the check
+            A dictionary with the results of the check; "comments" holds every
+            known comment on the post, new ones first
         """
         try:
             logger.info(f"Checking for comments on {platform} post: {post_id}")
             
             # Get the comments
-            comments = self._get_comments(platform, post_id)
+            comments = self._get_comments(platform, post_id, new_only=new_only)
+            saved_comments = self._load_comments(post_id)
             
-            if not comments:
+            if not comments and not saved_comments:
                 return {
                     "success": True,
                     "new_comments": False,
+                    "comments": [],
                     "message": "No comments found"
                 }
             
             # Check if there are new comments
-            if self._has_new_comments(post_id, comments):
+            new_comments = self._new_comments(post_id, comments)
+            all_comments = new_comments + saved_comments
+            if new_comments:
                 logger.info(f"New comments found on {platform} post: {post_id}")
                 
-                # Save the comments
-                comments_file = self._save_comments(post_id, comments)
+                # Save the comments, new ones first like the platforms return them
+                comments_file = self._save_comments(post_id, all_comments)
                 
                 if comments_file and self.agent:
                     # Generate responses using the SocialMediaAgent's respond_to_comments method
                     try:
-                        # Using the agent's respond_to_comments method
+                        # Only the new comments need responses; earlier ones were answered by previous checks
                         responses = self.agent.respond_to_comments(
                             platform=platform,
                             post_id=post_id,
-                            comments=comments
+                            comments=new_comments
                         )
                         
                         # Save the responses
-                        responses_file = self._save_responses(post_id, responses)
+                        responses_file = self._save_responses(post_id, self._load_responses(post_id) + responses)
                         
                         if responses_file:
                             logger.info(f"Generated responses for {platform} post: {post_id}")
                             return {
                                 "success": True,
                                 "new_comments": True,
-                                "comments": comments,
+                                "comments": all_comments,
                                 "responses": responses,
-                                "message": f"Generated responses for {len(comments)} comments"
+                                "message": f"Generated responses for {len(new_comments)} comments"
                             }
                     except Exception as e:
                         logger.error(f"Error generating responses: {str(e)}")
@@ -259,12 +284,14 @@ class SocialMediaMonitor:
                 return {
                     "success": True,
                     "new_comments": False,
+                    "comments": all_comments,
                     "message": "No new comments found"
                 }
                 
             return {
                 "success": True,
                 "new_comments": False,
+                "comments": all_comments,
                 "message": "No new comments to respond to"
             }
         except Exception as e:
@@ -295,18 +322,23 @@ class SocialMediaMonitor:
         try:
             while self.is_running:
                 try:
-                    # Load the schedule
-                    schedule = self._load_schedule()
+                    # Load the posts published recently enough to still get comments
+                    try:
+                        published_posts = self.store.recently_published(time.time() - self.engagement_window)
+                    except Exception as e:
+                        logger.error(f"Error loading schedule: {str(e)}")
+                        published_posts = []
                     
                     # Check for published posts
-                    for post in schedule.get("scheduled_posts", []):
+                    for post in published_posts:
                         try:
-                            if post.get("status") == "published" and post.get("platform_post_id"):
+                            if post.get("platform_post_id"):
                                 platform = post.get("platform", "").lower()
                                 post_id = post.get("platform_post_id")
                                 
-                                # Check for comments and generate responses
-                                result = self.check_for_comments(platform, post_id)
+                                # Check for comments and generate responses; only
+                                # the monitor loop moves the per-post mark forward
+                                result = self.check_for_comments(platform, post_id, new_only=True)
                                 
                                 if not result.get("success", False):
                                     logger.error(f"Error checking comments for {platform} post {post_id}: {result.get('error')}")
@@ -7,12 +7,25 @@ This script handles scheduling and posting of content at specified times.
 import os
 import sys
 import time
-import json
+import heapq
+import asyncio
 import logging
 import datetime
-from typing import Dict, Any, List
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Tuple, Iterable
 from src.tools.linkedin_tool import LinkedInTool
 from src.tools.twitter_tool import TwitterTool
+from src.utils.schedule_store import create_schedule_store, post_schedule_epoch
+from src.utils.async_http import close_async_session
+from src.config.config import (
+    SCHEDULER_ENGINE,
+    SCHEDULER_MAX_WORKERS,
+    SCHEDULER_PLATFORM_CONCURRENCY,
+    SCHEDULER_ASYNC_MAX_TASKS,
+    SCHEDULER_ASYNC_PLATFORM_CONCURRENCY
+)
 
 # Configure logging
 logging.basicConfig(
@@ -30,16 +43,82 @@ class PostScheduler:
     A scheduler for running scheduled social media posts.
     """
     
-    def __init__(self, schedule_file: str = "content_schedule.json", check_interval: int = 60):
+    def __init__(
+        self,
+        schedule_file: str = "content_schedule.json",
+        check_interval: int = 60,
+        change_poll_interval: float = 1.0,
+        compact_interval: int = 3600,
+        archive_interval: int = 600,
+        archive_after: int = 3600,
+        max_workers: int = SCHEDULER_MAX_WORKERS,
+        platform_concurrency: Optional[Dict[str, int]] = None,
+        account_concurrency: Optional[int] = None,
+        ordered_platforms: Optional[Iterable[str]] = None,
+        result_batch_size: int = 50
+    ):
         """
         Initialize the post scheduler.
         
         Args:
             schedule_file: Path to the schedule file
-            check_interval: Interval in seconds to check for scheduled posts
+            check_interval: Interval in seconds to fully resync with the schedule
+            change_poll_interval: Interval in seconds to check the schedule for changes
+            compact_interval: Interval in seconds to compact the schedule store
+            archive_interval: Interval in seconds to archive finished posts
+            archive_after: Seconds a published or failed post stays in the live
+                schedule before it is archived
+            max_workers: Maximum number of posts published in parallel
+            platform_concurrency: Maximum number of in-flight posts per platform
+            account_concurrency: Optional maximum number of in-flight posts per account
+            ordered_platforms: Platforms whose posts are published strictly in
+                schedule order per account. Posts with an "ordering_key" are
+                always published in order within that key.
+            result_batch_size: Number of publish results written back to the schedule at once
         """
         self.schedule_file = schedule_file
         self.check_interval = check_interval
+        self.change_poll_interval = change_poll_interval
+        self.compact_interval = compact_interval
+        self.archive_interval = archive_interval
+        self.archive_after = archive_after
+        self.store = create_schedule_store(schedule_file)
+        
+        # Min-heap of (UTC epoch, post ID) for pending posts
+        self._due_heap: List[Tuple[float, str]] = []
+        self._index_version = None
+        self._index_built_at = 0.0
+        self._schedule_changed = threading.Event()
+        self._last_compacted_at = time.monotonic()
+        self._last_archived_at = 0.0
+        
+        # Publishing pool with per-platform and per-account limits
+        self.max_workers = max_workers
+        self.platform_concurrency = platform_concurrency or {
+            "linkedin": SCHEDULER_PLATFORM_CONCURRENCY,
+            "twitter": SCHEDULER_PLATFORM_CONCURRENCY
+        }
+        self.account_concurrency = account_concurrency
+        self.ordered_platforms = {platform.lower() for platform in (ordered_platforms or [])}
+        self.result_batch_size = result_batch_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # In-flight posts per platform and per account (idle accounts are dropped)
+        self._platform_active: Dict[str, int] = {}
+        self._account_active: Dict[Tuple[str, str], int] = {}
+        # Due posts waiting for a free slot on their platform, in schedule order
+        self._waiting: Dict[str, deque] = {}
+        # Ordered lanes: posts queued behind the lane's in-flight post
+        self._lanes: Dict[Any, deque] = {}
+        self._in_flight: Dict[Future, Dict[str, Any]] = {}
+        self._in_flight_ids = set()
+        self._pending_results: Dict[str, Dict[str, Any]] = {}
+        self._pending_since = 0.0
+        
+        # State of the asyncio engine (see arun)
+        self._tasks = set()
+        self._async_semaphores: Dict[Any, asyncio.Semaphore] = {}
+        # Posts holding or waiting for each semaphore, so idle ones can be dropped
+        self._async_semaphore_users: Dict[Any, int] = {}
         
         try:
             self.linkedin_tool = LinkedInTool()
@@ -51,25 +130,30 @@ class PostScheduler:
             self.linkedin_tool = None
             self.twitter_tool = None
         
-    def _load_schedule(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Load the schedule from the file."""
+    def _compact_schedule(self):
+        """Fold incremental writes (e.g. the status journal) into the schedule snapshot."""
         try:
-            if not os.path.exists(self.schedule_file):
-                return {"scheduled_posts": []}
-                
-            with open(self.schedule_file, "r") as f:
-                return json.load(f)
+            self.store.compact()
         except Exception as e:
-            logger.error(f"Error loading schedule: {str(e)}")
-            return {"scheduled_posts": []}
+            logger.error(f"Error compacting schedule: {str(e)}")
+        self._last_compacted_at = time.monotonic()
             
-    def _save_schedule(self, schedule: Dict[str, List[Dict[str, Any]]]):
-        """Save the schedule to the file."""
+    def _archive_finished_posts(self):
+        """Move published and failed posts out of the live schedule into the archive."""
         try:
-            with open(self.schedule_file, "w") as f:
-                json.dump(schedule, f, indent=2)
+            archived = self.store.archive_posts(finished_before=time.time() - self.archive_after)
+            if archived:
+                logger.info(f"Archived {archived} finished posts")
         except Exception as e:
-            logger.error(f"Error saving schedule: {str(e)}")
+            logger.error(f"Error archiving posts: {str(e)}")
+        self._last_archived_at = time.monotonic()
+            
+    def _maintain_store(self):
+        """Periodically archive finished posts and compact the schedule store."""
+        if time.monotonic() - self._last_archived_at >= self.archive_interval:
+            self._archive_finished_posts()
+        if time.monotonic() - self._last_compacted_at >= self.compact_interval:
+            self._compact_schedule()
             
     def _post_to_platform(self, post: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -108,6 +192,22 @@ class PostScheduler:
                 "error": f"Error posting to {platform}: {str(e)}"
             }
             
+    def _schedule_epoch(self, post: Dict[str, Any]) -> Optional[int]:
+        """
+        Get the scheduled publication time of a post as a UTC epoch timestamp.
+        
+        Args:
+            post: The post to check
+            
+        Returns:
+            The epoch timestamp, or None if the post has no valid schedule time
+        """
+        try:
+            return post_schedule_epoch(post)
+        except Exception as e:
+            logger.error(f"Error parsing schedule time of post {post.get('id')}: {str(e)}")
+            return None
+            
     def _is_due(self, post: Dict[str, Any]) -> bool:
         """
         Check if a post is due to be published.
@@ -118,26 +218,330 @@ class PostScheduler:
         Returns:
             True if the post is due, False otherwise
         """
+        schedule_epoch = self._schedule_epoch(post)
+        return schedule_epoch is not None and time.time() >= schedule_epoch
+        
+    def notify_schedule_changed(self):
+        """Wake up the scheduler loop so that it picks up schedule changes immediately."""
+        self._schedule_changed.set()
+        
+    def _rebuild_due_index(self):
+        """Rebuild the min-heap of pending posts from the schedule."""
+        version = self.store.version()
+        due_heap = []
+        for post in self.store.list_posts(status="scheduled"):
+            schedule_epoch = self._schedule_epoch(post)
+            if schedule_epoch is not None:
+                due_heap.append((schedule_epoch, post.get("id")))
+        heapq.heapify(due_heap)
+        
+        self._due_heap = due_heap
+        self._index_version = version
+        self._index_built_at = time.monotonic()
+        
+    def _due_index_is_stale(self) -> bool:
+        """Check whether the schedule changed since the due index was built."""
+        if self._index_version is None:
+            return True
+        # Resync periodically as a safety net for changes the version check missed
+        if time.monotonic() - self._index_built_at >= self.check_interval:
+            return True
+        return self.store.version() != self._index_version
+        
+    def _seconds_until_next_check(self) -> float:
+        """Time to sleep until the next due post or the next schedule change check."""
+        if not self._due_heap:
+            return self.change_poll_interval
+        return max(0.0, min(self._due_heap[0][0] - time.time(), self.change_poll_interval))
+        
+    def _publish_post(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Publish a due post.
+        
+        Args:
+            post: The post to publish
+            
+        Returns:
+            The status updates to record for the post
+        """
+        logger.info(f"Publishing scheduled post: {post.get('id')}")
+        
+        # Post to the platform
+        return self._result_updates(post, self._post_to_platform(post))
+        
+    def _result_updates(self, post: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn the result of a posting operation into status updates for the post.
+        
+        Args:
+            post: The published post
+            result: The result returned by the platform tool
+            
+        Returns:
+            The status updates to record for the post
+        """
+        if result.get("success", False):
+            logger.info(f"Successfully published post: {post.get('id')}")
+            
+            # Update the post status
+            updates = {
+                "status": "published",
+                "published_at": datetime.datetime.now().isoformat()
+            }
+            
+            # Handle different key names from different platforms
+            if result.get("post_id"):
+                updates["platform_post_id"] = result.get("post_id")
+            elif result.get("tweet_id"):
+                updates["platform_post_id"] = result.get("tweet_id")
+        else:
+            logger.error(f"Failed to publish post: {post.get('id')} - {result.get('error')}")
+            
+            # Update the post status
+            updates = {
+                "status": "failed",
+                "error": result.get("error"),
+                "failed_at": datetime.datetime.now().isoformat()
+            }
+        
+        return updates
+        
+    def _slot_keys(self, post: Dict[str, Any]) -> Tuple[str, Tuple[str, str]]:
+        """Get the platform and account a post's publishing slot is counted against."""
+        platform = post.get("platform", "").lower()
+        return platform, (platform, post.get("account", "default"))
+        
+    def _platform_full(self, platform: str) -> bool:
+        """Check whether a platform already has its maximum number of posts in flight."""
+        return self._platform_active.get(platform, 0) >= self.platform_concurrency.get(platform, self.max_workers)
+        
+    def _account_full(self, account: Tuple[str, str]) -> bool:
+        """Check whether an account already has its maximum number of posts in flight."""
+        return bool(self.account_concurrency) and self._account_active.get(account, 0) >= self.account_concurrency
+        
+    def _reserve_slot(self, post: Dict[str, Any]):
+        """Count a post against its platform and account limits."""
+        platform, account = self._slot_keys(post)
+        self._platform_active[platform] = self._platform_active.get(platform, 0) + 1
+        if self.account_concurrency:
+            self._account_active[account] = self._account_active.get(account, 0) + 1
+            
+    def _release_slot(self, post: Dict[str, Any]):
+        """Free the platform and account slot of a finished post."""
+        platform, account = self._slot_keys(post)
+        self._platform_active[platform] -= 1
+        if self.account_concurrency:
+            self._account_active[account] -= 1
+            if not self._account_active[account]:
+                del self._account_active[account]
+                
+    def _publish_safely(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """Publish a post in a worker thread, turning exceptions into failed status updates."""
         try:
-            schedule_time = post.get("schedule_time")
-            if not schedule_time:
-                return False
+            return self._publish_post(post)
+        except Exception as e:
+            logger.error(f"Error publishing post {post.get('id')}: {str(e)}")
+            return self._error_updates(e)
+                
+    def _error_updates(self, error: Exception) -> Dict[str, Any]:
+        """Status updates for a post whose publishing raised an exception."""
+        return {
+            "status": "failed",
+            "error": f"Error publishing post: {str(error)}",
+            "failed_at": datetime.datetime.now().isoformat()
+        }
+        
+    def _ordering_key(self, post: Dict[str, Any]) -> Optional[Any]:
+        """Get the key of the ordered lane a post belongs to, or None if it can go out in any order."""
+        if post.get("ordering_key"):
+            return ("ordering_key", post.get("ordering_key"))
+        platform = post.get("platform", "").lower()
+        if platform in self.ordered_platforms:
+            return ("account", platform, post.get("account", "default"))
+        return None
+        
+    def _submit(self, post: Dict[str, Any]):
+        """Submit a post whose slot has been reserved to the worker pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="publisher")
+        self._in_flight[self._executor.submit(self._publish_safely, post)] = post
+        
+    def _start_waiting_posts(self):
+        """
+        Submit waiting posts whose platform and account have a free slot.
+        
+        Slots are reserved before a post is submitted, so the pool only ever
+        runs posts that can publish right away. A platform at its limit keeps
+        its posts waiting here instead of tying up pool threads, and other
+        platforms' posts start as soon as a thread is free.
+        """
+        for platform in list(self._waiting):
+            queue = self._waiting[platform]
+            blocked = []
+            while queue and len(self._in_flight) < self.max_workers and not self._platform_full(platform):
+                post = queue.popleft()
+                if self._account_full(self._slot_keys(post)[1]):
+                    # Later posts of other accounts can still go out
+                    blocked.append(post)
+                    continue
+                self._reserve_slot(post)
+                self._submit(post)
+            queue.extendleft(reversed(blocked))
+            if not queue:
+                del self._waiting[platform]
                 
-            # Parse the schedule time
-            schedule_datetime = datetime.datetime.fromisoformat(schedule_time.replace("Z", "+00:00"))
+    def _enqueue(self, post: Dict[str, Any]):
+        """Queue a post for a publishing slot on its platform."""
+        self._waiting.setdefault(self._slot_keys(post)[0], deque()).append(post)
+        
+    def _dispatch(self, posts: List[Dict[str, Any]]):
+        """Queue due posts for publishing, keeping ordered lanes sequential."""
+        for post in posts:
+            self._in_flight_ids.add(post.get("id"))
+            key = self._ordering_key(post)
             
-            # Convert to UTC
-            schedule_datetime = schedule_datetime.astimezone(datetime.timezone.utc)
+            if key is not None:
+                lane = self._lanes.get(key)
+                if lane is not None:
+                    # An earlier post of the lane is in flight; this one goes out after it
+                    lane.append(post)
+                    continue
+                self._lanes[key] = deque()
+            self._enqueue(post)
+        self._start_waiting_posts()
+        
+    def _advance_lane(self, post: Dict[str, Any]):
+        """Queue the next post of a finished post's ordered lane."""
+        key = self._ordering_key(post)
+        if key is None:
+            return
+        lane = self._lanes.get(key)
+        if lane:
+            self._enqueue(lane.popleft())
+        else:
+            self._lanes.pop(key, None)
+            
+    def _collect_results(self, timeout: float = 0) -> bool:
+        """
+        Collect the results of finished posts and start the posts waiting for their slots.
+        
+        Args:
+            timeout: Seconds to wait for at least one post to finish
             
-            # Get the current time in UTC
-            now = datetime.datetime.now(datetime.timezone.utc)
+        Returns:
+            True if any post finished
+        """
+        if not self._in_flight:
+            return False
             
-            # Check if the post is due
-            return now >= schedule_datetime
+        done, _ = wait(self._in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            post = self._in_flight.pop(future)
+            self._release_slot(post)
+            try:
+                updates = future.result()
+            except Exception as e:
+                logger.error(f"Error in publishing task: {str(e)}")
+                updates = self._error_updates(e)
+            self._record_results([(post.get("id"), updates)])
+            self._advance_lane(post)
+        if done:
+            self._start_waiting_posts()
+        return bool(done)
+        
+    def _record_results(self, results: List[Tuple[str, Dict[str, Any]]]):
+        """Buffer publish results until the next batched write."""
+        for post_id, updates in results:
+            if not self._pending_results:
+                self._pending_since = time.monotonic()
+            self._pending_results[post_id] = updates
+        
+    def _take_results_batch(self, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Take the buffered publish results if a batch is due, leaving the buffer empty."""
+        if not self._pending_results:
+            return {}
+        batch_age = time.monotonic() - self._pending_since
+        if not force and len(self._pending_results) < self.result_batch_size and batch_age < self.change_poll_interval:
+            return {}
+        results, self._pending_results = self._pending_results, {}
+        return results
+        
+    def _write_results(self, results: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Write a batch of publish results back to the schedule.
+        
+        Returns:
+            True if the batch was written
+        """
+        # If nobody else changed the schedule since the index was built, our
+        # own write doesn't invalidate the index
+        index_current = self.store.version() == self._index_version
+        try:
+            self.store.update_posts(results)
         except Exception as e:
-            logger.error(f"Error checking if post is due: {str(e)}")
+            logger.error(f"Error saving publish results: {str(e)}")
             return False
+        if index_current:
+            self._index_version = self.store.version()
+        return True
+        
+    def _finish_results(self, results: Dict[str, Dict[str, Any]], written: bool):
+        """Release the posts of a written batch, or put a failed batch back to retry later."""
+        if not written:
+            # Keep the results (and the posts marked in flight) for the next flush
+            self._pending_results = {**results, **self._pending_results}
+            return
+        for post_id in results:
+            self._in_flight_ids.discard(post_id)
+            
+    def _flush_results(self, force: bool = False):
+        """Write buffered publish results back to the schedule in one batch."""
+        results = self._take_results_batch(force)
+        if results:
+            self._finish_results(results, self._write_results(results))
             
+    def _publish_due_posts(self):
+        """Hand every post whose schedule time has passed to the publishing pool."""
+        posts = self._take_due_posts()
+        if posts:
+            self._dispatch(posts)
+        
+    def _take_due_posts(self) -> List[Dict[str, Any]]:
+        """Pop the posts whose schedule time has passed from the due index."""
+        now = time.time()
+        due_ids = []
+        while self._due_heap and self._due_heap[0][0] <= now:
+            _, post_id = heapq.heappop(self._due_heap)
+            if post_id not in self._in_flight_ids:
+                due_ids.append(post_id)
+                
+        if not due_ids:
+            return []
+            
+        # Re-read the posts in case they were cancelled or published in the meantime
+        return [post for post in self.store.get_posts(due_ids) if post.get("status") == "scheduled"]
+        
+    def _wait_for_next_check(self):
+        """Sleep until the next post is due, the schedule changes or a publish finishes."""
+        timeout = self._seconds_until_next_check()
+        if self._in_flight:
+            self._collect_results(timeout)
+        else:
+            self._schedule_changed.wait(timeout)
+            self._schedule_changed.clear()
+            
+    def _shutdown(self):
+        """Wait for in-flight posts and save their results."""
+        # Posts that have not started stay scheduled and go out on the next run
+        self._waiting.clear()
+        self._lanes.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        while self._collect_results():
+            pass
+        self._flush_results(force=True)
+        
     def run(self):
         """Run the scheduler."""
         logger.info("Starting post scheduler")
@@ -145,63 +549,247 @@ class PostScheduler:
         try:
             while True:
                 try:
-                    # Load the schedule
-                    schedule = self._load_schedule()
+                    # Periodically archive finished posts and compact the schedule store
+                    self._maintain_store()
                     
-                    # Check for posts that are due
-                    posts_to_remove = []
-                    for i, post in enumerate(schedule.get("scheduled_posts", [])):
-                        if post.get("status") == "scheduled" and self._is_due(post):
-                            logger.info(f"Publishing scheduled post: {post.get('id')}")
-                            
-                            # Post to the platform
-                            result = self._post_to_platform(post)
-                            
-                            if result.get("success", False):
-                                logger.info(f"Successfully published post: {post.get('id')}")
-                                
-                                # Update the post status
-                                post["status"] = "published"
-                                post["published_at"] = datetime.datetime.now().isoformat()
-                                
-                                # Handle different key names from different platforms
-                                if result.get("post_id"):
-                                    post["platform_post_id"] = result.get("post_id")
-                                elif result.get("tweet_id"):
-                                    post["platform_post_id"] = result.get("tweet_id")
-                                
-                                # Save the updated schedule
-                                self._save_schedule(schedule)
-                            else:
-                                logger.error(f"Failed to publish post: {post.get('id')} - {result.get('error')}")
-                                
-                                # Update the post status
-                                post["status"] = "failed"
-                                post["error"] = result.get("error")
-                                post["failed_at"] = datetime.datetime.now().isoformat()
-                                
-                                # Save the updated schedule
-                                self._save_schedule(schedule)
-                
-                    # Sleep for the check interval
-                    time.sleep(self.check_interval)
+                    # Refresh the due index if the schedule changed
+                    if self._due_index_is_stale():
+                        self._rebuild_due_index()
+                    
+                    # Publish the posts that are due
+                    self._publish_due_posts()
+                    
+                    # Sleep until the next post is due or the schedule changes
+                    self._wait_for_next_check()
+                    
+                    # Write finished results back in batches
+                    self._collect_results()
+                    self._flush_results(force=not self._in_flight)
                 except Exception as e:
                     logger.error(f"Error in scheduler loop: {str(e)}")
+                    self._index_version = None
                     time.sleep(self.check_interval)  # Sleep and try again
                 
         except KeyboardInterrupt:
             logger.info("Stopping post scheduler")
+            self._shutdown()
         except Exception as e:
             logger.error(f"Error in scheduler: {str(e)}")
             # Keep the process running instead of crashing
             time.sleep(60)
             self.run()  # Restart the scheduler
 
+    async def _apost_to_platform(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Post content to the specified platform without blocking the event loop.
+        
+        Args:
+            post: The post to publish
+            
+        Returns:
+            Dictionary containing the result of the posting operation
+        """
+        if self.linkedin_tool is None or self.twitter_tool is None:
+            return {
+                "success": False,
+                "error": "Social media tools are not initialized"
+            }
+            
+        platform = post.get("platform", "").lower()
+        content = post.get("content", "")
+        image_path = post.get("image_path")
+        
+        try:
+            if platform == "linkedin":
+                return await self.linkedin_tool.aexecute(content, image_path)
+            elif platform == "twitter":
+                return await self.twitter_tool.aexecute(content, image_path)
+            else:
+                return {
+                    "success": False,
+                    "error": f"Unsupported platform: {platform}"
+                }
+        except Exception as e:
+            logger.error(f"Error posting to {platform}: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Error posting to {platform}: {str(e)}"
+            }
+            
+    def _get_async_semaphore(self, key: Any, limit: int) -> asyncio.Semaphore:
+        """Get or create the asyncio semaphore that limits concurrency for a key, and count its user."""
+        semaphore = self._async_semaphores.get(key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(limit)
+            self._async_semaphores[key] = semaphore
+        self._async_semaphore_users[key] = self._async_semaphore_users.get(key, 0) + 1
+        return semaphore
+        
+    def _put_async_semaphore(self, key: Any):
+        """Stop counting a semaphore's user, dropping the semaphore once nobody uses it."""
+        self._async_semaphore_users[key] -= 1
+        if not self._async_semaphore_users[key]:
+            del self._async_semaphore_users[key]
+            del self._async_semaphores[key]
+        
+    async def _apublish_with_limits(self, post: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Publish a post once its platform, its account and the engine as a whole have a free slot."""
+        platform = post.get("platform", "").lower()
+        account = post.get("account", "default")
+        
+        keys = [("platform", platform)]
+        limits = [self._get_async_semaphore(keys[0], self.platform_concurrency.get(platform, self.max_workers))]
+        if self.account_concurrency:
+            keys.append(("account", platform, account))
+            limits.append(self._get_async_semaphore(keys[-1], self.account_concurrency))
+        # The total cap is taken last, so that posts waiting for a busy
+        # platform or account don't hold slots other platforms could use
+        keys.append(("total",))
+        limits.append(self._get_async_semaphore(keys[-1], self.max_workers))
+        
+        acquired = []
+        try:
+            for semaphore in limits:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+            logger.info(f"Publishing scheduled post: {post.get('id')}")
+            result = await self._apost_to_platform(post)
+            return post.get("id"), self._result_updates(post, result)
+        except Exception as e:
+            logger.error(f"Error publishing post {post.get('id')}: {str(e)}")
+            return post.get("id"), self._error_updates(e)
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            for key in keys:
+                self._put_async_semaphore(key)
+                
+    async def _apublish(self, post: Dict[str, Any]):
+        """Publish a post, record its result and start the next post of its ordered lane."""
+        try:
+            self._record_results([await self._apublish_with_limits(post)])
+        finally:
+            key = self._ordering_key(post)
+            if key is not None:
+                lane = self._lanes.get(key)
+                if lane:
+                    self._start_task(self._apublish(lane.popleft()))
+                else:
+                    self._lanes.pop(key, None)
+        
+    def _start_task(self, coro):
+        """Run a publishing coroutine as a task on the event loop."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        
+    def _task_done(self, task: asyncio.Task):
+        """Forget a finished publishing task and log unexpected errors."""
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error in publishing task: {str(task.exception())}")
+            
+    def _adispatch(self, posts: List[Dict[str, Any]]):
+        """Start a task per due post, keeping ordered lanes sequential."""
+        for post in posts:
+            self._in_flight_ids.add(post.get("id"))
+            key = self._ordering_key(post)
+            
+            if key is not None:
+                lane = self._lanes.get(key)
+                if lane is not None:
+                    # An earlier post of the lane is in flight; this one starts when it finishes
+                    lane.append(post)
+                    continue
+                self._lanes[key] = deque()
+            self._start_task(self._apublish(post))
+            
+    async def _aflush_results(self, force: bool = False):
+        """
+        Write buffered publish results back to the schedule in a worker thread.
+        
+        The buffer is only touched on the event loop, where publishing tasks
+        record their results; the thread just gets the batch to write.
+        """
+        results = self._take_results_batch(force)
+        if results:
+            self._finish_results(results, await asyncio.to_thread(self._write_results, results))
+            
+    async def _await_next_check(self):
+        """Sleep until the next post is due or a publish finishes."""
+        timeout = self._seconds_until_next_check()
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        else:
+            await asyncio.sleep(timeout)
+            
+    async def _ashutdown(self):
+        """Wait for in-flight posts, save their results and close the HTTP session."""
+        # Lane tasks start their successors, so wait until none are left
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._aflush_results(force=True)
+        await close_async_session()
+        
+    async def arun(self):
+        """
+        Run the scheduler on an asyncio event loop.
+        
+        Same schedule handling as run, but posts are published as tasks that
+        share one HTTP session instead of occupying a worker thread each, so
+        many more requests can be in flight at once. Requires aiohttp.
+        
+        Schedule store reads and writes (which lock files and fsync) run in a
+        worker thread so that they never stall the in-flight posts.
+        """
+        logger.info("Starting post scheduler (asyncio)")
+        
+        try:
+            while True:
+                try:
+                    # Periodically archive finished posts and compact the schedule store
+                    await asyncio.to_thread(self._maintain_store)
+                    
+                    # Refresh the due index if the schedule changed
+                    if await asyncio.to_thread(self._due_index_is_stale):
+                        await asyncio.to_thread(self._rebuild_due_index)
+                    
+                    # Publish the posts that are due
+                    posts = await asyncio.to_thread(self._take_due_posts)
+                    if posts:
+                        self._adispatch(posts)
+                    
+                    # Sleep until the next post is due or a publish finishes
+                    await self._await_next_check()
+                    
+                    # Write finished results back in batches
+                    await self._aflush_results(force=not self._tasks)
+                except Exception as e:
+                    logger.error(f"Error in scheduler loop: {str(e)}")
+                    self._index_version = None
+                    await asyncio.sleep(self.check_interval)  # Sleep and try again
+                    
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            logger.info("Stopping post scheduler")
+            await self._ashutdown()
+            raise
+
 def main():
     """Main function to run the scheduler."""
     try:
-        scheduler = PostScheduler()
-        scheduler.run()
+        if SCHEDULER_ENGINE == "asyncio":
+            # Requests don't tie up a thread each, so many more can be in flight
+            scheduler = PostScheduler(
+                max_workers=SCHEDULER_ASYNC_MAX_TASKS,
+                platform_concurrency={
+                    "linkedin": SCHEDULER_ASYNC_PLATFORM_CONCURRENCY,
+                    "twitter": SCHEDULER_ASYNC_PLATFORM_CONCURRENCY
+                }
+            )
+            asyncio.run(scheduler.arun())
+        else:
+            scheduler = PostScheduler()
+            scheduler.run()
     except Exception as e:
         logger.error(f"Fatal error in scheduler main: {str(e)}")
         # Sleep before exiting to prevent rapid restarts
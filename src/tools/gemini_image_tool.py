@@ -1,10 +1,30 @@
 import os
+import time
 import base64
+import threading
 import google.generativeai as genai
 from crewai.tools import BaseTool
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from pydantic import PrivateAttr
-from src.config.config import GEMINI_API_KEY
+from src.config.config import GEMINI_API_KEY, GEMINI_IMAGE_MODEL, GEMINI_BATCH_CONCURRENCY, GEMINI_FILE_TTL
+from src.utils.genai_client import get_genai_client, generation_quota
+from src.utils.image_cache import get_image_cache, generation_key
+from src.utils.media_cache import media_digest
+from src.utils.ttl_cache import shared_cache, token_fingerprint
+
+# Striped locks for reference image uploads, picked by the image digest
+_reference_locks: List[threading.Lock] = [threading.Lock() for _ in range(64)]
+
+# Sent with every generation request; part of the image cache key
+GENERATION_CONFIG = {
+    "temperature": 1,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+    "response_modalities": ["image", "text"],
+    "response_mime_type": "text/plain",
+}
 
 class GeminiImageTool(BaseTool):
     """Tool that generates images using Google's Gemini 2.0 Flash model."""
@@ -18,9 +38,9 @@ class GeminiImageTool(BaseTool):
         super().__init__()
         # Configure the Gemini API
         genai.configure(api_key=GEMINI_API_KEY)
-        self._model = "gemini-2.0-flash-exp-image-generation"
+        self._model = GEMINI_IMAGE_MODEL
     
-    def _run(self, prompt: str, reference_image_path: Optional[str] = None) -> str:
+    def _run(self, prompt: str, reference_image_path: Optional[str] = None, use_cache: bool = True) -> str:
         """
         Required method for CrewAI tool compatibility.
         Executes the image generation and returns the path to the generated image.
@@ -28,80 +48,71 @@ class GeminiImageTool(BaseTool):
         Args:
             prompt: Text description of the image to generate
             reference_image_path: Optional path to a reference image
+            use_cache: Reuse a previously generated image for the same request
             
         Returns:
             str: Path to the generated image or error message
         """
-        result = self._execute(prompt, reference_image_path)
+        result = self._execute(prompt, reference_image_path, use_cache)
         if result["success"]:
             return result["image_path"]
         else:
             return f"Error: {result.get('error', 'Unknown error')}"
         
-    def _save_binary_file(self, file_name: str, data: bytes) -> str:
-        """Save binary data to a file."""
-        os.makedirs("generated_images", exist_ok=True)
-        file_path = os.path.join("generated_images", file_name)
-        with open(file_path, "wb") as f:
-            f.write(data)
-        return file_path
-    
-    def _execute(self, prompt: str, reference_image_path: Optional[str] = None) -> Dict[str, Any]:
+    def _execute(self, prompt: str, reference_image_path: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
         """
         Generate an image based on the provided prompt.
         
+        Images are cached by model, normalized prompt, reference image content
+        and generation config, so a repeated request returns the image already
+        on disk.
+        
         Args:
             prompt: Text description of the image to generate
             reference_image_path: Optional path to a reference image
+            use_cache: Look the request up in the image cache; False always generates a new image
             
         Returns:
             Dictionary containing the path to the generated image
         """
         try:
-            client = genai.Client()
-            contents = []
+            has_reference = bool(reference_image_path and os.path.exists(reference_image_path))
+            reference_digest = media_digest(reference_image_path) if has_reference else None
+            cache_key = generation_key(self._model, prompt, reference_digest, GENERATION_CONFIG)
+            if use_cache:
+                cached = get_image_cache().get(cache_key)
+                if cached:
+                    return {
+                        "success": True,
+                        "image_path": cached["image_path"],
+                        "mime_type": cached["mime_type"],
+                        "cached": True
+                    }
             
-            # Add reference image if provided
-            if reference_image_path and os.path.exists(reference_image_path):
-                file = client.files.upload(file=reference_image_path)
-                contents.append({
-                    "role": "user",
-                    "parts": [
-                        {"file_uri": file.uri, "mime_type": file.mime_type},
-                        {"text": prompt}
-                    ]
-                })
-            else:
-                contents.append({
-                    "role": "user",
-                    "parts": [{"text": prompt}]
-                })
+            # The client is shared across requests and threads
+            client = get_genai_client()
             
-            # Generate the image
-            response = client.models.generate_content(
-                model=self._model,
-                contents=contents,
-                generation_config={
-                    "temperature": 1,
-                    "top_p": 0.95,
-                    "top_k": 40,
-                    "max_output_tokens": 8192,
-                    "response_modalities": ["image", "text"],
-                    "response_mime_type": "text/plain",
-                }
-            )
+            reference, reused = None, False
+            if has_reference:
+                reference, reused = self._reference_file(client, reference_image_path, reference_digest)
+            
+            try:
+                response = self._generate(client, prompt, reference)
+            except Exception:
+                if not reused:
+                    raise
+                # The remote copy of the reference image may have been deleted
+                # before its recorded expiry; upload it again and retry once
+                self._reference_files().invalidate(self._reference_key(reference_digest))
+                reference, _ = self._reference_file(client, reference_image_path, reference_digest)
+                response = self._generate(client, prompt, reference)
             
             # Process the response
             if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
                 part = response.candidates[0].content.parts[0]
                 if hasattr(part, 'inline_data') and part.inline_data:
-                    # Generate a unique filename
-                    import time
-                    timestamp = int(time.time())
-                    file_name = f"gemini_image_{timestamp}.png"
-                    
-                    # Save the image
-                    file_path = self._save_binary_file(file_name, part.inline_data.data)
+                    # Save the image under its content hash and remember it for this request
+                    file_path = get_image_cache().put(cache_key, part.inline_data.data, part.inline_data.mime_type)
                     
                     return {
                         "success": True,
@@ -124,4 +135,122 @@ class GeminiImageTool(BaseTool):
             return {
                 "success": False,
                 "error": str(e)
-            } 
\ No newline at end of file
+            } 
+    
+    def _generate(self, client, prompt: str, reference: Optional[Dict[str, Any]]):
+        """Send one generation request, with the uploaded reference image if there is one."""
+        contents = []
+        
+        # Add reference image if provided
+        if reference:
+            contents.append({
+                "role": "user",
+                "parts": [
+                    {"file_uri": reference["uri"], "mime_type": reference["mime_type"]},
+                    {"text": prompt}
+                ]
+            })
+        else:
+            contents.append({
+                "role": "user",
+                "parts": [{"text": prompt}]
+            })
+        
+        # Generate the image, waiting for a slot in the per-minute quota
+        generation_quota().acquire()
+        return client.models.generate_content(
+            model=self._model,
+            contents=contents,
+            generation_config=GENERATION_CONFIG
+        )
+    
+    def _reference_files(self):
+        """The persisted cache of uploaded reference images, keyed by API key and content hash."""
+        return shared_cache("gemini_reference_files", GEMINI_FILE_TTL, persist=True)
+    
+    def _reference_key(self, reference_digest: str) -> str:
+        return f"{token_fingerprint(GEMINI_API_KEY)}:{reference_digest}"
+    
+    def _reference_file(self, client, reference_image_path: str, reference_digest: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Get the remote copy of a reference image, uploading it only if it is not cached.
+        
+        Args:
+            client: The Gemini client
+            reference_image_path: Path to the reference image
+            reference_digest: SHA-256 of the reference image
+            
+        Returns:
+            Dictionary with the "uri" and "mime_type" of the uploaded file, and
+            whether it came from the cache
+        """
+        cache_key = self._reference_key(reference_digest)
+        cached = self._reference_files().get(cache_key)
+        if cached:
+            return cached, True
+        
+        # Concurrent generations with the same new reference image upload it once
+        with _reference_locks[int(reference_digest[:8], 16) % len(_reference_locks)]:
+            cached = self._reference_files().get(cache_key)
+            if cached:
+                return cached, True
+            
+            file = client.files.upload(file=reference_image_path)
+            uploaded = {"uri": file.uri, "mime_type": file.mime_type}
+            
+            # Stop reusing the file a little before Gemini deletes it
+            expiration_time = getattr(file, "expiration_time", None)
+            ttl = None
+            if expiration_time is not None:
+                ttl = max(0, expiration_time.timestamp() - time.time() - 600)
+            self._reference_files().set(cache_key, uploaded, ttl=ttl)
+            return uploaded, False
+    
+    def generate_batch(
+        self,
+        requests: Iterable[Union[str, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate many images concurrently, yielding each result as soon as it is ready.
+        
+        Generations share the per-minute quota (GEMINI_REQUESTS_PER_MINUTE)
+        with every other request of the process. Cached images come back
+        without using it.
+        
+        Args:
+            requests: Prompts, or dicts with a "prompt", an optional
+                "reference_image_path" and any other keys to pass through
+                (such as a content item ID)
+            max_concurrency: Generations running at once (defaults to GEMINI_BATCH_CONCURRENCY)
+            use_cache: Reuse previously generated images for the same request
+            
+        Yields:
+            The result of each generation (see _execute), in completion order,
+            with "index" (position in requests) and "request" added
+        """
+        requests = [request if isinstance(request, dict) else {"prompt": request} for request in requests]
+        if not requests:
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency or GEMINI_BATCH_CONCURRENCY, len(requests))))
+        try:
+            futures = {
+                executor.submit(
+                    self._execute,
+                    request.get("prompt", ""),
+                    request.get("reference_image_path"),
+                    use_cache
+                ): index
+                for index, request in enumerate(requests)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                result = dict(future.result())
+                result["index"] = index
+                result["request"] = requests[index]
+                yield result
+        finally:
+            # Stop queued generations if the caller stops consuming results
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -1,14 +1,36 @@
-import requests
+import os
 import json
-from typing import Dict, Any, Optional
+import asyncio
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, Iterator, AsyncIterator
 from crewai.tools import BaseTool
 from pydantic import PrivateAttr
+from src.utils.async_http import arequest
+from src.utils.http_session import get_http_session
+from src.utils.image_variants import optimized_image
+from src.utils.media_upload import open_media, MediaSegment
+from src.utils.media_cache import media_cache, media_cache_key
+from src.utils.ttl_cache import shared_cache, token_fingerprint
 from src.config.config import (
     LINKEDIN_ACCESS_TOKEN,
     LINKEDIN_CLIENT_ID,
-    LINKEDIN_CLIENT_SECRET
+    LINKEDIN_CLIENT_SECRET,
+    LINKEDIN_IDENTITY_TTL,
+    LINKEDIN_ENDPOINT_REPROBE_INTERVAL,
+    LINKEDIN_ORG_PERMISSION_TTL,
+    LINKEDIN_ORG_PERMISSION_DENIED_TTL,
+    LINKEDIN_PERSIST_IDENTITY,
+    LINKEDIN_MULTIPART_THRESHOLD,
+    LINKEDIN_UPLOAD_CONCURRENCY,
+    LINKEDIN_MEDIA_TTL,
+    LINKEDIN_COMMENTS_PAGE_SIZE,
+    LINKEDIN_COMMENT_MARK_TTL
 )
 
+# Comment fields requested from LinkedIn (Rest.li projection)
+COMMENT_PROJECTION = "(paging,elements*(id,actor,created,message))"
+
 class LinkedInTool(BaseTool):
     """Tool for posting content to LinkedIn."""
     
@@ -18,11 +40,13 @@ class LinkedInTool(BaseTool):
     # Use PrivateAttr for instance attributes that shouldn't be part of the model
     _access_token: str = PrivateAttr()
     _api_url: str = PrivateAttr()
+    _http: Any = PrivateAttr()
     
     def __init__(self):
         super().__init__()
         self._access_token = LINKEDIN_ACCESS_TOKEN
         self._api_url = "https://api.linkedin.com/v2"
+        self._http = get_http_session()
         
     def _run(
         self, 
@@ -65,8 +89,12 @@ class LinkedInTool(BaseTool):
             Dictionary containing the result of the posting operation
         """
         try:
+            # Resize and re-encode the image for LinkedIn
+            if image_path:
+                image_path = optimized_image(image_path, "linkedin")
+            
             # Get the user's LinkedIn URN
-            user_info = self._get_user_info()
+            user_info = self._resolve_author()
             if not user_info.get("success", False):
                 # Try to post as an organization if user info fails
                 import os
@@ -78,37 +106,11 @@ class LinkedInTool(BaseTool):
                 
             user_urn = user_info.get("user_urn")
             
-            # Check if this is an organization URN
-            is_org = "organization" in user_urn
-            
-            # Try using the Shares endpoint first (more reliable)
-            headers = {
-                "Authorization": f"Bearer {self._access_token}",
-                "Content-Type": "application/json",
-                "X-Restli-Protocol-Version": "2.0.0"
-            }
-            
-            # Create the shares payload
-            shares_data = {
-                "content": {
-                    "contentEntities": [],
-                    "title": "Post",
-                    "shareCommentary": {
-                        "text": text
-                    },
-                    "shareMediaCategory": "NONE"
-                },
-                "distribution": {
-                    "linkedInDistributionTarget": {}
-                },
-                "owner": user_urn
-            }
-            
-            # Add scheduling if provided
-            if schedule_time:
-                shares_data["scheduledAt"] = schedule_time
+            headers = self._headers()
             
             # Add image if provided
+            media_asset = None
+            media_category = "IMAGE"
             if image_path:
                 # First, upload the image to LinkedIn
                 image_upload_result = self._upload_image(image_path)
@@ -117,125 +119,316 @@ class LinkedInTool(BaseTool):
                 
                 # Add the image to the post
                 media_asset = image_upload_result.get("asset")
+                media_category = image_upload_result.get("media_category", "IMAGE")
+            
+            # Try the endpoint that last worked for this author first
+            response = None
+            for endpoint in self._ordered_endpoints(user_urn, ("shares", "ugcPosts")):
+                if endpoint == "shares":
+                    response = self._http.post(
+                        f"{self._api_url}/shares",
+                        headers=headers,
+                        json=self._shares_payload(user_urn, text, schedule_time, media_asset, media_category),
+                        allow_redirects=True
+                    )
+                    message = "Successfully posted to LinkedIn using shares endpoint"
+                else:
+                    response = self._post_ugc(headers, self._ugc_payload(user_urn, text, schedule_time, media_asset, media_category))
+                    message = "Successfully posted to LinkedIn"
                 
-                # Update the shares data with the image
-                shares_data["content"]["shareMediaCategory"] = "IMAGE"
-                shares_data["content"]["contentEntities"] = [
-                    {
-                        "entity": media_asset
+                if response.status_code in [200, 201]:
+                    self._record_endpoint(user_urn, endpoint, True)
+                    return {
+                        "success": True,
+                        "post_id": self._response_post_id(response),
+                        "message": message
                     }
-                ]
-            
-            # Try posting with the shares endpoint
-            shares_response = requests.post(
-                f"{self._api_url}/shares",
-                headers=headers,
-                json=shares_data,
-                allow_redirects=True
-            )
-            
-            if shares_response.status_code in [200, 201]:
-                post_id = shares_response.headers.get("x-restli-id") or shares_response.json().get("id")
+                self._record_endpoint(user_urn, endpoint, False)
+            
+            self._invalidate_author(response)
+            if media_asset:
+                self._forget_media(user_urn, image_path)
+            if response.status_code == 403 and "ACCESS_DENIED" in response.text:
+                # If every endpoint fails with ACCESS_DENIED, provide a detailed error message
+                return self._permission_error(response)
+            else:
                 return {
-                    "success": True,
-                    "post_id": post_id,
-                    "message": "Successfully posted to LinkedIn using shares endpoint"
-                }
-            
-            # If shares endpoint fails, fall back to UGC Posts endpoint
-            # Create the post payload
-            post_data = {
-                "author": user_urn,
-                "lifecycleState": "PUBLISHED",
-                "specificContent": {
-                    "com.linkedin.ugc.ShareContent": {
-                        "shareCommentary": {
-                            "text": text
-                        },
-                        "shareMediaCategory": "NONE"
-                    }
-                },
-                "visibility": {
-                    "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
+                    "success": False,
+                    "error": f"Failed to post to LinkedIn: {response.status_code} - {response.text}"
                 }
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error posting to LinkedIn: {str(e)}"
             }
             
-            # Add image if provided
-            if image_path:
-                # We already uploaded the image above
-                # Update the post data with the image
-                post_data["specificContent"]["com.linkedin.ugc.ShareContent"]["shareMediaCategory"] = "IMAGE"
-                post_data["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = [
-                    {
-                        "status": "READY",
-                        "description": {
-                            "text": "Image"
-                        },
-                        "media": media_asset,
-                        "title": {
-                            "text": "Image"
-                        }
-                    }
-                ]
+    async def aexecute(
+        self, 
+        text: str, 
+        image_path: Optional[str] = None,
+        schedule_time: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Post content to LinkedIn without blocking the event loop.
+        
+        Same behaviour and result format as _execute. The API calls of the
+        regular posting path are made with the async HTTP client; image
+        uploads and organization posting run in a worker thread.
+        
+        Args:
+            text: The text content to post
+            image_path: Optional path to an image to include in the post
+            schedule_time: Optional ISO-8601 timestamp for scheduling the post
             
-            # Add scheduling if provided
-            if schedule_time:
-                post_data["distribution"] = {
-                    "linkedInDistributionTarget": {
-                        "visibleToGuest": True
-                    }
-                }
-                post_data["scheduledTime"] = schedule_time
-                post_data["lifecycleState"] = "SCHEDULED"
+        Returns:
+            Dictionary containing the result of the posting operation
+        """
+        try:
+            # Resize and re-encode the image for LinkedIn
+            if image_path:
+                image_path = await asyncio.to_thread(optimized_image, image_path, "linkedin")
             
-            # Post to LinkedIn
-            response = requests.post(
-                f"{self._api_url}/ugcPosts",
-                headers=headers,
-                json=post_data,
-                allow_redirects=True  # Allow redirects for 302 responses
-            )
+            # Get the user's LinkedIn URN
+            user_info = await self._aresolve_author()
+            if not user_info.get("success", False):
+                # Try to post as an organization if user info fails
+                import os
+                org_id = os.getenv("LINKEDIN_ORGANIZATION_ID")
+                if org_id:
+                    return await asyncio.to_thread(self._post_as_organization, text, image_path, org_id, schedule_time)
+                else:
+                    return user_info
+                
+            user_urn = user_info.get("user_urn")
+            headers = self._headers()
             
-            if response.status_code in [200, 201]:
-                post_id = response.headers.get("x-restli-id")
-                return {
-                    "success": True,
-                    "post_id": post_id,
-                    "message": "Successfully posted to LinkedIn"
-                }
-            elif response.status_code == 302:
-                # Handle redirect - this is common with LinkedIn API
-                redirect_url = response.headers.get('Location')
-                if redirect_url:
-                    redirect_response = requests.post(
-                        redirect_url,
+            # Add image if provided
+            media_asset = None
+            media_category = "IMAGE"
+            if image_path:
+                image_upload_result = await asyncio.to_thread(self._upload_image, image_path)
+                if not image_upload_result.get("success", False):
+                    return image_upload_result
+                media_asset = image_upload_result.get("asset")
+                media_category = image_upload_result.get("media_category", "IMAGE")
+            
+            # Try the endpoint that last worked for this author first
+            response = None
+            for endpoint in self._ordered_endpoints(user_urn, ("shares", "ugcPosts")):
+                if endpoint == "shares":
+                    response = await arequest(
+                        "POST",
+                        f"{self._api_url}/shares",
                         headers=headers,
-                        json=post_data,
-                        allow_redirects=True
+                        json=self._shares_payload(user_urn, text, schedule_time, media_asset, media_category)
                     )
-                    
-                    if redirect_response.status_code in [200, 201]:
-                        post_id = redirect_response.headers.get("x-restli-id") or redirect_response.json().get("id")
-                        return {
-                            "success": True,
-                            "post_id": post_id,
-                            "message": "Successfully posted to LinkedIn (after redirect)"
-                        }
-                    else:
-                        return {
-                            "success": False,
-                            "error": f"Failed to post to LinkedIn after redirect: {redirect_response.status_code} - {redirect_response.text}"
-                        }
+                    message = "Successfully posted to LinkedIn using shares endpoint"
                 else:
+                    response = await self._apost_ugc(headers, self._ugc_payload(user_urn, text, schedule_time, media_asset, media_category))
+                    message = "Successfully posted to LinkedIn"
+                
+                if response.status_code in [200, 201]:
+                    self._record_endpoint(user_urn, endpoint, True)
                     return {
-                        "success": False,
-                        "error": f"Received redirect without Location header: {response.status_code} - {response.text}"
+                        "success": True,
+                        "post_id": self._response_post_id(response),
+                        "message": message
                     }
-            elif response.status_code == 403 and "ACCESS_DENIED" in response.text:
-                # If both methods fail with ACCESS_DENIED, provide a detailed error message
+                self._record_endpoint(user_urn, endpoint, False)
+            
+            self._invalidate_author(response)
+            if media_asset:
+                self._forget_media(user_urn, image_path)
+            if response.status_code == 403 and "ACCESS_DENIED" in response.text:
+                return self._permission_error(response)
+            else:
                 return {
                     "success": False,
-                    "error": f"""
+                    "error": f"Failed to post to LinkedIn: {response.status_code} - {response.text}"
+                }
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error posting to LinkedIn: {str(e)}"
+            }
+    
+    def _headers(self, content_type: bool = True) -> Dict[str, str]:
+        """Build the request headers for the LinkedIn REST API."""
+        headers = {
+            "Authorization": f"Bearer {self._access_token}",
+            "X-Restli-Protocol-Version": "2.0.0"
+        }
+        if content_type:
+            headers["Content-Type"] = "application/json"
+        return headers
+    
+    def _endpoint_cache(self):
+        """The persisted cache of the posting endpoint that works for each author URN."""
+        return shared_cache("linkedin_endpoints", LINKEDIN_ENDPOINT_REPROBE_INTERVAL, persist=True)
+    
+    def _ordered_endpoints(self, author_urn: str, endpoints: Tuple[str, ...]) -> List[str]:
+        """
+        Order the posting endpoints to try for an author.
+        
+        The endpoint that last worked for the author goes first. Once its
+        cache entry expires, the default order is probed again.
+        """
+        preferred = self._endpoint_cache().get(author_urn)
+        if preferred in endpoints:
+            return [preferred] + [endpoint for endpoint in endpoints if endpoint != preferred]
+        return list(endpoints)
+    
+    def _record_endpoint(self, author_urn: str, endpoint: str, success: bool) -> None:
+        """Remember the endpoint that worked for an author, or demote it after a failure."""
+        cache = self._endpoint_cache()
+        preferred = cache.get(author_urn)
+        if success:
+            if preferred != endpoint:
+                cache.set(author_urn, endpoint)
+        elif preferred == endpoint:
+            cache.invalidate(author_urn)
+    
+    def _response_post_id(self, response) -> Optional[str]:
+        """Get the ID of a created post from a LinkedIn response."""
+        post_id = response.headers.get("x-restli-id")
+        if not post_id:
+            try:
+                post_id = response.json().get("id")
+            except ValueError:
+                post_id = None
+        return post_id
+    
+    def _post_ugc(self, headers: Dict[str, str], post_data: Dict[str, Any]):
+        """Create a post with the UGC Posts endpoint, following a 302 redirect if LinkedIn sends one."""
+        response = self._http.post(
+            f"{self._api_url}/ugcPosts",
+            headers=headers,
+            json=post_data,
+            allow_redirects=True  # Allow redirects for 302 responses
+        )
+        
+        # Handle redirect - this is common with LinkedIn API
+        redirect_url = self._ugc_redirect_url(response)
+        if redirect_url:
+            response = self._http.post(
+                redirect_url,
+                headers=headers,
+                json=post_data,
+                allow_redirects=True
+            )
+        return response
+    
+    async def _apost_ugc(self, headers: Dict[str, str], post_data: Dict[str, Any]):
+        """Async version of _post_ugc, with the same redirect handling."""
+        response = await arequest("POST", f"{self._api_url}/ugcPosts", headers=headers, json=post_data)
+        redirect_url = self._ugc_redirect_url(response)
+        if redirect_url:
+            response = await arequest("POST", redirect_url, headers=headers, json=post_data)
+        return response
+    
+    def _ugc_redirect_url(self, response) -> Optional[str]:
+        """Get the URL a UGC post has to be sent to again, if LinkedIn redirected it."""
+        return response.headers.get("Location") if response.status_code == 302 else None
+    
+    def _shares_payload(
+        self,
+        owner_urn: str,
+        text: str,
+        schedule_time: Optional[str] = None,
+        media_asset: Optional[str] = None,
+        media_category: str = "IMAGE"
+    ) -> Dict[str, Any]:
+        """Build the request body for the /shares endpoint."""
+        shares_data = {
+            "content": {
+                "contentEntities": [],
+                "title": "Post",
+                "shareCommentary": {
+                    "text": text
+                },
+                "shareMediaCategory": "NONE"
+            },
+            "distribution": {
+                "linkedInDistributionTarget": {}
+            },
+            "owner": owner_urn
+        }
+        
+        # Add scheduling if provided
+        if schedule_time:
+            shares_data["scheduledAt"] = schedule_time
+        
+        # Add image if provided
+        if media_asset:
+            shares_data["content"]["shareMediaCategory"] = media_category
+            shares_data["content"]["contentEntities"] = [
+                {
+                    "entity": media_asset
+                }
+            ]
+        
+        return shares_data
+    
+    def _ugc_payload(
+        self,
+        author_urn: str,
+        text: str,
+        schedule_time: Optional[str] = None,
+        media_asset: Optional[str] = None,
+        media_category: str = "IMAGE"
+    ) -> Dict[str, Any]:
+        """Build the request body for the /ugcPosts endpoint."""
+        post_data = {
+            "author": author_urn,
+            "lifecycleState": "PUBLISHED",
+            "specificContent": {
+                "com.linkedin.ugc.ShareContent": {
+                    "shareCommentary": {
+                        "text": text
+                    },
+                    "shareMediaCategory": "NONE"
+                }
+            },
+            "visibility": {
+                "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
+            }
+        }
+        
+        # Add image if provided
+        if media_asset:
+            post_data["specificContent"]["com.linkedin.ugc.ShareContent"]["shareMediaCategory"] = media_category
+            post_data["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = [
+                {
+                    "status": "READY",
+                    "description": {
+                        "text": media_category.title()
+                    },
+                    "media": media_asset,
+                    "title": {
+                        "text": media_category.title()
+                    }
+                }
+            ]
+        
+        # Add scheduling if provided
+        if schedule_time:
+            post_data["distribution"] = {
+                "linkedInDistributionTarget": {
+                    "visibleToGuest": True
+                }
+            }
+            post_data["scheduledTime"] = schedule_time
+            post_data["lifecycleState"] = "SCHEDULED"
+        
+        return post_data
+    
+    def _permission_error(self, response) -> Dict[str, Any]:
+        """Build the error result for a request rejected for missing permissions."""
+        return {
+            "success": False,
+            "error": f"""
 LinkedIn API permission error: Your access token doesn't have the necessary permissions.
 Error details: {response.status_code} - {response.text}
 
@@ -250,19 +443,8 @@ To fix this issue:
 For more information, see the LinkedIn API documentation:
 https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-management/shares/ugc-post-api
 """
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"Failed to post to LinkedIn: {response.status_code} - {response.text}"
-                }
-                
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Error posting to LinkedIn: {str(e)}"
-            }
-            
+        }
+    
     def _post_as_organization(
         self,
         text: str,
@@ -299,31 +481,25 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
                 "Content-Type": "application/json"
             }
             
-            # Try to get organization info to verify permissions
-            org_check_response = requests.get(
-                f"{self._api_url}/organizations/{org_id}",
-                headers=headers,
-                allow_redirects=True  # Allow redirects for 302 responses
-            )
-            
-            if org_check_response.status_code != 200:
+            permission_key = f"{token_fingerprint(self._access_token)}:{org_id}"
+            permission = self._org_permission_cache().get(permission_key)
+            if permission is None:
+                # Try to get organization info to verify permissions
+                org_check_response = self._http.get(
+                    f"{self._api_url}/organizations/{org_id}",
+                    headers=headers,
+                    allow_redirects=True  # Allow redirects for 302 responses
+                )
+                
+                if org_check_response.status_code != 200:
+                    error = self._permission_error(org_check_response)
+                    self._record_org_permission(permission_key, org_check_response, error)
+                    return error
+                self._record_org_permission(permission_key, org_check_response)
+            elif not permission.get("allowed"):
                 return {
                     "success": False,
-                    "error": f"""
-LinkedIn API permission error: Your access token doesn't have the necessary permissions.
-Error details: {org_check_response.status_code} - {org_check_response.text}
-
-To fix this issue:
-1. Make sure your LinkedIn access token has the following permissions:
-   - w_member_social (for posting as yourself)
-   - r_liteprofile (for accessing your profile)
-   - w_organization_social (for posting as an organization)
-2. Generate a new access token with the correct permissions using the LinkedIn Developer Console
-3. If you want to post as an organization, make sure you've added LINKEDIN_ORGANIZATION_ID to your .env file
-
-For more information, see the LinkedIn API documentation:
-https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-management/shares/ugc-post-api
-"""
+                    "error": permission.get("error")
                 }
                 
             # Add image if provided
@@ -336,151 +512,215 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
                     "error": "Image upload for organization posts is not supported in this version. Please post text only."
                 }
             
-            # Try multiple approaches for posting as an organization
+            # Try multiple approaches for posting as an organization, starting
+            # with the one that last worked for it. The assets endpoint only
+            # registers an upload and publishes nothing, so it stays the last
+            # resort and is never remembered as the endpoint that works.
+            responses = {}
+            for endpoint in self._ordered_endpoints(org_urn, ("shares", "ugcPosts")) + ["assets"]:
+                result = self._post_org_endpoint(endpoint, org_urn, text, schedule_time, headers, responses)
+                if endpoint != "assets":
+                    self._record_endpoint(org_urn, endpoint, result is not None)
+                if result is not None:
+                    self._org_permission_cache().set(permission_key, {"allowed": True})
+                    return result
+            
+            shares_response = responses["shares"]
+            ugc_response = responses["ugcPosts"]
             
-            # Approach 1: Try the organization shares endpoint
-            shares_data = {
-                "content": {
-                    "contentEntities": [],
-                    "title": "Post",
-                    "shareCommentary": {
-                        "text": text
-                    },
-                    "shareMediaCategory": "NONE"
-                },
-                "distribution": {
-                    "linkedInDistributionTarget": {}
-                },
-                "owner": org_urn
+            # If all approaches fail, return a detailed error message
+            error = {
+                "success": False,
+                "error": f"""
+LinkedIn API permission error: Your access token doesn't have permission to post as this organization.
+Error details from shares endpoint: {shares_response.status_code} - {shares_response.text}
+Error details from UGC Posts endpoint: {ugc_response.status_code} - {ugc_response.text}
+
+To fix this issue:
+1. Make sure you've added the correct organization ID to your .env file (current: {org_id})
+2. Ensure your LinkedIn access token has the following permissions:
+   - w_organization_social
+   - r_organization_social
+   - rw_organization_admin
+3. The user who generated the access token must be an admin of the organization
+4. Generate a new access token with the correct permissions using the LinkedIn Developer Console
+
+For more information, see the LinkedIn API documentation:
+https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-management/shares/ugc-post-api
+"""
             }
+            # A rejection of the post itself overrides a cached permission check
+            if shares_response.status_code in (401, 403) and ugc_response.status_code in (401, 403):
+                self._record_org_permission(permission_key, ugc_response, error)
+            return error
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error posting to LinkedIn as organization: {str(e)}"
+            }
+    
+    def _post_org_endpoint(
+        self,
+        endpoint: str,
+        org_urn: str,
+        text: str,
+        schedule_time: Optional[str],
+        headers: Dict[str, str],
+        responses: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Try to post as an organization with one endpoint.
+        
+        Args:
+            endpoint: "shares", "ugcPosts" or "assets"
+            org_urn: URN of the organization
+            text: The text content to post
+            schedule_time: Optional ISO-8601 timestamp for scheduling the post
+            headers: Request headers
+            responses: Collects the response of each endpoint tried, for error reporting
             
-            # Add scheduling if provided
-            if schedule_time:
-                shares_data["scheduledAt"] = schedule_time
-            
-            shares_response = requests.post(
+        Returns:
+            The success result, or None if the endpoint did not work
+        """
+        if endpoint == "shares":
+            # Approach 1: Try the organization shares endpoint
+            shares_response = self._http.post(
                 f"{self._api_url}/shares",
                 headers=headers,
-                json=shares_data,
+                json=self._shares_payload(org_urn, text, schedule_time),
                 allow_redirects=True
             )
+            responses["shares"] = shares_response
             
             if shares_response.status_code in [200, 201]:
-                post_id = shares_response.headers.get("x-restli-id") or shares_response.json().get("id")
                 return {
                     "success": True,
-                    "post_id": post_id,
+                    "post_id": self._response_post_id(shares_response),
                     "message": "Successfully posted to LinkedIn as organization using shares endpoint"
                 }
-            
+            return None
+        
+        if endpoint == "ugcPosts":
             # Approach 2: Try the UGC Posts endpoint
-            ugc_post_data = {
-                "author": org_urn,
-                "lifecycleState": "PUBLISHED",
-                "specificContent": {
-                    "com.linkedin.ugc.ShareContent": {
-                        "shareCommentary": {
-                            "text": text
-                        },
-                        "shareMediaCategory": "NONE"
-                    }
-                },
-                "visibility": {
-                    "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
-                }
-            }
-            
-            # Add scheduling if provided
-            if schedule_time:
-                ugc_post_data["distribution"] = {
-                    "linkedInDistributionTarget": {
-                        "visibleToGuest": True
-                    }
-                }
-                ugc_post_data["scheduledTime"] = schedule_time
-                ugc_post_data["lifecycleState"] = "SCHEDULED"
-            
-            ugc_response = requests.post(
+            ugc_response = self._http.post(
                 f"{self._api_url}/ugcPosts",
                 headers=headers,
-                json=ugc_post_data,
+                json=self._ugc_payload(org_urn, text, schedule_time),
                 allow_redirects=True
             )
+            responses["ugcPosts"] = ugc_response
             
             if ugc_response.status_code in [200, 201]:
-                post_id = ugc_response.headers.get("x-restli-id")
                 return {
                     "success": True,
-                    "post_id": post_id,
+                    "post_id": ugc_response.headers.get("x-restli-id"),
                     "message": "Successfully posted to LinkedIn as organization using UGC Posts endpoint"
                 }
-            
-            # Approach 3: Try the organization assets endpoint
-            try:
-                # This is a newer approach that some organizations might have access to
-                assets_data = {
-                    "registerUploadRequest": {
-                        "recipes": ["urn:li:digitalmediaRecipe:feedshare-text"],
-                        "owner": org_urn,
-                        "serviceRelationships": [
-                            {
-                                "relationshipType": "OWNER",
-                                "identifier": "urn:li:userGeneratedContent"
-                            }
-                        ],
-                        "text": text
-                    }
-                }
-                
-                assets_response = requests.post(
-                    f"{self._api_url}/assets?action=registerUpload",
-                    headers=headers,
-                    json=assets_data,
-                    allow_redirects=True
-                )
-                
-                if assets_response.status_code in [200, 201]:
-                    asset_data = assets_response.json()
-                    asset_id = asset_data.get("value", {}).get("asset")
-                    
-                    if asset_id:
-                        return {
-                            "success": True,
-                            "post_id": asset_id,
-                            "message": "Successfully posted to LinkedIn as organization using assets endpoint"
+            return None
+        
+        # Approach 3: Try the organization assets endpoint
+        try:
+            # This is a newer approach that some organizations might have access to
+            assets_data = {
+                "registerUploadRequest": {
+                    "recipes": ["urn:li:digitalmediaRecipe:feedshare-text"],
+                    "owner": org_urn,
+                    "serviceRelationships": [
+                        {
+                            "relationshipType": "OWNER",
+                            "identifier": "urn:li:userGeneratedContent"
                         }
+                    ],
+                    "text": text
+                }
+            }
+            
+            assets_response = self._http.post(
+                f"{self._api_url}/assets?action=registerUpload",
+                headers=headers,
+                json=assets_data,
+                allow_redirects=True
+            )
+            responses["assets"] = assets_response
+            
+            if assets_response.status_code in [200, 201]:
+                asset_data = assets_response.json()
+                asset_id = asset_data.get("value", {}).get("asset")
                 
-            except Exception as e:
-                # Just continue to the next approach if this fails
-                pass
+                if asset_id:
+                    return {
+                        "success": True,
+                        "post_id": asset_id,
+                        "message": "Successfully posted to LinkedIn as organization using assets endpoint"
+                    }
             
-            # If all approaches fail, return a detailed error message
+        except Exception as e:
+            # Just continue to the next approach if this fails
+            pass
+        return None
+    
+    def _org_permission_cache(self):
+        """The process-wide cache of organization permission checks, keyed by access token and organization ID."""
+        return shared_cache("linkedin_org_permissions", LINKEDIN_ORG_PERMISSION_TTL)
+    
+    def _record_org_permission(self, permission_key: str, response, error: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Cache the outcome of an organization permission check.
+        
+        Args:
+            permission_key: Cache key for the access token and organization ID
+            response: The LinkedIn response that decided the outcome
+            error: The error result to return while the denial is cached, or None if permitted
+        """
+        if error is None:
+            self._org_permission_cache().set(permission_key, {"allowed": True})
+        elif response.status_code in (401, 403, 404):
+            # Denials are cached for a shorter time so that newly granted access is picked up soon
+            self._org_permission_cache().set(
+                permission_key,
+                {"allowed": False, "error": error.get("error")},
+                ttl=LINKEDIN_ORG_PERMISSION_DENIED_TTL
+            )
+    
+    def _identity_cache(self):
+        """The process-wide cache of author URNs, keyed by access token."""
+        return shared_cache("linkedin_identity", LINKEDIN_IDENTITY_TTL, persist=LINKEDIN_PERSIST_IDENTITY)
+    
+    def _resolve_author(self) -> Dict[str, Any]:
+        """Get the URN to post as, from the cache or by asking LinkedIn."""
+        cache_key = token_fingerprint(self._access_token)
+        user_urn = self._identity_cache().get(cache_key)
+        if user_urn:
             return {
-                "success": False,
-                "error": f"""
-LinkedIn API permission error: Your access token doesn't have permission to post as this organization.
-Error details from shares endpoint: {shares_response.status_code} - {shares_response.text}
-Error details from UGC Posts endpoint: {ugc_response.status_code} - {ugc_response.text}
-
-To fix this issue:
-1. Make sure you've added the correct organization ID to your .env file (current: {org_id})
-2. Ensure your LinkedIn access token has the following permissions:
-   - w_organization_social
-   - r_organization_social
-   - rw_organization_admin
-3. The user who generated the access token must be an admin of the organization
-4. Generate a new access token with the correct permissions using the LinkedIn Developer Console
-
-For more information, see the LinkedIn API documentation:
-https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-management/shares/ugc-post-api
-"""
+                "success": True,
+                "user_urn": user_urn
             }
-                
-        except Exception as e:
+            
+        user_info = self._get_user_info()
+        if user_info.get("success", False):
+            self._identity_cache().set(cache_key, user_info.get("user_urn"))
+        return user_info
+    
+    async def _aresolve_author(self) -> Dict[str, Any]:
+        """Get the URN to post as, from the cache or by asking LinkedIn without blocking."""
+        cache_key = token_fingerprint(self._access_token)
+        user_urn = self._identity_cache().get(cache_key)
+        if user_urn:
             return {
-                "success": False,
-                "error": f"Error posting to LinkedIn as organization: {str(e)}"
+                "success": True,
+                "user_urn": user_urn
             }
+            
+        user_info = await self._aget_user_info()
+        if user_info.get("success", False):
+            self._identity_cache().set(cache_key, user_info.get("user_urn"))
+        return user_info
+    
+    def _invalidate_author(self, response) -> None:
+        """Forget the cached author URN if LinkedIn rejected the token or the author."""
+        if response.status_code in (401, 403):
+            self._identity_cache().invalidate(token_fingerprint(self._access_token))
     
     def _get_user_info(self) -> Dict[str, Any]:
         """Get the user's LinkedIn information."""
@@ -491,7 +731,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
             }
             
             # First try to get the profile using /v2/me
-            response = requests.get(
+            response = self._http.get(
                 f"{self._api_url}/me",
                 headers=headers
             )
@@ -505,7 +745,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
             elif response.status_code == 403 and "ACCESS_DENIED" in response.text:
                 # If we get an access denied error, try the /v2/userinfo endpoint instead
                 # This endpoint is available with the r_liteprofile permission
-                response = requests.get(
+                response = self._http.get(
                     f"{self._api_url}/userinfo",
                     headers=headers
                 )
@@ -545,16 +785,83 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
                 "error": f"Error getting user info: {str(e)}"
             }
     
+    async def _aget_user_info(self) -> Dict[str, Any]:
+        """Get the user's LinkedIn information without blocking the event loop."""
+        try:
+            headers = self._headers(content_type=False)
+            
+            # First try to get the profile using /v2/me
+            response = await arequest("GET", f"{self._api_url}/me", headers=headers)
+            
+            if response.status_code == 200:
+                return {
+                    "success": True,
+                    "user_urn": f"urn:li:person:{response.json().get('id')}"
+                }
+            elif response.status_code == 403 and "ACCESS_DENIED" in response.text:
+                # Fall back to the /v2/userinfo endpoint
+                response = await arequest("GET", f"{self._api_url}/userinfo", headers=headers)
+                
+                if response.status_code == 200:
+                    return {
+                        "success": True,
+                        "user_urn": f"urn:li:person:{response.json().get('sub')}"
+                    }
+                    
+                import os
+                org_id = os.getenv("LINKEDIN_ORGANIZATION_ID")
+                if org_id:
+                    return {
+                        "success": True,
+                        "user_urn": f"urn:li:organization:{org_id}"
+                    }
+                return {
+                    "success": False,
+                    "error": "LinkedIn API permission error: Your access token doesn't have the necessary permissions. Please update your LinkedIn API permissions to include r_liteprofile or provide an organization ID."
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"Failed to get user info: {response.status_code} - {response.text}"
+                }
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error getting user info: {str(e)}"
+            }
+    
     def _upload_image(self, image_path: str) -> Dict[str, Any]:
-        """Upload an image to LinkedIn."""
+        """
+        Upload an image (or a video) to LinkedIn.
+        
+        The file is streamed from a memory mapping rather than read into
+        memory. Files larger than LINKEDIN_MULTIPART_THRESHOLD ask LinkedIn for
+        a multi-part upload, whose parts are sent in parallel.
+        """
         try:
             # Get the user's LinkedIn URN
-            user_info = self._get_user_info()
+            user_info = self._resolve_author()
             if not user_info.get("success", False):
                 return user_info
                 
             user_urn = user_info.get("user_urn")
             
+            # Reuse the asset if this file was uploaded for the same author recently
+            cache_key = media_cache_key("linkedin", user_urn, image_path)
+            cached_asset = media_cache().get(cache_key)
+            if cached_asset:
+                return {
+                    "success": True,
+                    "asset": cached_asset.get("asset"),
+                    "media_category": cached_asset.get("media_category", "IMAGE"),
+                    "message": "Reused image previously uploaded to LinkedIn"
+                }
+            
+            mime_type = mimetypes.guess_type(image_path)[0] or ""
+            media_category = "VIDEO" if mime_type.startswith("video/") else "IMAGE"
+            file_size = os.path.getsize(image_path)
+            
             # Step 1: Register the image upload
             headers = {
                 "Authorization": f"Bearer {self._access_token}",
@@ -564,7 +871,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
             
             register_data = {
                 "registerUploadRequest": {
-                    "recipes": ["urn:li:digitalmediaRecipe:feedshare-image"],
+                    "recipes": [f"urn:li:digitalmediaRecipe:feedshare-{media_category.lower()}"],
                     "owner": user_urn,
                     "serviceRelationships": [
                         {
@@ -574,8 +881,11 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
                     ]
                 }
             }
+            if file_size > LINKEDIN_MULTIPART_THRESHOLD:
+                register_data["registerUploadRequest"]["supportedUploadMechanism"] = ["MULTIPART_UPLOAD"]
+                register_data["registerUploadRequest"]["fileSize"] = file_size
             
-            register_response = requests.post(
+            register_response = self._http.post(
                 f"{self._api_url}/assets?action=registerUpload",
                 headers=headers,
                 data=json.dumps(register_data),
@@ -586,7 +896,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
                 # Handle redirect
                 redirect_url = register_response.headers.get('Location')
                 if redirect_url:
-                    register_response = requests.post(
+                    register_response = self._http.post(
                         redirect_url,
                         headers=headers,
                         data=json.dumps(register_data),
@@ -599,51 +909,33 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
                     "error": f"Failed to register image upload: {register_response.status_code} - {register_response.text}"
                 }
                 
-            register_data = register_response.json()
-            upload_url = register_data.get("value", {}).get("uploadMechanism", {}).get("com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest", {}).get("uploadUrl")
-            asset = register_data.get("value", {}).get("asset")
+            register_value = register_response.json().get("value", {})
+            upload_mechanism = register_value.get("uploadMechanism", {})
+            asset = register_value.get("asset")
+            multipart = upload_mechanism.get("com.linkedin.digitalmedia.uploading.MultipartUpload")
+            upload_url = upload_mechanism.get("com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest", {}).get("uploadUrl")
             
-            if not upload_url or not asset:
+            if not asset or not (upload_url or multipart):
                 return {
                     "success": False,
                     "error": "Failed to get upload URL or asset from registration response"
                 }
             
             # Step 2: Upload the image
-            with open(image_path, "rb") as image_file:
-                image_data = image_file.read()
-                
-            upload_headers = {
-                "Authorization": f"Bearer {self._access_token}"
-            }
-            
-            upload_response = requests.put(
-                upload_url,
-                headers=upload_headers,
-                data=image_data,
-                allow_redirects=True  # Allow redirects for 302 responses
-            )
-            
-            if upload_response.status_code == 302:
-                # Handle redirect
-                redirect_url = upload_response.headers.get('Location')
-                if redirect_url:
-                    upload_response = requests.put(
-                        redirect_url,
-                        headers=upload_headers,
-                        data=image_data,
-                        allow_redirects=True
-                    )
+            with open_media(image_path) as media:
+                if multipart:
+                    upload_result = self._upload_parts(media, multipart, register_value.get("mediaArtifact"), headers)
+                else:
+                    upload_result = self._upload_whole(media, upload_url)
+            if not upload_result.get("success", False):
+                return upload_result
             
-            if upload_response.status_code != 201:
-                return {
-                    "success": False,
-                    "error": f"Failed to upload image: {upload_response.status_code} - {upload_response.text}"
-                }
+            media_cache().set(cache_key, {"asset": asset, "media_category": media_category}, ttl=LINKEDIN_MEDIA_TTL)
                 
             return {
                 "success": True,
                 "asset": asset,
+                "media_category": media_category,
                 "message": "Successfully uploaded image to LinkedIn"
             }
                 
@@ -652,31 +944,268 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
                 "success": False,
                 "error": f"Error uploading image: {str(e)}"
             }
-            
-    def get_post_comments(self, post_id: str) -> Dict[str, Any]:
-        """Get comments on a LinkedIn post."""
+    
+    def _forget_media(self, author_urn: str, image_path: str) -> None:
+        """Drop a cached upload after a post that used it failed, in case LinkedIn no longer accepts the asset."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self._access_token}",
-                "X-Restli-Protocol-Version": "2.0.0"
+            media_cache().invalidate(media_cache_key("linkedin", author_urn, image_path))
+        except OSError:
+            pass
+    
+    def _upload_whole(self, media, upload_url: str) -> Dict[str, Any]:
+        """
+        Upload a file with a single PUT to the URL LinkedIn registered.
+        
+        Args:
+            media: The mapped file
+            upload_url: The upload URL from the registration response
+            
+        Returns:
+            Dictionary with the success of the upload
+        """
+        upload_headers = {
+            "Authorization": f"Bearer {self._access_token}"
+        }
+        body = MediaSegment(media)
+        
+        upload_response = self._http.put(
+            upload_url,
+            headers=upload_headers,
+            data=body,
+            allow_redirects=True  # Allow redirects for 302 responses
+        )
+        
+        if upload_response.status_code == 302:
+            # Handle redirect
+            redirect_url = upload_response.headers.get('Location')
+            if redirect_url:
+                body.seek(0)
+                upload_response = self._http.put(
+                    redirect_url,
+                    headers=upload_headers,
+                    data=body,
+                    allow_redirects=True
+                )
+        
+        if upload_response.status_code != 201:
+            return {
+                "success": False,
+                "error": f"Failed to upload image: {upload_response.status_code} - {upload_response.text}"
             }
+        return {"success": True}
+    
+    def _upload_parts(
+        self,
+        media,
+        multipart: Dict[str, Any],
+        media_artifact: Optional[str],
+        headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Follow LinkedIn's multi-part upload instructions.
+        
+        Each part is a byte range of the file with its own upload URL. Parts
+        are sent in parallel, then the upload is completed with the ETag of
+        every part.
+        
+        Args:
+            media: The mapped file
+            multipart: The MultipartUpload mechanism from the registration response
+            media_artifact: The media artifact URN from the registration response
+            headers: Headers for the completion request
             
-            response = requests.get(
-                f"{self._api_url}/socialActions/urn:li:share:{post_id}/comments",
-                headers=headers
+        Returns:
+            Dictionary with the success of the upload
+        """
+        def upload_part(part_request: Dict[str, Any]):
+            byte_range = part_request.get("byteRange", {})
+            body = MediaSegment(media, byte_range.get("firstByte", 0), byte_range.get("lastByte", len(media) - 1) + 1)
+            return self._http.put(
+                part_request.get("url"),
+                headers=part_request.get("headers", {}),
+                data=body
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "success": True,
-                    "comments": data.get("elements", [])
-                }
-            else:
+        
+        part_requests = multipart.get("partUploadRequests", [])
+        with ThreadPoolExecutor(max_workers=max(1, min(LINKEDIN_UPLOAD_CONCURRENCY, len(part_requests)))) as executor:
+            part_responses = list(executor.map(upload_part, part_requests))
+        
+        for index, part_response in enumerate(part_responses):
+            if part_response.status_code not in [200, 201]:
                 return {
                     "success": False,
-                    "error": f"Failed to get post comments: {response.status_code} - {response.text}"
+                    "error": f"Failed to upload part {index + 1} of {len(part_responses)}: {part_response.status_code} - {part_response.text}"
+                }
+        
+        complete_response = self._http.post(
+            f"{self._api_url}/assets?action=completeMultiPartUpload",
+            headers=headers,
+            json={
+                "completeMultipartUploadRequest": {
+                    "mediaArtifact": media_artifact,
+                    "metadata": multipart.get("metadata"),
+                    "partUploadResponses": [
+                        {
+                            "httpStatusCode": part_response.status_code,
+                            "headers": {"ETag": part_response.headers.get("ETag")}
+                        }
+                        for part_response in part_responses
+                    ]
                 }
+            }
+        )
+        
+        if complete_response.status_code not in [200, 201]:
+            return {
+                "success": False,
+                "error": f"Failed to complete multi-part upload: {complete_response.status_code} - {complete_response.text}"
+            }
+        return {"success": True}
+            
+    def _comments_url(self, post_id: str, start: int, count: int) -> str:
+        """URL of one page of a post's comments, with only the fields the monitor uses."""
+        # The projection is built by hand: Rest.li expects its parentheses unencoded
+        return (
+            f"{self._api_url}/socialActions/urn:li:share:{post_id}/comments"
+            f"?start={start}&count={count}&projection={COMMENT_PROJECTION}"
+        )
+    
+    def _comments_page(self, data: Dict[str, Any], start: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Get the comments of a page response and the start of the next page (None after the last one)."""
+        elements = data.get("elements", [])
+        for comment in elements:
+            # Expose the comment text where the agent looks for it
+            comment.setdefault("text", comment.get("message", {}).get("text", ""))
+        
+        total = data.get("paging", {}).get("total")
+        next_start = start + len(elements)
+        if not elements or (total is not None and next_start >= total):
+            next_start = None
+        return elements, next_start
+    
+    def iter_post_comments(self, post_id: str, page_size: int = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterate over the comments on a LinkedIn post one page at a time.
+        
+        Args:
+            post_id: ID of the post (share)
+            page_size: Comments per page (defaults to LINKEDIN_COMMENTS_PAGE_SIZE)
+            
+        Yields:
+            Lists of comments, requested with start/count
+            
+        Raises:
+            RuntimeError: If LinkedIn rejects a page request
+        """
+        count = page_size or LINKEDIN_COMMENTS_PAGE_SIZE
+        start = 0
+        while start is not None:
+            response = self._http.get(
+                self._comments_url(post_id, start, count),
+                headers=self._headers(content_type=False)
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"Failed to get post comments: {response.status_code} - {response.text}")
+            
+            elements, start = self._comments_page(response.json(), start)
+            yield elements
+    
+    async def aiter_post_comments(self, post_id: str, page_size: int = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Iterate over the comments on a LinkedIn post one page at a time without blocking the event loop."""
+        count = page_size or LINKEDIN_COMMENTS_PAGE_SIZE
+        start = 0
+        while start is not None:
+            response = await arequest(
+                "GET",
+                self._comments_url(post_id, start, count),
+                headers=self._headers(content_type=False)
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"Failed to get post comments: {response.status_code} - {response.text}")
+            
+            elements, start = self._comments_page(response.json(), start)
+            yield elements
+    
+    def _comment_marks(self):
+        """The persisted creation time of the newest comment seen per post."""
+        return shared_cache("linkedin_comment_marks", LINKEDIN_COMMENT_MARK_TTL, persist=True)
+    
+    def _scan_comments_page(self, page: List[Dict[str, Any]], mark: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Take the comments created after a high-water mark from a page.
+        
+        Args:
+            page: One page of comments
+            mark: Creation time (ms) of the newest comment already seen, or 0
+            
+        Returns:
+            The new comments, the newest creation time on the page, and whether
+            later pages can be skipped: the page is ordered newest first and
+            holds only older comments, so every later page is older too
+        """
+        times = [comment.get("created", {}).get("time", 0) for comment in page]
+        new_comments = [comment for comment, created in zip(page, times) if created > mark]
+        newest_first = all(earlier >= later for earlier, later in zip(times, times[1:]))
+        done = bool(mark) and newest_first and not new_comments
+        return new_comments, max(times, default=0), done
+    
+    def get_post_comments(self, post_id: str, new_only: bool = False) -> Dict[str, Any]:
+        """
+        Get comments on a LinkedIn post.
+        
+        Args:
+            post_id: ID of the post (share)
+            new_only: Only return comments created after the newest one seen by
+                the previous new_only call for this post
+            
+        Returns:
+            Dictionary containing the comments
+        """
+        try:
+            mark = self._comment_marks().get(post_id, 0) if new_only else 0
+            comments = []
+            newest = mark
+            for page in self.iter_post_comments(post_id):
+                new_comments, page_newest, done = self._scan_comments_page(page, mark)
+                comments.extend(new_comments)
+                newest = max(newest, page_newest)
+                if done:
+                    break
+            
+            if new_only and newest > mark:
+                self._comment_marks().set(post_id, newest)
+            
+            return {
+                "success": True,
+                "comments": comments
+            }
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error getting post comments: {str(e)}"
+            }
+    
+    async def aget_post_comments(self, post_id: str, new_only: bool = False) -> Dict[str, Any]:
+        """Get comments on a LinkedIn post without blocking the event loop (see get_post_comments)."""
+        try:
+            mark = self._comment_marks().get(post_id, 0) if new_only else 0
+            comments = []
+            newest = mark
+            async for page in self.aiter_post_comments(post_id):
+                new_comments, page_newest, done = self._scan_comments_page(page, mark)
+                comments.extend(new_comments)
+                newest = max(newest, page_newest)
+                if done:
+                    break
+            
+            if new_only and newest > mark:
+                self._comment_marks().set(post_id, newest)
+            
+            return {
+                "success": True,
+                "comments": comments
+            }
                 
         except Exception as e:
             return {
@@ -700,7 +1229,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
             }
             
             # Check if we can access the /me endpoint (requires r_liteprofile)
-            me_response = requests.get(
+            me_response = self._http.get(
                 f"{self._api_url}/me",
                 headers={
                     "Authorization": f"Bearer {self._access_token}",
@@ -716,7 +1245,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
                 )
             
             # Check if we can access the /userinfo endpoint
-            userinfo_response = requests.get(
+            userinfo_response = self._http.get(
                 f"{self._api_url}/userinfo",
                 headers={
                     "Authorization": f"Bearer {self._access_token}",
@@ -728,7 +1257,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
             
             # Check if we can post as a member (requires w_member_social)
             # We don't actually post, just check the permissions
-            member_post_check = requests.get(
+            member_post_check = self._http.get(
                 f"{self._api_url}/socialActions",
                 headers={
                     "Authorization": f"Bearer {self._access_token}",
@@ -755,7 +1284,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
             
             # If we have an organization ID, check if we can access it
             if org_id:
-                org_response = requests.get(
+                org_response = self._http.get(
                     f"{self._api_url}/organizations/{org_id}",
                     headers={
                         "Authorization": f"Bearer {self._access_token}",
@@ -771,7 +1300,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
                     )
                 
                 # Check if we can post as the organization
-                org_post_check = requests.get(
+                org_post_check = self._http.get(
                     f"{self._api_url}/organizations/{org_id}/ugcPosts",
                     headers={
                         "Authorization": f"Bearer {self._access_token}",
@@ -856,7 +1385,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
             }
             
             try:
-                ugc_response = requests.post(
+                ugc_response = self._http.post(
                     f"{self._api_url}/ugcPosts",
                     headers=headers,
                     json=ugc_post_data,
@@ -902,7 +1431,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
             }
             
             try:
-                org_ugc_response = requests.post(
+                org_ugc_response = self._http.post(
                     f"{self._api_url}/ugcPosts",
                     headers=headers,
                     json=org_ugc_post_data,
@@ -943,7 +1472,7 @@ https://learn.microsoft.com/en-us/linkedin/marketing/integrations/community-mana
             }
             
             try:
-                org_shares_response = requests.post(
+                org_shares_response = self._http.post(
                     f"{self._api_url}/shares",
                     headers=headers,
                     json=org_shares_post_data,
@@ -1,25 +1,32 @@
 import os
-import json
+import time
 import datetime
 import uuid
 from typing import Dict, List, Any, Optional
+from src.utils.schedule_store import ScheduleStore, JsonScheduleStore, ScheduleConflictError, create_schedule_store, to_epoch
 
 class SchedulerTool:
-    def __init__(self, schedule_file: str = "content_schedule.json"):
+    def __init__(self, schedule_file: str = "content_schedule.json", store: Optional[ScheduleStore] = None):
         """
         Initialize the scheduler tool.
         
         Args:
             schedule_file: Path to the schedule file
+            store: Optional schedule store to use instead of the configured backend
         """
         self.schedule_file = schedule_file
+        self.store = store or create_schedule_store(schedule_file)
         
         # Create the schedule file if it doesn't exist
-        if not os.path.exists(schedule_file):
-            self._save_schedule({
-                "scheduled_posts": [],
-                "last_updated": datetime.datetime.now().isoformat()
-            })
+        if isinstance(self.store, JsonScheduleStore) and not os.path.exists(self.store.schedule_file):
+            try:
+                self.store.save({
+                    "scheduled_posts": [],
+                    "last_updated": datetime.datetime.now().isoformat()
+                }, expected_version=self.store.version())
+            except ScheduleConflictError:
+                # Another process created it in the meantime
+                pass
     
     def _run(self, content_items: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -33,40 +40,41 @@ class SchedulerTool:
         """
         try:
             results = []
-            success_count = 0
-            error_count = 0
+            valid_indexes = []
+            valid_posts = []
             
+            # Validate every item before writing anything
             for item in content_items:
                 try:
                     content = item.get("content")
                     platform = item.get("platform")
+                    if not content or not platform:
+                        raise ValueError("Content item is missing content or platform")
+                        
                     schedule_time = datetime.datetime.fromisoformat(item.get("scheduled_time").replace("Z", "+00:00").replace(" ", "T"))
-                    image_path = item.get("image_path")
-                    
-                    # Schedule the post
-                    result = self.schedule_post(
-                        content=content,
-                        platform=platform,
-                        schedule_time=schedule_time,
-                        image_path=image_path
-                    )
                     
-                    if result.get("success", False):
-                        success_count += 1
-                    else:
-                        error_count += 1
-                        
-                    results.append({
-                        "item": item,
-                        "result": result
+                    valid_indexes.append(len(results))
+                    valid_posts.append({
+                        "content": content,
+                        "platform": platform,
+                        "schedule_time": schedule_time,
+                        "image_path": item.get("image_path")
                     })
+                    results.append({"item": item})
                 except Exception as e:
-                    error_count += 1
                     results.append({
                         "item": item,
                         "error": str(e)
                     })
             
+            # Schedule all valid posts with a single write
+            if valid_posts:
+                for index, result in zip(valid_indexes, self.schedule_posts(valid_posts)):
+                    results[index]["result"] = result
+            
+            success_count = sum(1 for result in results if result.get("result", {}).get("success", False))
+            error_count = len(results) - success_count
+            
             return {
                 "success": True,
                 "message": f"Scheduled {success_count} posts, {error_count} errors",
@@ -93,60 +101,62 @@ class SchedulerTool:
             Dictionary containing the result of the update operation
         """
         try:
-            # Load the current schedule
-            schedule = self._load_schedule()
+            updates = {"status": new_status}
             
-            # Find the post to update
-            post_found = False
-            for i, post in enumerate(schedule["scheduled_posts"]):
-                if post.get("id") == post_id:
-                    post_found = True
-                    # Update the post status
-                    schedule["scheduled_posts"][i]["status"] = new_status
-                    
-                    # Update platform_post_id if provided
-                    if platform_post_id:
-                        schedule["scheduled_posts"][i]["platform_post_id"] = platform_post_id
-                        
-                    # Add timestamp for the update
-                    if new_status == "published":
-                        schedule["scheduled_posts"][i]["published_at"] = datetime.datetime.now().isoformat()
-                    elif new_status == "failed":
-                        schedule["scheduled_posts"][i]["failed_at"] = datetime.datetime.now().isoformat()
-                    
-                    # Save the updated schedule
-                    self._save_schedule(schedule)
-                    
-                    return {
-                        "success": True,
-                        "message": f"Successfully updated post status to {new_status}",
-                        "updated_post": schedule["scheduled_posts"][i]
-                    }
+            # Update platform_post_id if provided
+            if platform_post_id:
+                updates["platform_post_id"] = platform_post_id
+                
+            # Add timestamp for the update
+            if new_status == "published":
+                updates["published_at"] = datetime.datetime.now().isoformat()
+            elif new_status == "failed":
+                updates["failed_at"] = datetime.datetime.now().isoformat()
+            
+            updated_post = self.store.update_post(post_id, updates)
             
-            if not post_found:
+            if updated_post is None:
                 return {
                     "success": False,
                     "error": f"Post with ID {post_id} not found"
                 }
                 
+            return {
+                "success": True,
+                "message": f"Successfully updated post status to {new_status}",
+                "updated_post": updated_post
+            }
+                
         except Exception as e:
             return {
                 "success": False,
                 "error": f"Error updating post status: {str(e)}"
             }
             
-    def _load_schedule(self) -> Dict[str, Any]:
-        """Load the schedule from the file."""
-        if os.path.exists(self.schedule_file):
-            with open(self.schedule_file, "r") as f:
-                return json.load(f)
-        return {"scheduled_posts": [], "last_updated": datetime.datetime.now().isoformat()}
+    def _new_post(self, content: str, platform: str, schedule_time: datetime.datetime, image_path: Optional[str] = None) -> Dict[str, Any]:
+        """Create a new post entry with a fresh ID."""
+        new_post = {
+            "id": str(uuid.uuid4()),
+            "content": content,
+            "platform": platform,
+            "schedule_time": schedule_time.isoformat(),
+            "status": "scheduled",
+            "created_at": datetime.datetime.now().isoformat()
+        }
+        
+        if image_path:
+            new_post["image_path"] = image_path
+            
+        return new_post
     
-    def _save_schedule(self, schedule: Dict[str, Any]) -> None:
-        """Save the schedule to the file."""
-        schedule["last_updated"] = datetime.datetime.now().isoformat()
-        with open(self.schedule_file, "w") as f:
-            json.dump(schedule, f, indent=2)
+    def _scheduled_result(self, new_post: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the result returned for a successfully scheduled post."""
+        return {
+            "success": True,
+            "message": f"Post scheduled for {new_post['schedule_time']}",
+            "post_id": new_post["id"],
+            "scheduled_post": new_post
+        }
     
     def schedule_post(self, content: str, platform: str, schedule_time: datetime.datetime, image_path: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -162,35 +172,13 @@ class SchedulerTool:
             Dictionary containing the result of the scheduling operation
         """
         try:
-            # Load the current schedule
-            schedule = self._load_schedule()
-            
             # Create a new post entry
-            post_id = str(uuid.uuid4())
-            new_post = {
-                "id": post_id,
-                "content": content,
-                "platform": platform,
-                "schedule_time": schedule_time.isoformat(),
-                "status": "scheduled",
-                "created_at": datetime.datetime.now().isoformat()
-            }
-            
-            if image_path:
-                new_post["image_path"] = image_path
+            new_post = self._new_post(content, platform, schedule_time, image_path)
             
             # Add the new post to the schedule
-            schedule["scheduled_posts"].append(new_post)
-            
-            # Save the updated schedule
-            self._save_schedule(schedule)
+            self.store.add_post(new_post)
             
-            return {
-                "success": True,
-                "message": f"Post scheduled for {schedule_time.isoformat()}",
-                "post_id": post_id,
-                "scheduled_post": new_post
-            }
+            return self._scheduled_result(new_post)
             
         except Exception as e:
             return {
@@ -198,6 +186,42 @@ class SchedulerTool:
                 "error": f"Error scheduling post: {str(e)}"
             }
     
+    def schedule_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Schedule several posts with a single write to the schedule.
+        
+        Args:
+            posts: List of dictionaries with content, platform, schedule_time
+                (a datetime) and an optional image_path
+            
+        Returns:
+            List with one result per post, in the same format as schedule_post
+        """
+        try:
+            new_posts = [
+                self._new_post(
+                    content=post.get("content"),
+                    platform=post.get("platform"),
+                    schedule_time=post.get("schedule_time"),
+                    image_path=post.get("image_path")
+                )
+                for post in posts
+            ]
+            
+            # Add all new posts to the schedule at once
+            self.store.add_posts(new_posts)
+            
+            return [self._scheduled_result(new_post) for new_post in new_posts]
+            
+        except Exception as e:
+            return [
+                {
+                    "success": False,
+                    "error": f"Error scheduling post: {str(e)}"
+                }
+                for _ in posts
+            ]
+    
     def get_scheduled_posts(self) -> Dict[str, Any]:
         """
         Get all scheduled posts.
@@ -206,11 +230,11 @@ class SchedulerTool:
             Dictionary containing all scheduled posts
         """
         try:
-            schedule = self._load_schedule()
+            scheduled_posts = self.store.list_posts()
             return {
                 "success": True,
-                "scheduled_posts": schedule["scheduled_posts"],
-                "count": len(schedule["scheduled_posts"])
+                "scheduled_posts": scheduled_posts,
+                "count": len(scheduled_posts)
             }
         except Exception as e:
             return {
@@ -218,6 +242,90 @@ class SchedulerTool:
                 "error": f"Error getting scheduled posts: {str(e)}"
             }
     
+    def get_post(self, post_id: str, include_archived: bool = False) -> Dict[str, Any]:
+        """
+        Get a single post by its ID.
+        
+        Args:
+            post_id: The ID of the post
+            include_archived: Also look in the archive of published and failed posts
+            
+        Returns:
+            Dictionary containing the post, or None as the post if it doesn't exist
+        """
+        try:
+            post = self.store.get_post(post_id)
+            if post is None and include_archived:
+                post = self.store.get_archived_post(post_id)
+            
+            return {
+                "success": True,
+                "post": post
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error getting post: {str(e)}"
+            }
+    
+    def get_post_by_platform_id(self, platform_post_id: str) -> Dict[str, Any]:
+        """
+        Get a published post by the ID the platform assigned to it.
+        
+        Args:
+            platform_post_id: The platform-specific post ID
+            
+        Returns:
+            Dictionary containing the post, or None as the post if it doesn't exist
+        """
+        try:
+            post = self.store.get_post_by_platform_id(platform_post_id)
+            
+            return {
+                "success": True,
+                "post": post
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error getting post: {str(e)}"
+            }
+    
+    def get_post_history(
+        self,
+        start_time: Optional[datetime.datetime] = None,
+        end_time: Optional[datetime.datetime] = None,
+        status: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get archived (published or failed) posts.
+        
+        Args:
+            start_time: Only include posts that finished at or after this time
+            end_time: Only include posts that finished at or before this time
+            status: Optional status to filter by ('published' or 'failed')
+            
+        Returns:
+            Dictionary containing the archived posts, oldest first
+        """
+        try:
+            history = self.store.list_archived_posts(
+                start_epoch=to_epoch(start_time),
+                end_epoch=to_epoch(end_time),
+                status=status
+            )
+            
+            return {
+                "success": True,
+                "posts": history,
+                "count": len(history)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error getting post history: {str(e)}"
+            }
+    
     def get_pending_posts(self) -> Dict[str, Any]:
         """
         Get posts that are scheduled but not yet published.
@@ -226,11 +334,7 @@ class SchedulerTool:
             Dictionary containing pending posts
         """
         try:
-            schedule = self._load_schedule()
-            pending_posts = [
-                post for post in schedule["scheduled_posts"]
-                if post.get("status") == "scheduled"
-            ]
+            pending_posts = self.store.list_posts(status="scheduled")
             
             return {
                 "success": True,
@@ -245,20 +349,14 @@ class SchedulerTool:
     
     def get_due_posts(self) -> Dict[str, Any]:
         """
-        Get posts that are due for publication (scheduled time has passed).
+        Get posts that are due for publication (scheduled time has passed),
+        oldest first.
         
         Returns:
             Dictionary containing due posts
         """
         try:
-            schedule = self._load_schedule()
-            now = datetime.datetime.now()
-            
-            due_posts = [
-                post for post in schedule["scheduled_posts"]
-                if post.get("status") == "scheduled" and
-                datetime.datetime.fromisoformat(post.get("schedule_time")) <= now
-            ]
+            due_posts = self.store.due_posts(time.time())
             
             return {
                 "success": True,
@@ -282,33 +380,21 @@ class SchedulerTool:
             Dictionary containing the result of the cancellation
         """
         try:
-            # Load the current schedule
-            schedule = self._load_schedule()
-            
-            # Find the post to cancel
-            post_found = False
-            for i, post in enumerate(schedule["scheduled_posts"]):
-                if post.get("id") == post_id:
-                    post_found = True
-                    
-                    # Remove the post from the schedule
-                    cancelled_post = schedule["scheduled_posts"].pop(i)
-                    
-                    # Save the updated schedule
-                    self._save_schedule(schedule)
-                    
-                    return {
-                        "success": True,
-                        "message": f"Post {post_id} cancelled successfully",
-                        "cancelled_post": cancelled_post
-                    }
+            # Remove the post from the schedule
+            cancelled_post = self.store.delete_post(post_id)
             
-            if not post_found:
+            if cancelled_post is None:
                 return {
                     "success": False,
                     "error": f"Post with ID {post_id} not found"
                 }
                 
+            return {
+                "success": True,
+                "message": f"Post {post_id} cancelled successfully",
+                "cancelled_post": cancelled_post
+            }
+                
         except Exception as e:
             return {
                 "success": False,
@@ -1,18 +1,31 @@
 import requests
 import json
-import base64
-import hmac
-import hashlib
 import time
 import os
-from typing import Dict, Any, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from crewai.tools import BaseTool
 from pydantic import PrivateAttr
+from src.utils.async_http import arequest
+from src.utils.http_session import get_http_session
+from src.utils.image_variants import optimized_image
+from src.utils.media_cache import media_cache, media_cache_key
+from src.utils.media_upload import open_media, MediaSegment
+from src.utils.ttl_cache import shared_cache, token_fingerprint
+from src.utils.oauth1 import get_oauth1_signer
 from src.config.config import (
     TWITTER_API_KEY,
     TWITTER_API_SECRET,
     TWITTER_ACCESS_TOKEN,
-    TWITTER_ACCESS_TOKEN_SECRET
+    TWITTER_ACCESS_TOKEN_SECRET,
+    TWITTER_MEDIA_TTL,
+    TWITTER_UPLOAD_CHUNK_SIZE,
+    TWITTER_UPLOAD_CONCURRENCY,
+    TWITTER_UPLOAD_RETRIES,
+    TWITTER_PROCESSING_TIMEOUT,
+    TWITTER_REPLY_MAX_PAGES,
+    TWITTER_REPLY_CURSOR_TTL
 )
 
 class TwitterTool(BaseTool):
@@ -27,6 +40,7 @@ class TwitterTool(BaseTool):
     _access_token: str = PrivateAttr()
     _access_token_secret: str = PrivateAttr()
     _api_url: str = PrivateAttr()
+    _http: Any = PrivateAttr()
     
     def __init__(self):
         super().__init__()
@@ -35,6 +49,7 @@ class TwitterTool(BaseTool):
         self._access_token = TWITTER_ACCESS_TOKEN
         self._access_token_secret = TWITTER_ACCESS_TOKEN_SECRET
         self._api_url = "https://api.twitter.com/2"
+        self._http = get_http_session()
         
     def _run(
         self, 
@@ -77,69 +92,88 @@ class TwitterTool(BaseTool):
             Dictionary containing the result of the posting operation
         """
         try:
-            # Truncate text if it's too long
-            if len(text) > 280:
-                text = text[:277] + "..."
-                
-            # Create the post payload
-            post_data = {
-                "text": text
-            }
-            
             # Add image if provided
+            media_id = None
             if image_path and os.path.exists(image_path):
-                # First, upload the image to Twitter
+                # First, upload the image to Twitter, resized and re-encoded for it
+                image_path = optimized_image(image_path, "twitter")
                 media_id = self._upload_media(image_path)
                 if not media_id:
                     return {
                         "success": False,
                         "error": "Failed to upload image to Twitter"
                     }
-                
-                # Add the media ID to the post
-                post_data["media"] = {
-                    "media_ids": [media_id]
-                }
-            
-            # Add scheduling if provided
-            if schedule_time:
-                # Convert ISO-8601 to UNIX timestamp
-                from datetime import datetime
-                import dateutil.parser
-                dt = dateutil.parser.parse(schedule_time)
-                unix_timestamp = int(dt.timestamp())
-                
-                post_data["scheduled_at"] = unix_timestamp
-                
-                # Use the scheduled tweets endpoint
-                endpoint = f"{self._api_url}/tweets/scheduled"
-            else:
-                # Use the regular tweets endpoint
-                endpoint = f"{self._api_url}/tweets"
+            
+            endpoint, post_data = self._tweet_request(text, schedule_time, media_id)
             
             # Make the API request to create the post
             headers = self._get_auth_headers("POST", endpoint)
             headers["Content-Type"] = "application/json"
             
-            response = requests.post(
+            response = self._http.post(
                 endpoint,
                 headers=headers,
                 data=json.dumps(post_data)
             )
             
-            if response.status_code in (200, 201):
-                data = response.json()
-                return {
-                    "success": True,
-                    "tweet_id": data.get("data", {}).get("id"),
-                    "post_id": data.get("data", {}).get("id"),  # Add post_id for consistency with LinkedInTool
-                    "message": "Successfully posted to Twitter"
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"Failed to post to Twitter: {response.status_code} - {response.text}"
-                }
+            result = self._tweet_result(response)
+            if media_id and not result.get("success", False):
+                self._forget_media(image_path)
+            return result
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error posting to Twitter: {str(e)}"
+            }
+    
+    async def aexecute(
+        self, 
+        text: str, 
+        image_path: Optional[str] = None,
+        schedule_time: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Post content to X.com (Twitter) without blocking the event loop.
+        
+        Same behaviour and result format as _execute. The media upload runs
+        in a worker thread.
+        
+        Args:
+            text: The text content to post (max 280 characters)
+            image_path: Optional path to an image to include in the post
+            schedule_time: Optional ISO-8601 timestamp for scheduling the post
+            
+        Returns:
+            Dictionary containing the result of the posting operation
+        """
+        try:
+            media_id = None
+            if image_path and os.path.exists(image_path):
+                image_path = await asyncio.to_thread(optimized_image, image_path, "twitter")
+                media_id = await asyncio.to_thread(self._upload_media, image_path)
+                if not media_id:
+                    return {
+                        "success": False,
+                        "error": "Failed to upload image to Twitter"
+                    }
+            
+            endpoint, post_data = self._tweet_request(text, schedule_time, media_id)
+            
+            headers = self._get_auth_headers("POST", endpoint)
+            headers["Content-Type"] = "application/json"
+            
+            response = await arequest(
+                "POST",
+                endpoint,
+                headers=headers,
+                data=json.dumps(post_data)
+            )
+            
+            result = self._tweet_result(response)
+            if media_id and not result.get("success", False):
+                self._forget_media(image_path)
+            return result
                 
         except Exception as e:
             return {
@@ -147,19 +181,110 @@ class TwitterTool(BaseTool):
                 "error": f"Error posting to Twitter: {str(e)}"
             }
     
+    def _tweet_request(
+        self,
+        text: str,
+        schedule_time: Optional[str] = None,
+        media_id: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the endpoint and payload for creating a tweet."""
+        # Truncate text if it's too long
+        if len(text) > 280:
+            text = text[:277] + "..."
+            
+        # Create the post payload
+        post_data = {
+            "text": text
+        }
+        
+        # Add the media ID to the post
+        if media_id:
+            post_data["media"] = {
+                "media_ids": [media_id]
+            }
+        
+        # Add scheduling if provided
+        if schedule_time:
+            # Convert ISO-8601 to UNIX timestamp
+            import dateutil.parser
+            dt = dateutil.parser.parse(schedule_time)
+            unix_timestamp = int(dt.timestamp())
+            
+            post_data["scheduled_at"] = unix_timestamp
+            
+            # Use the scheduled tweets endpoint
+            endpoint = f"{self._api_url}/tweets/scheduled"
+        else:
+            # Use the regular tweets endpoint
+            endpoint = f"{self._api_url}/tweets"
+        
+        return endpoint, post_data
+    
+    def _tweet_result(self, response) -> Dict[str, Any]:
+        """Convert the response of a create-tweet request into the tool's result format."""
+        if response.status_code in (200, 201):
+            data = response.json()
+            return {
+                "success": True,
+                "tweet_id": data.get("data", {}).get("id"),
+                "post_id": data.get("data", {}).get("id"),  # Add post_id for consistency with LinkedInTool
+                "message": "Successfully posted to Twitter"
+            }
+        else:
+            return {
+                "success": False,
+                "error": f"Failed to post to Twitter: {response.status_code} - {response.text}"
+            }
+    
     def _upload_media(self, image_path: str) -> Optional[str]:
-        """Upload media to Twitter and return the media ID."""
+        """
+        Upload media to Twitter and return the media ID.
+        
+        A file already uploaded with the same access token whose media ID has
+        not expired yet is not uploaded again.
+        """
+        try:
+            cache_key = self._media_cache_key(image_path)
+            media_id = media_cache().get(cache_key)
+            if media_id:
+                return media_id
+        except OSError as e:
+            print(f"Error uploading media to Twitter: {str(e)}")
+            return None
+        
+        media_id, expires_after = self._send_media(image_path)
+        if media_id:
+            # Stop reusing the media ID a little before Twitter expires it
+            ttl = max(0, expires_after - 300) if expires_after else TWITTER_MEDIA_TTL
+            media_cache().set(cache_key, media_id, ttl=ttl)
+        return media_id
+    
+    def _media_cache_key(self, image_path: str) -> str:
+        """Return the media cache key of a file uploaded with this tool's access token."""
+        return media_cache_key("twitter", token_fingerprint(self._access_token), image_path)
+    
+    def _forget_media(self, image_path: str) -> None:
+        """Drop a cached upload after a tweet that used it failed, in case Twitter no longer accepts the media ID."""
+        try:
+            media_cache().invalidate(self._media_cache_key(image_path))
+        except OSError:
+            pass
+    
+    def _send_media(self, image_path: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Upload media to Twitter and return the media ID and the seconds until it expires.
+        
+        The file is memory-mapped and each APPEND segment is read only when it
+        is sent, with up to TWITTER_UPLOAD_CONCURRENCY segments in flight. A
+        segment that fails with a network or server error is sent again, so an
+        interrupted upload resumes with the segments not yet acknowledged
+        instead of starting over. Media that Twitter processes asynchronously
+        (videos, GIFs) is polled with STATUS until it is ready.
+        """
         try:
             # Twitter v1.1 API for media upload
             upload_url = "https://upload.twitter.com/1.1/media/upload.json"
             
-            # Read the image file
-            with open(image_path, "rb") as image_file:
-                image_data = image_file.read()
-            
-            # Encode the image data
-            base64_image = base64.b64encode(image_data).decode("utf-8")
-            
             # Get the file size
             file_size = os.path.getsize(image_path)
             
@@ -175,10 +300,14 @@ class TwitterTool(BaseTool):
                 "total_bytes": file_size,
                 "media_type": mime_type
             }
+            if mime_type == "image/gif":
+                init_data["media_category"] = "tweet_gif"
+            elif mime_type.startswith("video/"):
+                init_data["media_category"] = "tweet_video"
             
             headers = self._get_auth_headers("POST", upload_url, params=init_data)
             
-            init_response = requests.post(
+            init_response = self._http.post(
                 upload_url,
                 headers=headers,
                 data=init_data
@@ -186,38 +315,14 @@ class TwitterTool(BaseTool):
             
             if init_response.status_code != 200:
                 print(f"Failed to initialize media upload: {init_response.status_code} - {init_response.text}")
-                return None
+                return None, None
                 
             media_id = init_response.json().get("media_id_string")
             
             # APPEND phase
-            # Split the image into chunks if it's large
-            chunk_size = 5 * 1024 * 1024  # 5MB chunks
-            chunks = [image_data[i:i+chunk_size] for i in range(0, len(image_data), chunk_size)]
-            
-            for i, chunk in enumerate(chunks):
-                append_data = {
-                    "command": "APPEND",
-                    "media_id": media_id,
-                    "segment_index": i
-                }
-                
-                files = {
-                    "media": chunk
-                }
-                
-                headers = self._get_auth_headers("POST", upload_url, params=append_data)
-                
-                append_response = requests.post(
-                    upload_url,
-                    headers=headers,
-                    data=append_data,
-                    files=files
-                )
-                
-                if append_response.status_code != 200:
-                    print(f"Failed to append media chunk: {append_response.status_code} - {append_response.text}")
-                    return None
+            with open_media(image_path) as media:
+                if not self._append_segments(upload_url, media_id, media):
+                    return None, None
             
             # FINALIZE phase
             finalize_data = {
@@ -227,7 +332,7 @@ class TwitterTool(BaseTool):
             
             headers = self._get_auth_headers("POST", upload_url, params=finalize_data)
             
-            finalize_response = requests.post(
+            finalize_response = self._http.post(
                 upload_url,
                 headers=headers,
                 data=finalize_data
@@ -235,90 +340,292 @@ class TwitterTool(BaseTool):
             
             if finalize_response.status_code != 200:
                 print(f"Failed to finalize media upload: {finalize_response.status_code} - {finalize_response.text}")
-                return None
+                return None, None
+            
+            media_info = finalize_response.json()
+            if media_info.get("processing_info"):
+                media_info = self._wait_for_processing(upload_url, media_id, media_info)
+                if media_info is None:
+                    return None, None
                 
-            return media_id
+            return media_id, media_info.get("expires_after_secs")
             
         except Exception as e:
             print(f"Error uploading media to Twitter: {str(e)}")
-            return None
+            return None, None
     
-    def _get_auth_headers(self, method: str, url: str, params: Dict[str, Any] = None) -> Dict[str, str]:
-        """Generate OAuth 1.0a authentication headers for Twitter API requests."""
-        oauth_timestamp = str(int(time.time()))
-        oauth_nonce = hashlib.md5(str(time.time()).encode()).hexdigest()
-        
-        oauth_params = {
-            "oauth_consumer_key": self._api_key,
-            "oauth_nonce": oauth_nonce,
-            "oauth_signature_method": "HMAC-SHA1",
-            "oauth_timestamp": oauth_timestamp,
-            "oauth_token": self._access_token,
-            "oauth_version": "1.0"
-        }
+    def _append_segments(self, upload_url: str, media_id: str, media) -> bool:
+        """
+        Send the APPEND segments of an upload.
         
-        # Combine OAuth params with request params
-        all_params = {}
-        if params:
-            all_params.update(params)
-        all_params.update(oauth_params)
+        Args:
+            upload_url: The media upload endpoint
+            media_id: The media ID returned by INIT
+            media: The mapped file
+            
+        Returns:
+            True once Twitter has acknowledged every segment
+        """
+        segment_count = max(1, -(-len(media) // TWITTER_UPLOAD_CHUNK_SIZE))
+        pending = list(range(segment_count))
         
-        # Create the parameter string
-        param_string = "&".join([f"{key}={all_params[key]}" for key in sorted(all_params.keys())])
+        def append(segment_index: int) -> Tuple[int, Optional[bool]]:
+            """Send one segment. Returns the segment index and None on success, else whether the failure may be retried."""
+            append_data = {
+                "command": "APPEND",
+                "media_id": media_id,
+                "segment_index": segment_index
+            }
+            start = segment_index * TWITTER_UPLOAD_CHUNK_SIZE
+            files = {
+                "media": MediaSegment(media, start, start + TWITTER_UPLOAD_CHUNK_SIZE)
+            }
+            
+            # Multipart form fields are not part of the OAuth signature
+            headers = self._get_auth_headers("POST", upload_url)
+            
+            try:
+                append_response = self._http.post(
+                    upload_url,
+                    headers=headers,
+                    data=append_data,
+                    files=files
+                )
+            except requests.exceptions.RequestException as e:
+                print(f"Network error appending media segment {segment_index}: {str(e)}")
+                return segment_index, True
+            
+            if append_response.status_code in (200, 201, 204):
+                return segment_index, None
+            print(f"Failed to append media chunk: {append_response.status_code} - {append_response.text}")
+            return segment_index, append_response.status_code == 429 or append_response.status_code >= 500
         
-        # Create the signature base string
-        signature_base = f"{method}&{requests.utils.quote(url, safe='')}&{requests.utils.quote(param_string, safe='')}"
+        for attempt in range(TWITTER_UPLOAD_RETRIES + 1):
+            if attempt:
+                # Back off before resuming with the segments that were not acknowledged
+                time.sleep(min(2 ** attempt, 30))
+            
+            with ThreadPoolExecutor(max_workers=max(1, min(TWITTER_UPLOAD_CONCURRENCY, len(pending)))) as executor:
+                outcomes = list(executor.map(append, pending))
+            
+            failed = [(segment_index, retryable) for segment_index, retryable in outcomes if retryable is not None]
+            if not failed:
+                return True
+            if not all(retryable for _, retryable in failed):
+                return False
+            pending = [segment_index for segment_index, _ in failed]
         
-        # Create the signing key
-        signing_key = f"{requests.utils.quote(self._api_secret, safe='')}&{requests.utils.quote(self._access_token_secret, safe='')}"
+        return False
+    
+    def _wait_for_processing(self, upload_url: str, media_id: str, media_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Poll STATUS until Twitter has processed an uploaded media.
         
-        # Generate the signature
-        signature = base64.b64encode(
-            hmac.new(
-                signing_key.encode(),
-                signature_base.encode(),
-                hashlib.sha1
-            ).digest()
-        ).decode()
+        Args:
+            upload_url: The media upload endpoint
+            media_id: The media ID
+            media_info: The FINALIZE response
+            
+        Returns:
+            The last media info, or None if processing failed or timed out
+        """
+        deadline = time.monotonic() + TWITTER_PROCESSING_TIMEOUT
+        while True:
+            processing_info = media_info.get("processing_info") or {}
+            state = processing_info.get("state")
+            if state in (None, "succeeded"):
+                return media_info
+            if state == "failed":
+                print(f"Twitter failed to process media {media_id}: {processing_info.get('error')}")
+                return None
+            
+            wait = processing_info.get("check_after_secs", 1)
+            if time.monotonic() + wait > deadline:
+                print(f"Timed out waiting for Twitter to process media {media_id}")
+                return None
+            time.sleep(wait)
+            
+            status_params = {
+                "command": "STATUS",
+                "media_id": media_id
+            }
+            headers = self._get_auth_headers("GET", upload_url, params=status_params)
+            status_response = self._http.get(
+                upload_url,
+                headers=headers,
+                params=status_params
+            )
+            if status_response.status_code != 200:
+                print(f"Failed to get media processing status: {status_response.status_code} - {status_response.text}")
+                return None
+            media_info = status_response.json()
+    
+    def _get_auth_headers(self, method: str, url: str, params: Dict[str, Any] = None) -> Dict[str, str]:
+        """
+        Generate OAuth 1.0a authentication headers for Twitter API requests.
         
-        # Add the signature to the OAuth params
-        oauth_params["oauth_signature"] = signature
+        Args:
+            method: HTTP method
+            url: Request URL; query parameters in it are signed too
+            params: Query or form-encoded body parameters sent with the request
+            
+        Returns:
+            Dictionary with the Authorization header
+        """
+        signer = get_oauth1_signer(self._api_key, self._api_secret, self._access_token, self._access_token_secret)
+        return signer.headers(method, url, params)
         
-        # Create the Authorization header
-        auth_header = "OAuth " + ", ".join([f'{key}="{requests.utils.quote(oauth_params[key], safe="")}"' for key in oauth_params])
+    def _reply_cursors(self):
+        """The persisted replies search position per conversation."""
+        return shared_cache("twitter_reply_cursors", TWITTER_REPLY_CURSOR_TTL, persist=True)
+    
+    def _reply_cursor(self, tweet_id: str, new_only: bool) -> Dict[str, Any]:
+        """
+        Get where a replies search of a conversation starts.
         
+        Returns:
+            Dictionary with the "since_id" to search from and, when the previous
+            search was cut short by TWITTER_REPLY_MAX_PAGES, the "next_token"
+            to resume it and the "newest_id" it started with
+        """
+        if not new_only:
+            return {}
+        cursor = self._reply_cursors().get(tweet_id)
+        if isinstance(cursor, str):
+            # Stored before searches could be resumed
+            return {"since_id": cursor}
+        return dict(cursor or {})
+    
+    def _replies_params(self, tweet_id: str, since_id: Optional[str], next_token: Optional[str]) -> Dict[str, Any]:
+        """Build the query parameters of one page of a replies search."""
+        # id and text are returned by default and are all the monitor uses,
+        # so no extra tweet.fields are requested
+        params = {
+            "query": f"conversation_id:{tweet_id}",
+            "max_results": 100
+        }
+        if since_id:
+            params["since_id"] = since_id
+        if next_token:
+            params["next_token"] = next_token
+        return params
+    
+    def _replies_result(
+        self,
+        tweet_id: str,
+        new_only: bool,
+        replies: List[Dict[str, Any]],
+        cursor: Dict[str, Any],
+        newest_id: Optional[str],
+        next_token: Optional[str]
+    ) -> Dict[str, Any]:
+        """Advance the conversation's cursor and build the result of a replies search."""
+        # A resumed search started with the newest reply of its first part
+        newest_id = cursor.get("newest_id") or newest_id
+        if new_only:
+            if next_token:
+                # Pages were left unfetched; the next search resumes from them
+                # and only then moves since_id forward
+                self._reply_cursors().set(tweet_id, {
+                    "since_id": cursor.get("since_id"),
+                    "next_token": next_token,
+                    "newest_id": newest_id
+                })
+            elif newest_id:
+                self._reply_cursors().set(tweet_id, {"since_id": newest_id})
+        return {
+            "success": True,
+            "replies": replies,
+            "newest_id": newest_id,
+            "has_more": bool(next_token)
+        }
+    
+    def _replies_error(self, tweet_id: str, cursor: Dict[str, Any], response) -> Dict[str, Any]:
+        """Build the result of a failed replies search."""
+        if cursor.get("next_token"):
+            # The resume token may have expired; search from since_id again next
+            # time (replies returned twice are deduplicated by the monitor)
+            self._reply_cursors().set(tweet_id, {"since_id": cursor.get("since_id")})
         return {
-            "Authorization": auth_header
+            "success": False,
+            "error": f"Failed to get tweet replies: {response.status_code} - {response.text}"
         }
+    
+    def get_tweet_replies(self, tweet_id: str, new_only: bool = False) -> Dict[str, Any]:
+        """
+        Get replies to a tweet.
+        
+        Follows next_token pagination, up to TWITTER_REPLY_MAX_PAGES pages of
+        100 replies. With new_only, a search cut short by that limit is resumed
+        by the next call before newer replies are fetched, so no reply is skipped.
         
-    def get_tweet_replies(self, tweet_id: str) -> Dict[str, Any]:
-        """Get replies to a tweet."""
+        Args:
+            tweet_id: ID of the tweet whose conversation to search
+            new_only: Only return replies newer than the newest one returned by
+                the previous new_only call for this tweet (passed as since_id)
+            
+        Returns:
+            Dictionary containing the replies, newest first
+        """
         try:
             endpoint = f"{self._api_url}/tweets/search/recent"
-            params = {
-                "query": f"conversation_id:{tweet_id}",
-                "tweet.fields": "in_reply_to_user_id,author_id,created_at,conversation_id"
-            }
-            
-            # Convert params to query string
-            query_string = "&".join([f"{key}={params[key]}" for key in params])
-            url = f"{endpoint}?{query_string}"
+            cursor = self._reply_cursor(tweet_id, new_only)
             
-            headers = self._get_auth_headers("GET", url)
-            
-            response = requests.get(url, headers=headers)
+            replies = []
+            newest_id = None
+            next_token = cursor.get("next_token")
+            for _ in range(TWITTER_REPLY_MAX_PAGES):
+                params = self._replies_params(tweet_id, cursor.get("since_id"), next_token)
+                headers = self._get_auth_headers("GET", endpoint, params=params)
+                
+                response = self._http.get(endpoint, headers=headers, params=params)
+                
+                if response.status_code != 200:
+                    return self._replies_error(tweet_id, cursor, response)
+                
+                data = response.json()
+                replies.extend(data.get("data", []))
+                meta = data.get("meta", {})
+                newest_id = newest_id or meta.get("newest_id")
+                next_token = meta.get("next_token")
+                if not next_token:
+                    break
+                
+            return self._replies_result(tweet_id, new_only, replies, cursor, newest_id, next_token)
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error getting tweet replies: {str(e)}"
+            }
+    
+    async def aget_tweet_replies(self, tweet_id: str, new_only: bool = False) -> Dict[str, Any]:
+        """Get replies to a tweet without blocking the event loop (see get_tweet_replies)."""
+        try:
+            endpoint = f"{self._api_url}/tweets/search/recent"
+            cursor = self._reply_cursor(tweet_id, new_only)
             
-            if response.status_code == 200:
+            replies = []
+            newest_id = None
+            next_token = cursor.get("next_token")
+            for _ in range(TWITTER_REPLY_MAX_PAGES):
+                params = self._replies_params(tweet_id, cursor.get("since_id"), next_token)
+                headers = self._get_auth_headers("GET", endpoint, params=params)
+                
+                response = await arequest("GET", endpoint, headers=headers, params=params)
+                
+                if response.status_code != 200:
+                    return self._replies_error(tweet_id, cursor, response)
+                
                 data = response.json()
-                return {
-                    "success": True,
-                    "replies": data.get("data", [])
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"Failed to get tweet replies: {response.status_code} - {response.text}"
-                }
+                replies.extend(data.get("data", []))
+                meta = data.get("meta", {})
+                newest_id = newest_id or meta.get("newest_id")
+                next_token = meta.get("next_token")
+                if not next_token:
+                    break
+                
+            return self._replies_result(tweet_id, new_only, replies, cursor, newest_id, next_token)
                 
         except Exception as e:
             return {
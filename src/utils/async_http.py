@@ -0,0 +1,72 @@
+"""
+Asynchronous HTTP helpers for the platform tools.
+
+The async publishing path needs the optional ``aiohttp`` package
+(``pip install aiohttp``). One client session is kept per event loop so that
+connections are reused across requests.
+"""
+
+import asyncio
+import json
+import weakref
+from typing import Any
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+_sessions: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+class AsyncResponse:
+    """The parts of a ``requests.Response`` that the platform tools rely on."""
+
+    def __init__(self, status_code: int, headers: Any, text: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+def get_async_session() -> "aiohttp.ClientSession":
+    """Return the client session for the running event loop, creating it if needed."""
+    if aiohttp is None:
+        raise RuntimeError("The aiohttp package is required for async publishing. Install it with: pip install aiohttp")
+
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=60, connect=10),
+            connector=aiohttp.TCPConnector(limit=200, limit_per_host=100)
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def arequest(method: str, url: str, **kwargs) -> AsyncResponse:
+    """
+    Make an HTTP request without blocking the event loop.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        **kwargs: Passed to ``aiohttp.ClientSession.request`` (headers, json, data, params, ...)
+
+    Returns:
+        An AsyncResponse with the status code, headers and body text
+    """
+    session = get_async_session()
+    async with session.request(method, url, **kwargs) as response:
+        text = await response.text()
+        return AsyncResponse(response.status, response.headers, text)
+
+
+async def close_async_session() -> None:
+    """Close the client session of the running event loop."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
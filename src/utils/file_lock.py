@@ -0,0 +1,37 @@
+"""
+Advisory locks on open files, shared by every process using the same file.
+
+Used to serialize writers of files that several processes (web UI, scheduler,
+monitor) read and write: the JSON schedule and the persisted caches. POSIX
+systems get shared and exclusive locks through ``fcntl.flock``; on Windows
+``msvcrt`` only offers exclusive locks, so shared locks are exclusive there.
+"""
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# Whether shared locks exist; without them every lock is exclusive
+SHARED_LOCKS = fcntl is not None
+
+
+def lock_handle(handle, exclusive: bool) -> None:
+    """Take an advisory lock on an open lock file, blocking until it is free."""
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    else:
+        # msvcrt only has exclusive locks
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def unlock_handle(handle) -> None:
+    """Release an advisory lock taken with lock_handle."""
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,58 @@
+"""
+Shared Gemini API client.
+
+Building a ``genai.Client`` sets up its credentials and HTTP connection pool.
+The image tool used to pay that cost on every request. The client is now
+created once per process on first use and shared by all threads, which the
+client supports. ``warm_up_genai_client`` can be called at service start so
+the first image request finds the client and its connection ready.
+"""
+
+import logging
+import threading
+from typing import Any, Optional
+import google.generativeai as genai
+from src.config.config import GEMINI_IMAGE_MODEL, GEMINI_REQUESTS_PER_MINUTE
+from src.utils.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[Any] = None
+_client_lock = threading.Lock()
+_generation_quota = RateLimiter(GEMINI_REQUESTS_PER_MINUTE)
+
+
+def get_genai_client():
+    """Return the process-wide Gemini client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = genai.Client()
+    return _client
+
+
+def generation_quota() -> RateLimiter:
+    """Return the process-wide per-minute quota for generation requests."""
+    return _generation_quota
+
+
+def warm_up_genai_client(model: str = GEMINI_IMAGE_MODEL, background: bool = True) -> None:
+    """
+    Create the shared client and open its connection to the API.
+
+    Args:
+        model: Model to look up; the lookup is a cheap request that establishes the connection
+        background: Warm up in a daemon thread instead of blocking the caller
+    """
+    def warm_up():
+        try:
+            get_genai_client().models.get(model=model)
+            logger.info("Gemini client warmed up")
+        except Exception as e:
+            logger.warning(f"Gemini client warm-up failed: {str(e)}")
+
+    if background:
+        threading.Thread(target=warm_up, name="genai-warm-up", daemon=True).start()
+    else:
+        warm_up()
@@ -0,0 +1,89 @@
+"""
+Shared HTTP transport for the platform tools.
+
+All tools send their requests through one pooled ``requests.Session`` per
+process, so connections to api.linkedin.com, api.twitter.com and the upload
+hosts are kept alive and reused instead of doing a new TCP and TLS handshake
+for every call. Pool sizes, timeouts and retries come from the HTTP_* settings.
+"""
+
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.config.config import (
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_MAX_RETRIES
+)
+
+# Only idempotent requests are retried automatically; retrying a POST could
+# publish the same post twice
+RETRY_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class PooledSession(requests.Session):
+    """A ``requests.Session`` that applies a default timeout to every request."""
+
+    def __init__(self, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_http_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    max_retries: int = HTTP_MAX_RETRIES,
+    timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+) -> PooledSession:
+    """
+    Create a pooled session with retries.
+
+    Args:
+        pool_connections: Number of hosts to keep connection pools for
+        pool_maxsize: Maximum number of kept-alive connections per host
+        max_retries: Retries for connection errors and 429/5xx responses to idempotent requests
+        timeout: Default (connect, read) timeout in seconds
+
+    Returns:
+        The new session
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    session = PooledSession(timeout=timeout)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session: Optional[PooledSession] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> PooledSession:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_http_session()
+    return _session
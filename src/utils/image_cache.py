@@ -0,0 +1,326 @@
+"""
+Content-addressed cache of generated images.
+
+Generated images are stored in ``generated_images/`` under a name derived
+from the SHA-256 of their bytes, so two images can never overwrite each other.
+An index maps the inputs of a generation (model, normalized prompt, reference
+image hash, generation config) to the image file. A repeated request is then
+answered from disk instead of calling the model again.
+
+Disk use is bounded with least-recently-used eviction. Images used within
+the grace period are never evicted, even above the size budget, because
+scheduled posts may still point at them. The index is shared by every
+process generating images (web UI, scheduler).
+"""
+
+import os
+import json
+import time
+import hashlib
+import mimetypes
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from src.config.config import (
+    GENERATED_IMAGES_DIR,
+    GEMINI_IMAGE_CACHE_MAX_BYTES,
+    GEMINI_IMAGE_CACHE_MIN_AGE
+)
+from src.utils.file_lock import lock_handle, unlock_handle
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize a prompt so that variants differing only in case or whitespace share a cache entry."""
+    return " ".join(prompt.split()).casefold()
+
+
+def generation_key(model: str, prompt: str, reference_digest: Optional[str], config: Dict[str, Any]) -> str:
+    """
+    Return the cache key of an image generation request.
+
+    Args:
+        model: Model name
+        prompt: Text prompt (normalized here)
+        reference_digest: SHA-256 of the reference image, if any
+        config: Generation config sent to the model
+
+    Returns:
+        The hex key
+    """
+    request = {
+        "model": model,
+        "prompt": normalize_prompt(prompt),
+        "reference": reference_digest,
+        "config": config
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+
+class ImageCache:
+    """
+    Index of generated images with size-bounded LRU eviction, shared by processes.
+
+    The index is a JSON snapshot plus a JSON-lines journal of changes, written
+    under an advisory lock like the persisted TTLCache: every change first
+    catches up with the journal, so no process overwrites entries another
+    one added, and eviction only deletes images that are in the up-to-date
+    index. A hit only touches the image file: its modification time is the
+    time it was last used.
+
+    Args:
+        directory: Directory the images are stored in
+        max_bytes: Disk budget for the cached images
+        min_age: Seconds since last use before an image may be evicted
+        compact_bytes: Journal size at which the index is compacted
+    """
+
+    def __init__(self, directory: str, max_bytes: int, min_age: float, compact_bytes: int = 64 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.min_age = min_age
+        self.compact_bytes = compact_bytes
+        self.index_path = os.path.join(directory, ".image_cache.json")
+        self.journal_path = f"{self.index_path}.journal"
+        self.lock_path = f"{self.index_path}.lock"
+        self._lock = threading.Lock()
+        self._lock_file = None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # Files as of the last read, and how much of the journal was read
+        self._version = None
+        self._journal_offset = 0
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Hold the cross-process lock on the index files. Called with the lock held."""
+        if self._lock_file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._lock_file = open(self.lock_path, "a+")
+        lock_handle(self._lock_file, exclusive)
+        try:
+            yield
+        finally:
+            unlock_handle(self._lock_file)
+
+    def _file_version(self) -> Tuple[Any, Any]:
+        """Identify the current snapshot and journal files."""
+        version = []
+        for path in (self.index_path, self.journal_path):
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+
+    def _reload(self) -> None:
+        """Read the snapshot and the whole journal. Called with the file lock held."""
+        try:
+            with open(self.index_path, "r") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+        self._journal_offset = 0
+        self._read_journal()
+        self._version = self._file_version()
+
+    def _read_journal(self) -> None:
+        """Apply the journal lines written since the last read. Called with the file lock held."""
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(self._journal_offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Being written by another process; read it next time
+                        break
+                    self._journal_offset += len(line)
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue
+        except FileNotFoundError:
+            pass
+
+    def _apply(self, change: Dict[str, Any]) -> None:
+        """Apply one journal line to the in-memory index."""
+        op = change.get("op")
+        if op == "put":
+            self._entries[change["key"]] = change["entry"]
+        elif op == "remove":
+            for key in change["keys"]:
+                self._entries.pop(key, None)
+
+    def _refresh(self) -> None:
+        """Bring the in-memory index up to date with the files. Called with the file lock held."""
+        version = self._file_version()
+        if version == self._version:
+            return
+        snapshot, journal = version
+        previous_snapshot, previous_journal = self._version or (None, None)
+        if (
+            snapshot != previous_snapshot
+            or journal is None
+            or journal[2] < self._journal_offset
+            or (previous_journal is not None and journal[0] != previous_journal[0])
+        ):
+            # Compacted or replaced since the last read
+            self._reload()
+        else:
+            self._read_journal()
+            self._version = version
+
+    def _sync(self) -> None:
+        """Pick up changes other processes made to the index. Called with the lock held."""
+        if self._file_version() == self._version:
+            return
+        with self._file_lock(exclusive=False):
+            self._refresh()
+
+    def _write(self, changes: List[Dict[str, Any]]) -> None:
+        """Apply changes and append them to the journal. Called with the lock and the exclusive file lock held."""
+        for change in changes:
+            self._apply(change)
+        with open(self.journal_path, "a") as f:
+            for change in changes:
+                f.write(json.dumps(change) + "\n")
+        if os.path.getsize(self.journal_path) >= self.compact_bytes:
+            self._compact()
+        else:
+            self._journal_offset = os.path.getsize(self.journal_path)
+            self._version = self._file_version()
+
+    def _compact(self) -> None:
+        """Replace the snapshot with the current index and drop the journal. Called with the file lock held."""
+        temp_file = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(temp_file, self.index_path)
+        os.remove(self.journal_path)
+        self._journal_offset = 0
+        self._version = self._file_version()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a generation.
+
+        Args:
+            key: Key from ``generation_key``
+
+        Returns:
+            The entry with ``image_path`` and ``mime_type``, or None on a miss
+        """
+        with self._lock:
+            self._sync()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            try:
+                # Mark the image as used without rewriting the index
+                os.utime(entry["image_path"])
+            except FileNotFoundError:
+                with self._file_lock(exclusive=True):
+                    self._refresh()
+                    # Unless another process stored the image again meanwhile
+                    entry = self._entries.get(key)
+                    if entry is not None and not os.path.exists(entry["image_path"]):
+                        self._write([{"op": "remove", "keys": [key]}])
+                return None
+            return dict(entry)
+
+    def put(self, key: Optional[str], data: bytes, mime_type: str) -> str:
+        """
+        Store a generated image under its content hash and index it.
+
+        Args:
+            key: Key from ``generation_key``, or None to only store the file
+            data: Image bytes
+            mime_type: MIME type of the image
+
+        Returns:
+            Path of the image file
+        """
+        extension = mimetypes.guess_extension(mime_type or "") or ".png"
+        file_name = f"gemini_image_{hashlib.sha256(data).hexdigest()[:32]}{extension}"
+        image_path = os.path.join(self.directory, file_name)
+
+        with self._lock, self._file_lock(exclusive=True):
+            # Written under the file lock so that eviction in another process
+            # cannot delete the image between writing and indexing it
+            try:
+                os.utime(image_path)
+            except FileNotFoundError:
+                temp_file = f"{image_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_file, "wb") as f:
+                    f.write(data)
+                os.replace(temp_file, image_path)
+
+            if key is not None:
+                self._refresh()
+                entry = {"image_path": image_path, "mime_type": mime_type, "size": len(data)}
+                self._write([{"op": "put", "key": key, "entry": entry}])
+                evicted = self._evict(exclude=image_path)
+                if evicted:
+                    self._write([{"op": "remove", "keys": evicted}])
+        return image_path
+
+    def _evict(self, exclude: str) -> List[str]:
+        """
+        Delete least recently used images until the cache fits its budget.
+
+        Called with the lock and the exclusive file lock held, after catching
+        up with the journal, so every indexed image is known.
+
+        Args:
+            exclude: Image that was just stored
+
+        Returns:
+            Keys of the deleted (or already missing) images
+        """
+        # Several keys can share one file
+        files: Dict[str, List[str]] = {}
+        for key, entry in self._entries.items():
+            files.setdefault(entry["image_path"], []).append(key)
+
+        stale: List[str] = []
+        candidates = []
+        total = 0
+        for image_path, keys in files.items():
+            try:
+                stat = os.stat(image_path)
+            except FileNotFoundError:
+                stale.extend(keys)
+                continue
+            total += stat.st_size
+            candidates.append((stat.st_mtime, image_path, stat.st_size, keys))
+
+        cutoff = time.time() - self.min_age
+        for last_used, image_path, size, keys in sorted(candidates):
+            if total <= self.max_bytes or last_used > cutoff:
+                break
+            if image_path == exclude:
+                continue
+            try:
+                os.remove(image_path)
+            except FileNotFoundError:
+                pass
+            stale.extend(keys)
+            total -= size
+
+        return stale
+
+
+_image_cache: Optional[ImageCache] = None
+_image_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageCache:
+    """Return the process-wide cache of generated images, creating it on first use."""
+    global _image_cache
+    if _image_cache is None:
+        with _image_cache_lock:
+            if _image_cache is None:
+                _image_cache = ImageCache(
+                    GENERATED_IMAGES_DIR,
+                    GEMINI_IMAGE_CACHE_MAX_BYTES,
+                    GEMINI_IMAGE_CACHE_MIN_AGE
+                )
+    return _image_cache
@@ -0,0 +1,273 @@
+"""
+Per-platform image variants for uploads.
+
+Generated PNGs and uploaded photos are usually far larger than the platforms
+display them. Before an image is uploaded it is scaled down to the platform's
+recommended size and re-encoded, to JPEG for LinkedIn and WebP for Twitter,
+under the platform's size limit. Re-encoding is CPU-bound, so it runs in a
+small process pool instead of blocking the scheduler threads or the event loop.
+
+Variants are stored in IMAGE_VARIANTS_DIR under the SHA-256 of the source
+image and the platform name. An image posted again, or posted by another
+process, is then a file lookup. If the source is already acceptable and
+smaller than any re-encoding, it is used as it is.
+
+Requires Pillow; without it images are uploaded unchanged.
+"""
+
+import io
+import os
+import glob
+import time
+import logging
+import mimetypes
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+from src.config.config import (
+    IMAGE_OPTIMIZATION,
+    IMAGE_VARIANTS_DIR,
+    IMAGE_PROCESS_WORKERS,
+    IMAGE_VARIANT_MAX_AGE
+)
+from src.utils.media_cache import media_digest
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Largest size each platform displays, the encoding used, and the upload limit.
+# Images with transparency use alpha_format, since JPEG cannot store it.
+PLATFORM_PROFILES: Dict[str, Dict[str, Any]] = {
+    "linkedin": {
+        "max_size": (1200, 1200),
+        "format": "JPEG",
+        "alpha_format": "PNG",
+        "accepted_formats": ("JPEG", "PNG"),
+        "quality": 85,
+        "max_bytes": 5 * 1024 * 1024
+    },
+    "twitter": {
+        "max_size": (2048, 2048),
+        "format": "WEBP",
+        "alpha_format": "WEBP",
+        "accepted_formats": ("JPEG", "PNG", "WEBP"),
+        "quality": 85,
+        "max_bytes": 5 * 1024 * 1024
+    }
+}
+
+# Still images that are re-encoded; GIFs (possibly animated) and videos are uploaded unchanged
+OPTIMIZED_TYPES = frozenset(["image/jpeg", "image/png", "image/webp", "image/bmp", "image/tiff"])
+
+EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp"}
+
+MIN_QUALITY = 55
+
+
+def profile_name(platform: str) -> str:
+    """Return the PLATFORM_PROFILES key of a platform name ("x" is Twitter)."""
+    platform = (platform or "").lower()
+    return "twitter" if platform == "x" else platform
+
+
+def _encode(image, image_format: str, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == "JPEG":
+        image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    elif image_format == "WEBP":
+        image.save(buffer, "WEBP", quality=quality, method=4)
+    else:
+        image.save(buffer, image_format, optimize=True)
+    return buffer.getvalue()
+
+
+def _has_alpha(image) -> bool:
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        return image.convert("RGBA").getextrema()[3][0] < 255
+    return False
+
+
+def _render_variant(source_path: str, target_base: str, profile: Dict[str, Any]) -> str:
+    """
+    Write the variant of an image for a platform. Runs in a worker process.
+
+    Args:
+        source_path: Path to the source image
+        target_base: Path of the variant without its extension
+        profile: Entry of PLATFORM_PROFILES
+
+    Returns:
+        Path of the variant
+    """
+    source_size = os.path.getsize(source_path)
+    with Image.open(source_path) as source:
+        source_format = source.format
+        image = ImageOps.exif_transpose(source)
+        has_alpha = _has_alpha(image)
+        image_format = profile["alpha_format"] if has_alpha else profile["format"]
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+        max_width, max_height = profile["max_size"]
+        fits = image.width <= max_width and image.height <= max_height
+        image.thumbnail(profile["max_size"], Image.LANCZOS)
+
+        # Lower the quality, then the dimensions, until the image is under the limit
+        quality = profile["quality"]
+        data = _encode(image, image_format, quality)
+        while len(data) > profile["max_bytes"]:
+            if quality > MIN_QUALITY and image_format != "PNG":
+                quality -= 10
+            else:
+                image = image.resize((max(1, image.width * 3 // 4), max(1, image.height * 3 // 4)), Image.LANCZOS)
+            data = _encode(image, image_format, quality)
+
+    if fits and source_format in profile["accepted_formats"] and source_size <= min(len(data), profile["max_bytes"]):
+        # The source is already as good as it gets
+        with open(source_path, "rb") as f:
+            data = f.read()
+        target_path = target_base + os.path.splitext(source_path)[1].lower()
+    else:
+        target_path = target_base + EXTENSIONS[image_format]
+
+    temp_file = f"{target_path}.{os.getpid()}.tmp"
+    with open(temp_file, "wb") as f:
+        f.write(data)
+    os.replace(temp_file, target_path)
+    return target_path
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Variants being rendered, so that concurrent requests for one variant share the work
+_pending: Dict[str, Future] = {}
+_pending_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """
+    Return the process pool that renders variants, creating it on first use.
+
+    Workers are spawned rather than forked: the web UI and the scheduler are
+    multi-threaded, and a child forked while another thread holds a lock
+    (logging, requests, the Gemini client) would deadlock on it.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=max(1, IMAGE_PROCESS_WORKERS),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def _find_variant(target_base: str) -> Optional[str]:
+    for path in glob.glob(f"{target_base}.*"):
+        if not path.endswith(".tmp"):
+            return path
+    return None
+
+
+def _prune_variants() -> None:
+    """Delete variants that have not been used for IMAGE_VARIANT_MAX_AGE seconds."""
+    cutoff = time.time() - IMAGE_VARIANT_MAX_AGE
+    for path in glob.glob(os.path.join(IMAGE_VARIANTS_DIR, "*")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _variant_future(image_path: str, platform: str) -> Optional[Future]:
+    """
+    Start rendering the variant of an image for a platform unless it exists.
+
+    Returns:
+        A future resolving to the variant path, or None if the image is used unchanged
+    """
+    profile = PLATFORM_PROFILES.get(profile_name(platform))
+    if (
+        not IMAGE_OPTIMIZATION
+        or Image is None
+        or profile is None
+        or not image_path
+        or not os.path.isfile(image_path)
+        or mimetypes.guess_type(image_path)[0] not in OPTIMIZED_TYPES
+    ):
+        return None
+
+    variant_name = f"{media_digest(image_path)[:32]}-{profile_name(platform)}"
+    target_base = os.path.abspath(os.path.join(IMAGE_VARIANTS_DIR, variant_name))
+    with _pending_lock:
+        future = _pending.get(target_base)
+        if future is not None:
+            return future
+
+        variant_path = _find_variant(target_base)
+        if variant_path:
+            # Mark the variant as used so that it is not pruned
+            os.utime(variant_path)
+            future = Future()
+            future.set_result(variant_path)
+            return future
+
+        os.makedirs(IMAGE_VARIANTS_DIR, exist_ok=True)
+        future = _get_pool().submit(_render_variant, os.path.abspath(image_path), target_base, profile)
+        _pending[target_base] = future
+
+    def finished(done: Future) -> None:
+        with _pending_lock:
+            _pending.pop(target_base, None)
+        if done.exception() is None:
+            _prune_variants()
+
+    future.add_done_callback(finished)
+    return future
+
+
+def optimized_image(image_path: Optional[str], platform: str) -> Optional[str]:
+    """
+    Return the file to upload for an image posted to a platform.
+
+    Args:
+        image_path: Path to the image (or video)
+        platform: Platform name ("linkedin", "twitter", "x")
+
+    Returns:
+        Path of the platform variant, rendering it first if needed, or
+        image_path itself if the file is not optimized or rendering fails
+    """
+    try:
+        future = _variant_future(image_path, platform)
+        if future is None:
+            return image_path
+        return future.result()
+    except Exception as e:
+        logger.warning(f"Could not optimize {image_path} for {platform}, uploading it unchanged: {str(e)}")
+        return image_path
+
+
+def prepare_variants(image_path: Optional[str], platforms: Iterable[str]) -> None:
+    """
+    Start rendering the variants of an image in the background.
+
+    Called when an image is attached to a scheduled post, so that the variant
+    is ready by the time the post is published.
+
+    Args:
+        image_path: Path to the image
+        platforms: Platforms the image will be posted to
+    """
+    for platform in platforms:
+        try:
+            _variant_future(image_path, platform)
+        except Exception as e:
+            logger.warning(f"Could not prepare {image_path} for {platform}: {str(e)}")
@@ -0,0 +1,62 @@
+"""
+Content-addressed cache of uploaded media.
+
+The platforms let an uploaded asset (a LinkedIn asset URN, a Twitter media_id)
+be attached to more than one post for a while. The cache maps the SHA-256 of a
+file's bytes, per platform and account, to the uploaded asset. Posting the same
+image again within the platform's validity window is then a local lookup
+instead of a new upload. The cache is persisted in CACHE_DIR; uploads made by
+the scheduler, the monitor or the web UI are seen by the others on their next
+lookup (see ttl_cache for how the processes coordinate).
+"""
+
+import os
+import hashlib
+from functools import lru_cache
+from src.utils.media_upload import open_media
+from src.utils.ttl_cache import TTLCache, shared_cache
+
+
+def media_cache() -> TTLCache:
+    """Return the process-wide cache of uploaded media."""
+    # Every entry is stored with the TTL of its platform
+    return shared_cache("media_uploads", 24 * 3600, persist=True)
+
+
+@lru_cache(maxsize=1024)
+def _digest(path: str, size: int, mtime_ns: int) -> str:
+    with open_media(path) as media:
+        return hashlib.sha256(media).hexdigest()
+
+
+def media_digest(path: str) -> str:
+    """
+    Return the SHA-256 of a file's bytes.
+
+    The digest is remembered per path, size and modification time, so a file
+    is only hashed again after it changes.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        The hex digest
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _digest(path, stat.st_size, stat.st_mtime_ns)
+
+
+def media_cache_key(platform: str, account: str, path: str) -> str:
+    """
+    Return the cache key of a file uploaded to a platform account.
+
+    Args:
+        platform: Platform name ("linkedin", "twitter")
+        account: The account that owns the upload (author URN, token fingerprint)
+        path: Path to the file
+
+    Returns:
+        The cache key
+    """
+    return f"{platform}:{account}:{media_digest(path)}"
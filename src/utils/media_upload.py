@@ -0,0 +1,76 @@
+"""
+Constant-memory access to media files for uploads.
+
+Media files are memory-mapped instead of being read into a bytes object, so
+large images and videos stay in the page cache instead of on the heap. Request
+bodies are file-like windows over the mapping. requests streams them in small
+blocks, and urllib3 can rewind them when it retries a request.
+"""
+
+import os
+import mmap
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+@contextmanager
+def open_media(path: str) -> Iterator[Buffer]:
+    """
+    Memory-map a media file read-only.
+
+    Args:
+        path: Path to the file
+
+    Yields:
+        The mapping of the file (``b""`` for an empty file, which cannot be mapped)
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapping
+        finally:
+            mapping.close()
+
+
+class MediaSegment:
+    """
+    A read-only, seekable file-like window over part of a buffer.
+
+    Args:
+        buffer: The whole media, usually a mapping from ``open_media``
+        start: Offset of the first byte of the segment
+        end: Offset just past the last byte of the segment (defaults to the end of the buffer)
+    """
+
+    def __init__(self, buffer: Buffer, start: int = 0, end: int = None):
+        self._buffer = buffer
+        self.start = start
+        self.end = len(buffer) if end is None else min(end, len(buffer))
+        self._position = 0
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = len(self) - self._position
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        begin = self.start + self._position
+        self._position += size
+        return self._buffer[begin:begin + size]
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += len(self)
+        self._position = max(0, min(offset, len(self)))
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
@@ -0,0 +1,99 @@
+"""
+Import an existing JSON schedule into the SQLite schedule store.
+
+Usage:
+    python migrate_schedule.py [--source content_schedule.json] [--target content_schedule.db]
+"""
+
+import os
+import argparse
+from typing import Dict, Any
+from src.utils.schedule_store import JsonScheduleStore, SqliteScheduleStore, sqlite_path_for
+
+def migrate_schedule(source: str, target: str, replace: bool = False) -> Dict[str, Any]:
+    """
+    Copy every post from a JSON schedule file into a SQLite schedule database.
+
+    The schedule is read through JsonScheduleStore, so changes still in the
+    journal are included, and its archive is copied into the archived posts
+    table. Live posts are written in a single transaction: a failed import
+    leaves them untouched and can be run again.
+
+    Args:
+        source: Path to the JSON schedule file
+        target: Path to the SQLite database
+        replace: Replace posts that already exist in the database instead of skipping them
+
+    Returns:
+        Dictionary with the number of imported, skipped, renamed and archived posts
+    """
+    json_store = JsonScheduleStore(source)
+    schedule = json_store.load()
+    archived_posts = json_store.list_archived_posts()
+
+    store = SqliteScheduleStore(target)
+    posts = []
+    renamed = []
+    seen_ids = set()
+
+    for post in schedule.get("scheduled_posts", []):
+        post_id = post.get("id")
+
+        # Older schedules can contain duplicate IDs; give the duplicates a
+        # unique suffix so that no post is lost in the import
+        if post_id in seen_ids:
+            suffix = 2
+            while f"{post_id}-{suffix}" in seen_ids:
+                suffix += 1
+            new_id = f"{post_id}-{suffix}"
+            renamed.append({"old_id": post_id, "new_id": new_id})
+            post = dict(post, id=new_id)
+            post_id = new_id
+        seen_ids.add(post_id)
+        posts.append(post)
+
+    skipped = 0
+    if not replace:
+        existing_ids = {post.get("id") for post in store.get_posts([post.get("id") for post in posts])}
+        skipped = len(existing_ids)
+        posts = [post for post in posts if post.get("id") not in existing_ids]
+
+    # The archive only grows, so importing it again after a failure is harmless
+    store.add_archived_posts(archived_posts)
+    store.add_posts(posts, replace=replace)
+
+    return {
+        "imported": len(posts),
+        "skipped": skipped,
+        "renamed": renamed,
+        "archived": len(archived_posts)
+    }
+
+def main():
+    """Main function to run the schedule migration."""
+    parser = argparse.ArgumentParser(description="Import a JSON content schedule into SQLite")
+    parser.add_argument("--source", default="content_schedule.json", help="JSON schedule file to import")
+    parser.add_argument("--target", default=None, help="SQLite database to import into")
+    parser.add_argument("--replace", action="store_true", help="Replace posts that already exist in the database")
+    args = parser.parse_args()
+
+    target = args.target or sqlite_path_for(args.source)
+
+    if not os.path.exists(args.source):
+        print(f"Error: schedule file {args.source} not found")
+        return
+
+    try:
+        result = migrate_schedule(args.source, target, replace=args.replace)
+    except Exception as e:
+        print(f"\nError migrating schedule: {str(e)}")
+        return
+
+    print(f"\n✅ Imported {result['imported']} posts into {target} ({result['skipped']} already present)")
+    print(f"   Copied {result['archived']} archived posts")
+    for entry in result["renamed"]:
+        print(f"   Duplicate ID {entry['old_id']} imported as {entry['new_id']}")
+    print("\nSet SCHEDULE_BACKEND=sqlite in your .env file to use the new store.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Client-side request quotas.
+
+Used to keep bursts of API calls (such as a batch of image generations) under
+a provider's per-minute quota instead of running into rate-limit errors.
+"""
+
+import time
+import threading
+from collections import deque
+
+
+class RateLimiter:
+    """
+    Sliding-window limit on the number of calls per period, shared by threads.
+
+    Args:
+        max_calls: Calls allowed per period; 0 or less disables the limit
+        period: Length of the window in seconds
+    """
+
+    def __init__(self, max_calls: int, period: float = 60.0):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Wait until a call is allowed and count it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.max_calls <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and self._calls[0] <= now - self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return waited
+                wait = self._calls[0] + self.period - now
+            time.sleep(wait)
+            waited += wait
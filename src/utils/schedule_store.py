@@ -0,0 +1,1157 @@
+"""
+Storage backends for the content schedule.
+
+The scheduler tool, the scheduler process and the monitor all share the same
+schedule. ``JsonScheduleStore`` keeps the original ``content_schedule.json``
+format, while ``SqliteScheduleStore`` keeps one indexed row per post so that
+lookups, inserts and status updates touch a single row instead of rewriting
+the whole document.
+
+Writers are safe to run from several processes at once (web UI, scheduler,
+monitor): the JSON backend serializes them with an advisory lock file and
+replaces the snapshot atomically, and SQLite uses transactions. Full-document
+saves can pass the version they loaded to get a ScheduleConflictError instead
+of overwriting newer changes.
+
+Posts that reached a terminal status (published or failed) are moved out of
+the live schedule by ``archive_posts`` into an archive partitioned by the UTC
+day they finished on, so that the live schedule only holds actionable posts.
+The archive stays queryable by time range and status.
+
+Both backends answer point lookups by post ID or platform post ID and
+status queries from an index instead of scanning every post.
+
+Every post written through a store gets a ``schedule_epoch`` field: its
+``schedule_time`` as integer seconds since the Unix epoch (UTC). Schedule
+times without a UTC offset are interpreted in the local timezone of the
+machine. Due checks and sorting compare these integers instead of parsing
+timestamps.
+"""
+
+import os
+import json
+import sqlite3
+import datetime
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Any, Optional, Union, Tuple
+from src.config.config import SCHEDULE_BACKEND
+from src.utils.file_lock import SHARED_LOCKS, lock_handle, unlock_handle
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+TERMINAL_STATUSES = ("published", "failed")
+
+
+class ScheduleConflictError(Exception):
+    """Raised when a schedule is saved over changes made after it was loaded."""
+
+
+def to_epoch(value: Union[str, datetime.datetime, None]) -> Optional[int]:
+    """
+    Convert a schedule time to integer seconds since the Unix epoch (UTC).
+
+    Args:
+        value: An ISO-8601 string ("Z" suffix and a space separator are
+            accepted) or a datetime. Values without a UTC offset are local time.
+
+    Returns:
+        The epoch timestamp, or None if the value is empty
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.strip().replace("Z", "+00:00").replace(" ", "T"))
+    # astimezone treats naive datetimes as local time
+    return int(value.astimezone(datetime.timezone.utc).timestamp())
+
+
+def post_schedule_epoch(post: Dict[str, Any]) -> Optional[int]:
+    """
+    Return the scheduled time of a post as an epoch timestamp.
+
+    Uses the ``schedule_epoch`` stored with the post, and parses
+    ``schedule_time`` only for posts written before it existed.
+    Raises ValueError if the schedule time can't be parsed.
+    """
+    schedule_epoch = post.get("schedule_epoch")
+    if schedule_epoch is not None:
+        return schedule_epoch
+    return to_epoch(post.get("schedule_time"))
+
+
+def with_schedule_epoch(post: Dict[str, Any]) -> Dict[str, Any]:
+    """Set ``schedule_epoch`` on a post (or on a dict of updates) that has a ``schedule_time``."""
+    if "schedule_time" in post:
+        try:
+            post["schedule_epoch"] = to_epoch(post["schedule_time"])
+        except ValueError:
+            # Keep unparsable times as they are; readers skip them
+            post["schedule_epoch"] = None
+    return post
+
+
+def finished_epoch(post: Dict[str, Any]) -> int:
+    """
+    Return when a post reached its terminal status, as an epoch timestamp.
+
+    Falls back to the schedule time, and to the current time, for posts
+    that don't record it.
+    """
+    for field in ("published_at", "failed_at"):
+        try:
+            value = to_epoch(post.get(field))
+        except ValueError:
+            value = None
+        if value is not None:
+            return value
+    try:
+        value = post_schedule_epoch(post)
+    except ValueError:
+        value = None
+    return value if value is not None else int(time.time())
+
+
+def check_new_post_ids(posts: List[Dict[str, Any]], existing_ids) -> None:
+    """
+    Reject posts whose ID is already in the schedule or repeats within ``posts``.
+
+    Args:
+        posts: Posts about to be added
+        existing_ids: Container of the IDs already in the schedule
+
+    Raises:
+        ValueError: If any ID is taken; nothing should be written then
+    """
+    seen = set()
+    for post in posts:
+        post_id = post.get("id")
+        if post_id in existing_ids or post_id in seen:
+            raise ValueError(f"A post with ID {post_id} already exists")
+        seen.add(post_id)
+
+
+def archive_day(epoch: float) -> str:
+    """Return the archive partition (UTC day, YYYY-MM-DD) for an epoch timestamp."""
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).strftime("%Y-%m-%d")
+
+
+class ScheduleStore(ABC):
+    """
+    Base class for schedule storage backends.
+
+    Subclasses must implement ``load``, ``save`` and ``version``. The point operations below
+    fall back to a full load/save cycle and should be overridden by backends
+    that can do better.
+    """
+
+    @abstractmethod
+    def load(self) -> Dict[str, Any]:
+        """Load the full schedule document."""
+
+    @abstractmethod
+    def save(self, schedule: Dict[str, Any], expected_version: Any = None) -> None:
+        """
+        Replace the full schedule document.
+
+        Args:
+            schedule: The new schedule document
+            expected_version: If given, the version the schedule was loaded at
+                (see load_with_version). Raises ScheduleConflictError if the
+                schedule changed since then.
+        """
+
+    def load_with_version(self) -> Tuple[Dict[str, Any], Any]:
+        """Load the full schedule document together with its version, for a later save."""
+        # Read the version first: a change in between then causes a spurious
+        # conflict rather than a lost update
+        version = self.version()
+        return self.load(), version
+
+    def _transaction(self):
+        """Context manager that keeps other writers out during a read-modify-write."""
+        return nullcontext()
+
+    @abstractmethod
+    def version(self) -> Any:
+        """
+        Return a cheap token that changes whenever the schedule is modified.
+
+        Used by long-running readers to detect changes without reloading the
+        whole schedule.
+        """
+
+    def compact(self) -> None:
+        """Reclaim space used by incremental writes. A no-op by default."""
+
+    def get_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        """Return the post with the given ID, or None if it does not exist."""
+        for post in self.load().get("scheduled_posts", []):
+            if post.get("id") == post_id:
+                return post
+        return None
+
+    def get_post_by_platform_id(self, platform_post_id: str) -> Optional[Dict[str, Any]]:
+        """Return the post that was published with the given platform post ID, or None."""
+        for post in self.load().get("scheduled_posts", []):
+            if post.get("platform_post_id") == platform_post_id:
+                return post
+        return None
+
+    def get_posts(self, post_ids: List[str]) -> List[Dict[str, Any]]:
+        """Return the posts with the given IDs, in the given order, skipping missing ones."""
+        posts_by_id = {}
+        for post in self.load().get("scheduled_posts", []):
+            posts_by_id.setdefault(post.get("id"), post)
+        return [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+
+    def list_posts(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return all posts, optionally filtered by status."""
+        posts = self.load().get("scheduled_posts", [])
+        if status is None:
+            return posts
+        return [post for post in posts if post.get("status") == status]
+
+    def due_posts(self, until_epoch: float, status: str = "scheduled") -> List[Dict[str, Any]]:
+        """
+        Return the posts with the given status that are scheduled at or before
+        ``until_epoch``, ordered by schedule time.
+        """
+        due = []
+        for post in self.list_posts(status=status):
+            try:
+                schedule_epoch = post_schedule_epoch(post)
+            except ValueError:
+                continue
+            if schedule_epoch is not None and schedule_epoch <= until_epoch:
+                due.append((schedule_epoch, post))
+        due.sort(key=lambda item: item[0])
+        return [post for _, post in due]
+
+    def add_post(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """Append a new post to the schedule."""
+        return self.add_posts([post])[0]
+
+    def add_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Append several posts to the schedule in a single write.
+
+        Raises ValueError without writing anything if a post ID is already
+        taken (SQLite raises IntegrityError).
+        """
+        for post in posts:
+            with_schedule_epoch(post)
+        with self._transaction():
+            schedule, version = self.load_with_version()
+            scheduled_posts = schedule.setdefault("scheduled_posts", [])
+            check_new_post_ids(posts, {post.get("id") for post in scheduled_posts})
+            scheduled_posts.extend(posts)
+            self.save(schedule, expected_version=version)
+        return posts
+
+    def update_post(self, post_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Merge ``updates`` into the post with the given ID.
+
+        Returns:
+            The updated post, or None if the post does not exist
+        """
+        with_schedule_epoch(updates)
+        with self._transaction():
+            schedule, version = self.load_with_version()
+            for post in schedule.get("scheduled_posts", []):
+                if post.get("id") == post_id:
+                    post.update(updates)
+                    self.save(schedule, expected_version=version)
+                    return post
+        return None
+
+    def update_posts(self, updates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply updates to several posts in a single write.
+
+        Args:
+            updates: Mapping of post ID to the fields to merge into that post
+
+        Returns:
+            The updated posts that exist in the schedule
+        """
+        for post_updates in updates.values():
+            with_schedule_epoch(post_updates)
+        with self._transaction():
+            schedule, version = self.load_with_version()
+            updated = []
+            for post in schedule.get("scheduled_posts", []):
+                post_updates = updates.get(post.get("id"))
+                if post_updates is not None:
+                    post.update(post_updates)
+                    updated.append(post)
+            self.save(schedule, expected_version=version)
+        return updated
+
+    def delete_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Remove the post with the given ID from the schedule.
+
+        Returns:
+            The removed post, or None if the post does not exist
+        """
+        with self._transaction():
+            schedule, version = self.load_with_version()
+            posts = schedule.get("scheduled_posts", [])
+            for i, post in enumerate(posts):
+                if post.get("id") == post_id:
+                    removed = posts.pop(i)
+                    self.save(schedule, expected_version=version)
+                    return removed
+        return None
+
+    def archive_posts(self, finished_before: Optional[float] = None, statuses: Tuple[str, ...] = TERMINAL_STATUSES) -> int:
+        """
+        Move posts in a terminal status from the live schedule into the archive.
+
+        Args:
+            finished_before: Only archive posts that finished at or before this
+                epoch timestamp. Defaults to now.
+            statuses: The statuses to archive
+
+        Returns:
+            The number of archived posts. Backends without an archive keep
+            every post in the live schedule and return 0.
+        """
+        return 0
+
+    def list_archived_posts(
+        self,
+        start_epoch: Optional[float] = None,
+        end_epoch: Optional[float] = None,
+        status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return archived posts that finished within [start_epoch, end_epoch], oldest first."""
+        return []
+
+    def get_archived_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        """Return the archived post with the given ID, or None."""
+        return None
+
+    def recently_published(self, since_epoch: float) -> List[Dict[str, Any]]:
+        """
+        Return the posts published at or after ``since_epoch``, live or archived.
+
+        This is the working set of posts that are still worth checking for
+        engagement.
+        """
+        live = [post for post in self.list_posts(status="published") if finished_epoch(post) >= since_epoch]
+        live_ids = {post.get("id") for post in live}
+        archived = [
+            post for post in self.list_archived_posts(start_epoch=since_epoch, status="published")
+            if post.get("id") not in live_ids
+        ]
+        return archived + live
+
+
+class ScheduleIndex:
+    """
+    In-memory index of a schedule's posts by ID, platform post ID and status.
+
+    As in the journal fold, ID lookups and updates go to the first post with a
+    given ID. Later duplicates (found in some older schedules) are still
+    listed but can't be looked up by ID.
+    """
+
+    def __init__(self, posts: List[Dict[str, Any]]):
+        # Posts are keyed by object identity so that duplicates keep their place
+        self._posts: Dict[int, Dict[str, Any]] = {}
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_platform_post_id: Dict[str, Dict[str, Any]] = {}
+        self._by_status: Dict[Any, Dict[int, Dict[str, Any]]] = {}
+        for post in posts:
+            self.add(post)
+
+    def _index_fields(self, post: Dict[str, Any]) -> None:
+        self._by_status.setdefault(post.get("status"), {})[id(post)] = post
+        if post.get("platform_post_id"):
+            self._by_platform_post_id.setdefault(post["platform_post_id"], post)
+
+    def _unindex_fields(self, post: Dict[str, Any]) -> None:
+        posts = self._by_status.get(post.get("status"))
+        if posts is not None:
+            posts.pop(id(post), None)
+            if not posts:
+                del self._by_status[post.get("status")]
+        if self._by_platform_post_id.get(post.get("platform_post_id")) is post:
+            del self._by_platform_post_id[post["platform_post_id"]]
+
+    def add(self, post: Dict[str, Any]) -> None:
+        if "schedule_epoch" not in post:
+            # Posts written before schedule_epoch existed
+            with_schedule_epoch(post)
+        self._posts[id(post)] = post
+        self._by_id.setdefault(post.get("id"), post)
+        self._index_fields(post)
+
+    def update(self, post_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        post = self._by_id.get(post_id)
+        if post is None:
+            return None
+        self._unindex_fields(post)
+        post.update(updates)
+        self._index_fields(post)
+        return post
+
+    def remove(self, post_id: str) -> Optional[Dict[str, Any]]:
+        post = self._by_id.pop(post_id, None)
+        if post is not None:
+            del self._posts[id(post)]
+            self._unindex_fields(post)
+        return post
+
+    def get(self, post_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(post_id)
+
+    def get_by_platform_id(self, platform_post_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_platform_post_id.get(platform_post_id)
+
+    def posts(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        if status is None:
+            return list(self._posts.values())
+        return list(self._by_status.get(status, {}).values())
+
+
+class JsonScheduleStore(ScheduleStore):
+    """
+    Schedule stored as a single JSON document (the original format).
+
+    Post additions, updates and deletions are appended to a JSON-lines journal
+    next to the schedule file instead of rewriting the whole document. Readers
+    fold the journal into the snapshot, and the snapshot is rewritten (compacted)
+    once the journal grows past ``compact_bytes`` or when ``compact`` is called.
+
+    Lookups are answered from a ScheduleIndex that is kept up to date with this
+    store's own writes and rebuilt only when ``version`` shows that the files
+    were changed by someone else. Posts returned by lookups are copies.
+
+    All processes using the same schedule file coordinate through an advisory
+    lock on ``<schedule_file>.lock``: writers hold it exclusively, readers
+    shared, so nobody observes the snapshot and journal mid-compaction.
+    """
+
+    def __init__(self, schedule_file: str = "content_schedule.json", journal: bool = True, compact_bytes: int = 256 * 1024):
+        self.schedule_file = schedule_file
+        self.journal_file = f"{schedule_file}.journal"
+        self.journal = journal
+        self.compact_bytes = compact_bytes
+        self.lock_file = f"{schedule_file}.lock"
+        self.archive_dir = f"{os.path.splitext(schedule_file)[0]}_archive"
+        self._lock = threading.RLock()
+        self._lock_handle = None
+        self._lock_depth = 0
+        self._lock_exclusive = False
+        self._index: Optional[ScheduleIndex] = None
+        self._index_version = None
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool = True):
+        """
+        Hold the cross-process lock on the schedule (re-entrant within this store).
+
+        Args:
+            exclusive: Take the lock exclusively (writers) instead of shared (readers)
+        """
+        with self._lock:
+            if self._lock_handle is None:
+                self._lock_handle = open(self.lock_file, "a+")
+            if self._lock_depth == 0:
+                lock_handle(self._lock_handle, exclusive)
+                self._lock_exclusive = exclusive or not SHARED_LOCKS
+            elif exclusive and not self._lock_exclusive:
+                # Upgrade a shared lock held further up the stack
+                lock_handle(self._lock_handle, True)
+                self._lock_exclusive = True
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    unlock_handle(self._lock_handle)
+                    self._lock_exclusive = False
+
+    def _transaction(self):
+        return self._file_lock()
+
+    def _load_snapshot(self) -> Dict[str, Any]:
+        if os.path.exists(self.schedule_file):
+            with open(self.schedule_file, "r") as f:
+                return json.load(f)
+        return {"scheduled_posts": [], "last_updated": datetime.datetime.now().isoformat()}
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        """Read the journal entries, ignoring a partially written last line."""
+        if not os.path.exists(self.journal_file):
+            return []
+        entries = []
+        with open(self.journal_file, "r") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A crash during an append can leave a truncated line
+                    continue
+        return entries
+
+    @staticmethod
+    def _apply_entries(schedule: Dict[str, Any], entries: List[Dict[str, Any]]) -> None:
+        """
+        Fold journal entries into a schedule.
+
+        Entries are idempotent so that replaying a journal that was already
+        folded into the snapshot is harmless.
+        """
+        posts = schedule.setdefault("scheduled_posts", [])
+        posts_by_id = {}
+        for post in posts:
+            posts_by_id.setdefault(post.get("id"), post)
+        deleted = set()
+
+        for entry in entries:
+            op = entry.get("op")
+            post_id = entry.get("id")
+
+            if op == "add":
+                if post_id not in posts_by_id:
+                    post = entry.get("post")
+                    posts.append(post)
+                    posts_by_id[post_id] = post
+            elif op == "update":
+                post = posts_by_id.get(post_id)
+                if post is not None:
+                    post.update(entry.get("updates", {}))
+            elif op == "delete":
+                post = posts_by_id.pop(post_id, None)
+                if post is not None:
+                    deleted.add(id(post))
+
+            if entry.get("ts"):
+                schedule["last_updated"] = entry["ts"]
+
+        if deleted:
+            schedule["scheduled_posts"] = [post for post in posts if id(post) not in deleted]
+
+    def _append(self, entries: List[Dict[str, Any]]) -> None:
+        """Durably append entries to the journal."""
+        timestamp = datetime.datetime.now().isoformat()
+        with open(self.journal_file, "a") as f:
+            for entry in entries:
+                entry["ts"] = timestamp
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        if os.path.getsize(self.journal_file) >= self.compact_bytes:
+            self.compact()
+
+    def _write_snapshot(self, schedule: Dict[str, Any]) -> None:
+        """Replace the snapshot file atomically."""
+        temp_file = f"{self.schedule_file}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(schedule, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.schedule_file)
+        self._fsync_directory()
+
+    def _fsync_directory(self) -> None:
+        """Make a rename in the schedule's directory durable."""
+        if os.name == "nt":
+            # Directories can't be opened for fsync on Windows
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(self.schedule_file)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def load(self) -> Dict[str, Any]:
+        with self._file_lock(exclusive=False):
+            schedule = self._load_snapshot()
+            self._apply_entries(schedule, self._read_journal())
+            return schedule
+
+    def load_with_version(self) -> Tuple[Dict[str, Any], Any]:
+        with self._file_lock(exclusive=False):
+            return self.load(), self.version()
+
+    def save(self, schedule: Dict[str, Any], expected_version: Any = None) -> None:
+        for post in schedule.get("scheduled_posts", []):
+            with_schedule_epoch(post)
+        with self._file_lock():
+            if expected_version is not None and self.version() != expected_version:
+                raise ScheduleConflictError(f"{self.schedule_file} was modified after it was loaded")
+            schedule["last_updated"] = datetime.datetime.now().isoformat()
+            self._write_snapshot(schedule)
+            # The new snapshot supersedes everything in the journal
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self._index = None
+
+    def compact(self) -> None:
+        """Fold the journal into a new snapshot and truncate the journal."""
+        with self._file_lock():
+            if not os.path.exists(self.journal_file):
+                return
+            schedule = self.load()
+            self._write_snapshot(schedule)
+            os.remove(self.journal_file)
+
+    def version(self) -> Any:
+        stats = []
+        for path in (self.schedule_file, self.journal_file):
+            try:
+                stat = os.stat(path)
+                stats.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stats.append(None)
+        return tuple(stats)
+
+    def _current_index(self) -> ScheduleIndex:
+        """Return the index of the schedule, rebuilding it if the files changed."""
+        with self._file_lock(exclusive=False):
+            version = self.version()
+            if self._index is None or version != self._index_version:
+                self._index = ScheduleIndex(self.load()["scheduled_posts"])
+                self._index_version = version
+            return self._index
+
+    def _write_entries(self, entries: List[Dict[str, Any]], apply) -> None:
+        """Append entries to the journal and apply the same change to the index."""
+        with self._file_lock():
+            index = self._current_index()
+            self._append(entries)
+            apply(index)
+            self._index_version = self.version()
+
+    def get_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            post = self._current_index().get(post_id)
+            return dict(post) if post is not None else None
+
+    def get_post_by_platform_id(self, platform_post_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            post = self._current_index().get_by_platform_id(platform_post_id)
+            return dict(post) if post is not None else None
+
+    def get_posts(self, post_ids: List[str]) -> List[Dict[str, Any]]:
+        with self._lock:
+            index = self._current_index()
+            return [dict(post) for post in (index.get(post_id) for post_id in post_ids) if post is not None]
+
+    def list_posts(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(post) for post in self._current_index().posts(status)]
+
+    def due_posts(self, until_epoch: float, status: str = "scheduled") -> List[Dict[str, Any]]:
+        with self._lock:
+            due = [
+                post for post in self._current_index().posts(status)
+                if post.get("schedule_epoch") is not None and post["schedule_epoch"] <= until_epoch
+            ]
+        due.sort(key=lambda post: post["schedule_epoch"])
+        return [dict(post) for post in due]
+
+    def add_posts(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not self.journal:
+            return super().add_posts(posts)
+        for post in posts:
+            with_schedule_epoch(post)
+
+        def apply(index):
+            for post in posts:
+                index.add(dict(post))
+
+        with self._file_lock():
+            # Replaying the journal ignores adds for existing IDs, so the index must too
+            index = self._current_index()
+            check_new_post_ids(posts, {post.get("id") for post in posts if index.get(post.get("id")) is not None})
+            self._write_entries([{"op": "add", "id": post.get("id"), "post": post} for post in posts], apply)
+        return posts
+
+    def add_post(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        return self.add_posts([post])[0]
+
+    def update_post(self, post_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        updated = self.update_posts({post_id: updates})
+        return updated[0] if updated else None
+
+    def update_posts(self, updates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not self.journal:
+            return super().update_posts(updates)
+        for post_updates in updates.values():
+            with_schedule_epoch(post_updates)
+        with self._file_lock():
+            index = self._current_index()
+            post_ids = [post_id for post_id in updates if index.get(post_id) is not None]
+            if not post_ids:
+                return []
+
+            def apply(index):
+                for post_id in post_ids:
+                    index.update(post_id, updates[post_id])
+
+            self._write_entries([{"op": "update", "id": post_id, "updates": updates[post_id]} for post_id in post_ids], apply)
+            return self.get_posts(post_ids)
+
+    def delete_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        if not self.journal:
+            return super().delete_post(post_id)
+        with self._file_lock():
+            post = self.get_post(post_id)
+            if post is None:
+                return None
+            self._write_entries([{"op": "delete", "id": post_id}], lambda index: index.remove(post_id))
+            return post
+
+    def archive_posts(self, finished_before: Optional[float] = None, statuses: Tuple[str, ...] = TERMINAL_STATUSES) -> int:
+        if finished_before is None:
+            finished_before = time.time()
+        with self._file_lock():
+            index = self._current_index()
+            by_day: Dict[str, List[Dict[str, Any]]] = {}
+            for status in statuses:
+                for post in index.posts(status):
+                    # Legacy duplicate IDs can't be deleted by ID, so they stay live
+                    if index.get(post.get("id")) is not post:
+                        continue
+                    finished = finished_epoch(post)
+                    if finished <= finished_before:
+                        by_day.setdefault(archive_day(finished), []).append(post)
+            if not by_day:
+                return 0
+
+            # Write the archive first: a crash in between leaves the posts in
+            # both places, and readers of the archive ignore repeats
+            os.makedirs(self.archive_dir, exist_ok=True)
+            for day, posts in by_day.items():
+                with open(os.path.join(self.archive_dir, f"{day}.jsonl"), "a") as f:
+                    for post in posts:
+                        f.write(json.dumps(post) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            post_ids = [post.get("id") for posts in by_day.values() for post in posts]
+
+            if not self.journal:
+                schedule, version = self.load_with_version()
+                archived_ids = set(post_ids)
+                kept = []
+                for post in schedule.get("scheduled_posts", []):
+                    if post.get("id") in archived_ids:
+                        # Only the first post with an ID was archived
+                        archived_ids.discard(post.get("id"))
+                        continue
+                    kept.append(post)
+                schedule["scheduled_posts"] = kept
+                self.save(schedule, expected_version=version)
+                return len(post_ids)
+
+            def apply(index):
+                for post_id in post_ids:
+                    index.remove(post_id)
+
+            self._write_entries([{"op": "delete", "id": post_id} for post_id in post_ids], apply)
+            return len(post_ids)
+
+    def _archive_files(self, start_epoch: Optional[float] = None, end_epoch: Optional[float] = None) -> List[str]:
+        """Return the archive partitions that can hold posts finished in the given range, oldest first."""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        first_day = archive_day(start_epoch) if start_epoch is not None else None
+        last_day = archive_day(end_epoch) if end_epoch is not None else None
+        files = []
+        for name in sorted(os.listdir(self.archive_dir)):
+            day, extension = os.path.splitext(name)
+            if extension != ".jsonl":
+                continue
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            files.append(os.path.join(self.archive_dir, name))
+        return files
+
+    def _read_archive(self, files: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Read archive partitions into a mapping of post ID to post (the last copy wins)."""
+        posts = {}
+        for path in files:
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        post = json.loads(line)
+                    except ValueError:
+                        continue
+                    posts[post.get("id")] = post
+        return posts
+
+    def list_archived_posts(
+        self,
+        start_epoch: Optional[float] = None,
+        end_epoch: Optional[float] = None,
+        status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        with self._file_lock(exclusive=False):
+            posts = self._read_archive(self._archive_files(start_epoch, end_epoch))
+        matching = []
+        for post in posts.values():
+            finished = finished_epoch(post)
+            if start_epoch is not None and finished < start_epoch:
+                continue
+            if end_epoch is not None and finished > end_epoch:
+                continue
+            if status is not None and post.get("status") != status:
+                continue
+            matching.append((finished, post))
+        matching.sort(key=lambda item: item[0])
+        return [post for _, post in matching]
+
+    def get_archived_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        with self._file_lock(exclusive=False):
+            # Newest partitions first; a post is normally archived only once
+            for path in reversed(self._archive_files()):
+                post = self._read_archive([path]).get(post_id)
+                if post is not None:
+                    return post
+        return None
+
+
+class SqliteScheduleStore(ScheduleStore):
+    """
+    Schedule stored in SQLite (WAL mode) with one row per post.
+
+    The full post is kept as JSON in the ``data`` column so that arbitrary
+    fields round-trip unchanged; the fields used for lookups are promoted to
+    indexed columns.
+    """
+
+    def __init__(self, db_path: str = "content_schedule.db"):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection for the current thread, opening it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS posts (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL UNIQUE,
+                    platform TEXT,
+                    status TEXT,
+                    schedule_time TEXT,
+                    schedule_epoch INTEGER,
+                    platform_post_id TEXT,
+                    data TEXT NOT NULL
+                )
+                """
+            )
+            self._add_schedule_epoch_column(conn)
+            conn.execute("DROP INDEX IF EXISTS idx_posts_status_time")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_status_epoch ON posts (status, schedule_epoch)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_platform_post_id ON posts (platform_post_id)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS archived_posts (
+                    id TEXT PRIMARY KEY,
+                    platform TEXT,
+                    status TEXT,
+                    platform_post_id TEXT,
+                    archive_day TEXT NOT NULL,
+                    finished_epoch INTEGER NOT NULL,
+                    data TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_archived_posts_day ON archived_posts (archive_day)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_archived_posts_finished ON archived_posts (finished_epoch)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_archived_posts_status_finished ON archived_posts (status, finished_epoch)")
+
+    def _add_schedule_epoch_column(self, conn: sqlite3.Connection) -> None:
+        """Add and backfill the schedule_epoch column in databases created before it existed."""
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(posts)")]
+        if "schedule_epoch" in columns:
+            return
+        conn.execute("ALTER TABLE posts ADD COLUMN schedule_epoch INTEGER")
+        rows = conn.execute("SELECT id, data FROM posts").fetchall()
+        backfill = []
+        for row in rows:
+            post = with_schedule_epoch(json.loads(row["data"]))
+            backfill.append((post.get("schedule_epoch"), json.dumps(post), row["id"]))
+        conn.executemany("UPDATE posts SET schedule_epoch = ?, data = ? WHERE id = ?", backfill)
+
+    @staticmethod
+    def _row_values(post: Dict[str, Any]) -> tuple:
+        return (
+            post.get("id"),
+            post.get("platform"),
+            post.get("status"),
+            post.get("schedule_time"),
+            post.get("schedule_epoch"),
+            post.get("platform_post_id"),
+            json.dumps(post)
+        )
+
+    def _touch(self, conn: sqlite3.Connection) -> str:
+        """Record the modification time and bump the version of the schedule."""
+        last_updated = datetime.datetime.now().isoformat()
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)", (last_updated,))
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+        )
+        return last_updated
+
+    def compact(self) -> None:
+        self._connect().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def version(self) -> Any:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return row["value"] if row else 0
+
+    def load(self) -> Dict[str, Any]:
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+        return {
+            "scheduled_posts": self.list_posts(),
+            "last_updated": row["value"] if row else datetime.datetime.now().isoformat()
+        }
+
+    def save(self, schedule: Dict[str, Any], expected_version: Any = None) -> None:
+        conn = self._connect()
+        with conn:
+            # Take the write lock before checking the version
+            conn.execute("BEGIN IMMEDIATE")
+            if expected_version is not None and self.version() != expected_version:
+                raise ScheduleConflictError(f"{self.db_path} was modified after it was loaded")
+            conn.execute("DELETE FROM posts")
+            conn.executemany(
+                "INSERT INTO posts (id, platform, status, schedule_time, schedule_epoch, platform_post_id, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [self._row_values(with_schedule_epoch(post)) for post in schedule.get("scheduled_posts", [])]
+            )
+            schedule["last_updated"] = self._touch(conn)
+
+    def get_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT data FROM posts WHERE id = ?", (post_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_post_by_platform_id(self, platform_post_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT data FROM posts WHERE platform_post_id = ? ORDER BY seq LIMIT 1", (platform_post_id,)
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_posts(self, post_ids: List[str]) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        posts_by_id = {}
+        # Stay well below SQLite's limit on the number of query parameters
+        for i in range(0, len(post_ids), 500):
+            chunk = post_ids[i:i + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            for row in conn.execute(f"SELECT id, data FROM posts WHERE id IN ({placeholders})", chunk):
+                posts_by_id[row["id"]] = json.loads(row["data"])
+        return [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+
+    def list_posts(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        if status is None:
+            rows = conn.execute("SELECT data FROM posts ORDER BY seq")
+        else:
+            rows = conn.execute("SELECT data FROM posts WHERE status = ? ORDER BY seq", (status,))
+        return [json.loads(row["data"]) for row in rows]
+
+    def add_post(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        return self.add_posts([post])[0]
+
+    def due_posts(self, until_epoch: float, status: str = "scheduled") -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT data FROM posts WHERE status = ? AND schedule_epoch <= ? ORDER BY schedule_epoch, seq",
+            (status, until_epoch)
+        )
+        return [json.loads(row["data"]) for row in rows]
+
+    def add_posts(self, posts: List[Dict[str, Any]], replace: bool = False) -> List[Dict[str, Any]]:
+        """
+        Insert posts in a single transaction.
+
+        Args:
+            posts: The posts to add
+            replace: Overwrite posts with the same ID instead of raising
+                IntegrityError (used when importing a JSON schedule)
+        """
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                f"INSERT {'OR REPLACE ' if replace else ''}INTO posts "
+                "(id, platform, status, schedule_time, schedule_epoch, platform_post_id, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [self._row_values(with_schedule_epoch(post)) for post in posts]
+            )
+            self._touch(conn)
+        return posts
+
+    def update_post(self, post_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        updated = self.update_posts({post_id: updates})
+        return updated[0] if updated else None
+
+    def update_posts(self, updates: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        updated = []
+        with conn:
+            # Take the write lock before reading the posts the updates are merged into
+            conn.execute("BEGIN IMMEDIATE")
+            for post_id, post_updates in updates.items():
+                with_schedule_epoch(post_updates)
+                row = conn.execute("SELECT data FROM posts WHERE id = ?", (post_id,)).fetchone()
+                if row is None:
+                    continue
+                post = json.loads(row["data"])
+                post.update(post_updates)
+                conn.execute(
+                    "UPDATE posts SET platform = ?, status = ?, schedule_time = ?, schedule_epoch = ?, platform_post_id = ?, data = ? "
+                    "WHERE id = ?",
+                    self._row_values(post)[1:] + (post_id,)
+                )
+                updated.append(post)
+            if updated:
+                self._touch(conn)
+        return updated
+
+    def delete_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT data FROM posts WHERE id = ?", (post_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+            self._touch(conn)
+        return json.loads(row["data"])
+
+    def archive_posts(self, finished_before: Optional[float] = None, statuses: Tuple[str, ...] = TERMINAL_STATUSES) -> int:
+        if finished_before is None:
+            finished_before = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            placeholders = ", ".join("?" for _ in statuses)
+            rows = conn.execute(f"SELECT data FROM posts WHERE status IN ({placeholders})", tuple(statuses)).fetchall()
+            archived = []
+            for row in rows:
+                post = json.loads(row["data"])
+                if finished_epoch(post) <= finished_before:
+                    archived.append(self._archived_row_values(post, row["data"]))
+            if not archived:
+                return 0
+            self._insert_archived_rows(conn, archived)
+            conn.executemany("DELETE FROM posts WHERE id = ?", [(values[0],) for values in archived])
+            self._touch(conn)
+        return len(archived)
+
+    def _archived_row_values(self, post: Dict[str, Any], data: Optional[str] = None) -> Tuple[Any, ...]:
+        finished = finished_epoch(post)
+        return (
+            post.get("id"),
+            post.get("platform"),
+            post.get("status"),
+            post.get("platform_post_id"),
+            archive_day(finished),
+            finished,
+            data if data is not None else json.dumps(post)
+        )
+
+    def _insert_archived_rows(self, conn: sqlite3.Connection, rows: List[Tuple[Any, ...]]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO archived_posts (id, platform, status, platform_post_id, archive_day, finished_epoch, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def add_archived_posts(self, posts: List[Dict[str, Any]]) -> int:
+        """
+        Insert already archived posts (e.g. from a JSON schedule's archive) in a
+        single transaction, replacing archived posts with the same ID.
+
+        Returns:
+            The number of posts written
+        """
+        conn = self._connect()
+        with conn:
+            self._insert_archived_rows(conn, [self._archived_row_values(post) for post in posts])
+        return len(posts)
+
+    def list_archived_posts(
+        self,
+        start_epoch: Optional[float] = None,
+        end_epoch: Optional[float] = None,
+        status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        conditions = []
+        params = []
+        if start_epoch is not None:
+            conditions.append("finished_epoch >= ?")
+            params.append(start_epoch)
+        if end_epoch is not None:
+            conditions.append("finished_epoch <= ?")
+            params.append(end_epoch)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._connect().execute(f"SELECT data FROM archived_posts {where} ORDER BY finished_epoch", params)
+        return [json.loads(row["data"]) for row in rows]
+
+    def get_archived_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT data FROM archived_posts WHERE id = ?", (post_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+
+def sqlite_path_for(schedule_file: str) -> str:
+    """Return the SQLite database path that corresponds to a schedule file."""
+    if schedule_file.endswith(SQLITE_EXTENSIONS):
+        return schedule_file
+    return os.path.splitext(schedule_file)[0] + ".db"
+
+
+def create_schedule_store(schedule_file: str = "content_schedule.json", backend: Optional[str] = None) -> ScheduleStore:
+    """
+    Create the schedule store for the configured backend.
+
+    Args:
+        schedule_file: Path to the schedule file. For the SQLite backend a
+            ``.json`` path is mapped to the ``.db`` file next to it.
+        backend: "json" or "sqlite". Defaults to the SCHEDULE_BACKEND setting,
+            or "sqlite" when ``schedule_file`` already points to a database.
+
+    Returns:
+        A ScheduleStore instance
+    """
+    if backend is None:
+        backend = "sqlite" if schedule_file.endswith(SQLITE_EXTENSIONS) else SCHEDULE_BACKEND
+    backend = (backend or "json").lower()
+
+    if backend == "sqlite":
+        return SqliteScheduleStore(sqlite_path_for(schedule_file))
+    if backend == "json":
+        return JsonScheduleStore(schedule_file)
+    raise ValueError(f"Unknown schedule backend: {backend}")
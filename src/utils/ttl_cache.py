@@ -0,0 +1,247 @@
+"""
+Small thread-safe caches with per-entry expiry.
+
+Used by the platform tools to remember results of API round trips that rarely
+change (identities, permissions, uploaded media). A cache can optionally be
+persisted in CACHE_DIR so that it survives process restarts and is shared by
+the processes using it (web UI, scheduler, monitor); values of persisted
+caches must be JSON-serializable.
+
+A persisted cache is a JSON snapshot plus a JSON-lines journal of changes.
+Writers hold an advisory lock on ``<file>.lock`` and append one line per
+change, in the order the changes were made, so each key ends up with the
+value written last by any process. Readers notice when the files change and
+read the new journal lines before answering. Once the journal grows past
+``compact_bytes`` it is folded into a new snapshot of the unexpired entries.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from src.config.config import CACHE_DIR
+from src.utils.file_lock import lock_handle, unlock_handle
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Key/value cache whose entries expire after a time to live.
+
+    Args:
+        ttl: Default time to live of an entry in seconds
+        persist_path: Optional JSON file to load entries from and save them to
+        compact_bytes: Journal size at which a persisted cache is compacted
+    """
+
+    def __init__(self, ttl: float, persist_path: Optional[str] = None, compact_bytes: int = 64 * 1024):
+        self.ttl = ttl
+        self.persist_path = persist_path
+        self.compact_bytes = compact_bytes
+        self._lock = threading.Lock()
+        # key -> (value, expiry as a wall-clock epoch timestamp)
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        if persist_path:
+            self.journal_path = f"{persist_path}.journal"
+            self.lock_path = f"{persist_path}.lock"
+            self._lock_file = None
+            # Files as of the last read, and how much of the journal was read
+            self._version = None
+            self._journal_offset = 0
+            with self._file_lock(exclusive=False):
+                self._reload()
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Hold the cross-process lock on the cache files. Called with the lock held."""
+        if self._lock_file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.persist_path)), exist_ok=True)
+            self._lock_file = open(self.lock_path, "a+")
+        lock_handle(self._lock_file, exclusive)
+        try:
+            yield
+        finally:
+            unlock_handle(self._lock_file)
+
+    def _file_version(self) -> Tuple[Any, Any]:
+        """Identify the current snapshot and journal files."""
+        version = []
+        for path in (self.persist_path, self.journal_path):
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+
+    def _reload(self) -> None:
+        """Read the snapshot and the whole journal. Called with the file lock held."""
+        try:
+            with open(self.persist_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self._entries = {
+            key: (entry["value"], entry["expires"])
+            for key, entry in data.items()
+            if isinstance(entry, dict) and "expires" in entry
+        }
+        self._journal_offset = 0
+        self._read_journal()
+        self._version = self._file_version()
+
+    def _read_journal(self) -> None:
+        """Apply the journal lines written since the last read. Called with the file lock held."""
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(self._journal_offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Being written by another process; read it next time
+                        break
+                    self._journal_offset += len(line)
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue
+        except FileNotFoundError:
+            pass
+
+    def _apply(self, change: Dict[str, Any]) -> None:
+        """Apply one journal line to the in-memory entries."""
+        op = change.get("op")
+        if op == "set":
+            self._entries[change["key"]] = (change["value"], change["expires"])
+        elif op == "remove":
+            self._entries.pop(change["key"], None)
+        elif op == "clear":
+            self._entries.clear()
+
+    def _sync(self) -> None:
+        """
+        Pick up changes other processes made to the cache files.
+
+        Called with the lock held; takes the file lock only if the files changed.
+        """
+        if not self.persist_path or self._file_version() == self._version:
+            return
+        with self._file_lock(exclusive=False):
+            self._refresh()
+
+    def _refresh(self) -> None:
+        """Bring the in-memory entries up to date with the files. Called with the file lock held."""
+        version = self._file_version()
+        if version == self._version:
+            return
+        snapshot, journal = version
+        previous_snapshot, previous_journal = self._version or (None, None)
+        if (
+            snapshot != previous_snapshot
+            or journal is None
+            or journal[2] < self._journal_offset
+            or (previous_journal is not None and journal[0] != previous_journal[0])
+        ):
+            # Compacted or replaced since the last read
+            self._reload()
+        else:
+            self._read_journal()
+            self._version = version
+
+    def _write(self, changes: List[Dict[str, Any]]) -> None:
+        """
+        Apply changes and append them to the journal of a persisted cache.
+
+        Called with the lock held.
+        """
+        if not self.persist_path:
+            for change in changes:
+                self._apply(change)
+            return
+        with self._file_lock(exclusive=True):
+            # Apply on top of what other processes wrote, in journal order
+            self._refresh()
+            for change in changes:
+                self._apply(change)
+            with open(self.journal_path, "a") as f:
+                for change in changes:
+                    f.write(json.dumps(change) + "\n")
+            if os.path.getsize(self.journal_path) >= self.compact_bytes:
+                self._compact()
+            else:
+                self._journal_offset = os.path.getsize(self.journal_path)
+                self._version = self._file_version()
+
+    def _compact(self) -> None:
+        """Replace the snapshot with the unexpired entries and drop the journal. Called with the file lock held."""
+        now = time.time()
+        self._entries = {key: entry for key, entry in self._entries.items() if entry[1] > now}
+        temp_file = f"{self.persist_path}.{os.getpid()}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump({key: {"value": value, "expires": expires} for key, (value, expires) in self._entries.items()}, f)
+        os.replace(temp_file, self.persist_path)
+        os.remove(self.journal_path)
+        self._journal_offset = 0
+        self._version = self._file_version()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for a key, or ``default`` if it is missing or expired."""
+        with self._lock:
+            self._sync()
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires = entry
+            if expires <= time.time():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a value, optionally with a time to live other than the default."""
+        with self._lock:
+            expires = time.time() + (self.ttl if ttl is None else ttl)
+            self._write([{"op": "set", "key": key, "value": value, "expires": expires}])
+
+    def invalidate(self, key: str) -> None:
+        """Forget the cached value for a key."""
+        with self._lock:
+            self._write([{"op": "remove", "key": key}])
+
+    def clear(self) -> None:
+        """Forget every cached value."""
+        with self._lock:
+            self._write([{"op": "clear"}])
+
+
+_caches: Dict[str, TTLCache] = {}
+_caches_lock = threading.Lock()
+
+
+def shared_cache(name: str, ttl: float, persist: bool = False) -> TTLCache:
+    """
+    Return the process-wide cache with the given name, creating it on first use.
+
+    Args:
+        name: Name of the cache (also the file name when persisted)
+        ttl: Default time to live of an entry in seconds
+        persist: Persist the cache to ``CACHE_DIR/<name>.json``
+
+    Returns:
+        The shared TTLCache instance
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            persist_path = os.path.join(CACHE_DIR, f"{name}.json") if persist else None
+            cache = TTLCache(ttl, persist_path)
+            _caches[name] = cache
+        return cache
+
+
+def token_fingerprint(token: Optional[str]) -> str:
+    """Return a short, non-reversible key for an access token, safe to persist."""
+    return hashlib.sha256((token or "").encode()).hexdigest()[:16]
@@ -1,45 +1,16 @@
 import os
 import requests
 from dotenv import load_dotenv
-import base64
-import urllib.parse
-import hmac
-import hashlib
-import time
 import json
+from src.utils.oauth1 import get_oauth1_signer
 
 # Load environment variables
 load_dotenv()
 
 def generate_oauth1_signature(method, url, params, consumer_secret, oauth_token_secret):
     """Generate OAuth1.0a signature"""
-    # Create parameter string
-    param_string = '&'.join(sorted([f"{k}={urllib.parse.quote(str(v), safe='')}" 
-                                  for k, v in params.items()]))
-    
-    # Create signature base string
-    signature_base = '&'.join([
-        method,
-        urllib.parse.quote(url, safe=''),
-        urllib.parse.quote(param_string, safe='')
-    ])
-    
-    # Create signing key
-    signing_key = '&'.join([
-        urllib.parse.quote(consumer_secret, safe=''),
-        urllib.parse.quote(oauth_token_secret, safe='')
-    ])
-    
-    # Generate signature
-    signature = base64.b64encode(
-        hmac.new(
-            signing_key.encode('utf-8'),
-            signature_base.encode('utf-8'),
-            hashlib.sha1
-        ).digest()
-    ).decode('utf-8')
-    
-    return signature
+    # Only the secrets take part in the signature
+    return get_oauth1_signer("", consumer_secret, "", oauth_token_secret).signature(method, url, params)
 
 def verify_credentials():
     """Verify Twitter API credentials"""
@@ -61,30 +32,10 @@ def verify_credentials():
     # Verification endpoint
     url = 'https://api.twitter.com/2/users/me'
     
-    # Generate OAuth 1.0a parameters
-    oauth_timestamp = str(int(time.time()))
-    oauth_nonce = base64.b64encode(os.urandom(32)).decode('utf-8')
-    
-    oauth_params = {
-        'oauth_consumer_key': api_key,
-        'oauth_nonce': oauth_nonce,
-        'oauth_signature_method': 'HMAC-SHA1',
-        'oauth_timestamp': oauth_timestamp,
-        'oauth_token': access_token,
-        'oauth_version': '1.0'
-    }
-    
-    # Generate signature
-    signature = generate_oauth1_signature(
-        'GET', url, oauth_params, api_secret, access_token_secret
-    )
-    oauth_params['oauth_signature'] = signature
-    
-    # Create Authorization header
-    auth_header = 'OAuth ' + ', '.join([
-        f'{k}="{urllib.parse.quote(v, safe="")}"'
-        for k, v in oauth_params.items()
-    ])
+    # Sign the request with OAuth 1.0a
+    auth_header = get_oauth1_signer(
+        api_key, api_secret, access_token, access_token_secret
+    ).authorization_header('GET', url)
     
     # Make request
     headers = {'Authorization': auth_header}
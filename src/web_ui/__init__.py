@@ -1,6 +1,8 @@
 from flask import Flask
 from flask_wtf.csrf import CSRFProtect
 from . import routes
+from src.config.config import GEMINI_WARMUP
+from src.utils.genai_client import warm_up_genai_client
 import os
 
 def create_app():
@@ -23,6 +25,10 @@ def create_app():
     app.register_blueprint(routes.bp)
     app.register_blueprint(routes.main)
     
+    # Get the Gemini client ready before the first image request
+    if GEMINI_WARMUP:
+        warm_up_genai_client()
+    
     # Debug information
     print(f"Flask app created with template folder: {template_dir}")
     print(f"Available routes:")
@@ -28,19 +28,13 @@ def publish_scheduled_post(post_id: str, agent: SocialMediaAgent, scheduler_tool
         Dict with the result of the operation
     """
     try:
-        # Get all scheduled posts
-        all_posts = scheduler_tool.get_scheduled_posts()
+        # Get the post with the given ID
+        post_result = scheduler_tool.get_post(post_id)
         
-        if not all_posts.get('success', False):
-            return {"success": False, "error": "Failed to get scheduled posts"}
+        if not post_result.get('success', False):
+            return {"success": False, "error": "Failed to get scheduled post"}
             
-        # Find the post with the given ID
-        post_to_publish = None
-        for post in all_posts.get('scheduled_posts', []):
-            if post.get('id') == post_id:
-                post_to_publish = post
-                break
-        
+        post_to_publish = post_result.get('post')
         if not post_to_publish:
             return {"success": False, "error": f"Post with ID {post_id} not found"}
             
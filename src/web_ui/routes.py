@@ -1,6 +1,7 @@
 from src.agents.social_media_agent import SocialMediaAgent
 from src.tools.scheduler_tool import SchedulerTool
 from src.monitor import SocialMediaMonitor
+from src.utils.image_variants import prepare_variants
 from langchain_openai import ChatOpenAI
 import os
 import subprocess
@@ -255,17 +256,10 @@ def publish_now():
         
         # Get the scheduled post
         if scheduler_tool:
-            # Get all scheduled posts
-            all_posts = scheduler_tool.get_scheduled_posts()
+            post_result = scheduler_tool.get_post(post_id)
+            post_to_publish = post_result.get('post')
             
-            if all_posts.get('success', False):
-                # Find the post with the given ID
-                post_to_publish = None
-                for post in all_posts.get('scheduled_posts', []):
-                    if post.get('id') == post_id:
-                        post_to_publish = post
-                        break
-                
+            if post_result.get('success', False):
                 if post_to_publish:
                     # Publish the post immediately
                     result = agent.post_content(
@@ -430,7 +424,7 @@ def schedule_content_route():
         if posts_result.get('success', False):
             scheduled_posts = posts_result.get('scheduled_posts', [])
             # Sort by schedule time
-            scheduled_posts.sort(key=lambda x: x.get('schedule_time', ''))
+            scheduled_posts.sort(key=lambda x: x.get('schedule_epoch') or 0)
     
     if request.method == 'POST':
         try:
@@ -452,6 +446,10 @@ def schedule_content_route():
                 # Convert schedule_time to datetime
                 schedule_datetime = datetime.fromisoformat(schedule_time.replace('Z', '+00:00'))
                 
+                # Resize and re-encode the image for the platform in the background
+                if image_path:
+                    prepare_variants(image_path, [platform])
+                
                 result = agent.schedule_content(
                     content=content,
                     platform=platform,
@@ -465,7 +463,7 @@ def schedule_content_route():
                     if posts_result.get('success', False):
                         scheduled_posts = posts_result.get('scheduled_posts', [])
                         # Sort by schedule time
-                        scheduled_posts.sort(key=lambda x: x.get('schedule_time', ''))
+                        scheduled_posts.sort(key=lambda x: x.get('schedule_epoch') or 0)
                 
                 flash('Content scheduled successfully!', 'success')
         except Exception as e:
@@ -715,17 +713,10 @@ def publish_post(post_id):
     try:
         # Get the scheduled post
         if scheduler_tool:
-            # Get all scheduled posts
-            all_posts = scheduler_tool.get_scheduled_posts()
+            post_result = scheduler_tool.get_post(post_id)
+            post_to_publish = post_result.get('post')
             
-            if all_posts.get('success', False):
-                # Find the post with the given ID
-                post_to_publish = None
-                for post in all_posts.get('scheduled_posts', []):
-                    if post.get('id') == post_id:
-                        post_to_publish = post
-                        break
-                
+            if post_result.get('success', False):
                 if post_to_publish:
                     platform = post_to_publish.get('platform')
                     content = post_to_publish.get('content')
@@ -0,0 +1,13 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+from src.utils import ttl_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Give every test its own persisted caches instead of the ones in CACHE_DIR."""
+    monkeypatch.setattr(ttl_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(ttl_cache, "_caches", {})
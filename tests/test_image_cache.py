@@ -0,0 +1,139 @@
+"""
+Tests for the generated image cache.
+"""
+
+import os
+import time
+import multiprocessing
+from src.utils.image_cache import ImageCache, generation_key
+
+
+def _put_images(directory, prefix, count):
+    cache = ImageCache(str(directory), 10 ** 9, 0)
+    for i in range(count):
+        cache.put(f"{prefix}{i}", f"{prefix}{i}".encode(), "image/png")
+
+
+def age(path, seconds):
+    """Pretend an image was last used some seconds ago."""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_generation_key_ignores_prompt_case_and_whitespace():
+    first = generation_key("model", "A  red\nfox", None, {"n": 1})
+    assert first == generation_key("model", "a red fox", None, {"n": 1})
+    assert first != generation_key("model", "a red fox", "digest", {"n": 1})
+
+
+def test_hit_returns_the_image_and_marks_it_used(tmp_path):
+    cache = ImageCache(str(tmp_path), 10 ** 6, 0)
+    path = cache.put("key", b"image", "image/png")
+    age(path, 100)
+    index = (cache.index_path, cache.journal_path)
+    before = [os.stat(p).st_mtime_ns if os.path.exists(p) else None for p in index]
+
+    entry = cache.get("key")
+
+    assert entry["image_path"] == path
+    assert entry["mime_type"] == "image/png"
+    assert os.path.getmtime(path) > time.time() - 10
+    # A hit does not rewrite the index
+    assert [os.stat(p).st_mtime_ns if os.path.exists(p) else None for p in index] == before
+    assert cache.get("other") is None
+
+
+def test_least_recently_used_images_are_evicted(tmp_path):
+    cache = ImageCache(str(tmp_path), 10, 0)
+    first = cache.put("first", b"1" * 4, "image/png")
+    second = cache.put("second", b"2" * 4, "image/png")
+    age(first, 30)
+    age(second, 20)
+    # Using the oldest image makes the second one the least recently used
+    cache.get("first")
+
+    third = cache.put("third", b"3" * 4, "image/png")
+
+    assert not os.path.exists(second)
+    assert cache.get("second") is None
+    assert os.path.exists(first) and os.path.exists(third)
+    assert cache.get("first") and cache.get("third")
+
+
+def test_recently_used_images_are_kept_over_budget(tmp_path):
+    cache = ImageCache(str(tmp_path), 4, 60)
+    old = cache.put("old", b"1" * 4, "image/png")
+    recent = cache.put("recent", b"2" * 4, "image/png")
+    age(old, 120)
+
+    cache.put("new", b"3" * 4, "image/png")
+
+    assert not os.path.exists(old)
+    assert os.path.exists(recent)
+    assert cache.get("recent")
+
+
+def test_deleted_image_is_a_miss(tmp_path):
+    cache = ImageCache(str(tmp_path), 10 ** 6, 0)
+    os.remove(cache.put("key", b"image", "image/png"))
+
+    assert cache.get("key") is None
+    assert ImageCache(str(tmp_path), 10 ** 6, 0).get("key") is None
+
+
+def test_instances_keep_each_others_entries(tmp_path):
+    first = ImageCache(str(tmp_path), 10 ** 6, 0)
+    second = ImageCache(str(tmp_path), 10 ** 6, 0)
+    first.get("warm up")
+
+    first.put("a", b"a", "image/png")
+    second.put("b", b"b", "image/png")
+    first.put("c", b"c", "image/png")
+
+    reopened = ImageCache(str(tmp_path), 10 ** 6, 0)
+    assert all(reopened.get(key) for key in "abc")
+    assert second.get("c")
+
+
+def test_eviction_sees_images_indexed_by_other_instances(tmp_path):
+    first = ImageCache(str(tmp_path), 8, 0)
+    second = ImageCache(str(tmp_path), 8, 0)
+    old = first.put("old", b"1" * 4, "image/png")
+    unindexed = second.put(None, b"2" * 4, "image/png")
+    age(old, 60)
+    age(unindexed, 60)
+    second.put("kept", b"3" * 4, "image/png")
+
+    # Only the indexed images count; the newest entry pushes out the oldest
+    newest = second.put("newest", b"4" * 4, "image/png")
+
+    assert not os.path.exists(old)
+    assert os.path.exists(unindexed)
+    assert first.get("old") is None
+    assert first.get("newest")["image_path"] == newest
+
+
+def test_compaction_keeps_entries(tmp_path):
+    cache = ImageCache(str(tmp_path), 10 ** 6, 0, compact_bytes=512)
+    for i in range(30):
+        cache.put(f"key{i}", f"image{i}".encode(), "image/png")
+
+    reopened = ImageCache(str(tmp_path), 10 ** 6, 0)
+
+    assert all(reopened.get(f"key{i}") for i in range(30))
+    assert os.path.getsize(cache.index_path) > 0
+
+
+def test_concurrent_processes_do_not_lose_entries(tmp_path):
+    processes = [
+        multiprocessing.get_context("spawn").Process(target=_put_images, args=(tmp_path, prefix, 20))
+        for prefix in ("a", "b", "c")
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    cache = ImageCache(str(tmp_path), 10 ** 9, 0)
+    for prefix in ("a", "b", "c"):
+        assert all(cache.get(f"{prefix}{i}") for i in range(20))
@@ -0,0 +1,100 @@
+"""
+Tests for the per-platform image variants.
+"""
+
+import os
+import pytest
+from src.utils import image_variants
+from src.utils.image_variants import PLATFORM_PROFILES, optimized_image
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture(autouse=True)
+def variants_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "variants"
+    monkeypatch.setattr(image_variants, "IMAGE_VARIANTS_DIR", str(directory))
+    yield directory
+    if image_variants._pool is not None:
+        image_variants._pool.shutdown()
+        image_variants._pool = None
+
+
+def make_image(path, size=(64, 48), mode="RGB", color=(200, 40, 40), image_format=None):
+    Image.new(mode, size, color).save(path, image_format)
+    return str(path)
+
+
+def render(source, profile, tmp_path):
+    return image_variants._render_variant(source, str(tmp_path / "variant"), PLATFORM_PROFILES[profile])
+
+
+def test_large_image_is_scaled_and_reencoded(tmp_path):
+    source = make_image(tmp_path / "large.png", size=(3000, 1500))
+
+    linkedin = render(source, "linkedin", tmp_path)
+    with Image.open(linkedin) as image:
+        assert (image.format, image.size) == ("JPEG", (1200, 600))
+
+    twitter = render(source, "twitter", tmp_path)
+    with Image.open(twitter) as image:
+        assert (image.format, image.size) == ("WEBP", (2048, 1024))
+
+
+def test_transparency_is_kept(tmp_path):
+    source = make_image(tmp_path / "alpha.png", size=(3000, 3000), mode="RGBA", color=(0, 0, 0, 0))
+
+    with Image.open(render(source, "linkedin", tmp_path)) as image:
+        assert image.format == "PNG" and image.mode == "RGBA"
+    with Image.open(render(source, "twitter", tmp_path)) as image:
+        assert image.format == "WEBP" and image.mode == "RGBA"
+
+
+def test_opaque_alpha_channel_is_dropped(tmp_path):
+    source = make_image(tmp_path / "opaque.png", size=(3000, 3000), mode="RGBA", color=(10, 20, 30, 255))
+
+    with Image.open(render(source, "linkedin", tmp_path)) as image:
+        assert image.format == "JPEG"
+
+
+def test_small_accepted_image_is_used_as_it_is(tmp_path):
+    # A flat PNG is smaller than any JPEG of it
+    source = make_image(tmp_path / "small.png", size=(32, 32))
+
+    variant = render(source, "linkedin", tmp_path)
+
+    assert variant.endswith(".png")
+    with open(source, "rb") as f, open(variant, "rb") as g:
+        assert f.read() == g.read()
+
+
+def test_small_image_in_other_format_is_reencoded(tmp_path):
+    source = make_image(tmp_path / "small.bmp", size=(32, 32), image_format="BMP")
+
+    with Image.open(render(source, "twitter", tmp_path)) as image:
+        assert (image.format, image.size) == ("WEBP", (32, 32))
+
+
+@pytest.mark.parametrize("name, platform", [
+    ("animation.gif", "twitter"),
+    ("missing.png", "linkedin"),
+    ("image.png", "mastodon"),
+])
+def test_other_files_are_uploaded_unchanged(tmp_path, name, platform):
+    source = str(tmp_path / name)
+    if name != "missing.png":
+        make_image(source)
+
+    assert optimized_image(source, platform) == source
+    assert optimized_image(None, platform) is None
+
+
+def test_variant_is_rendered_once(tmp_path, variants_dir, monkeypatch):
+    source = make_image(tmp_path / "large.png", size=(3000, 1500))
+
+    variant = optimized_image(source, "x")
+    assert os.path.dirname(variant) == str(variants_dir)
+
+    # A second request is a file lookup
+    monkeypatch.setattr(image_variants, "_get_pool", lambda: pytest.fail("rendered again"))
+    assert optimized_image(source, "twitter") == variant
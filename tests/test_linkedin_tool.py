@@ -0,0 +1,278 @@
+"""
+Tests for LinkedInTool against a fake LinkedIn API.
+"""
+
+import json
+import time
+import asyncio
+import pytest
+from src.tools import linkedin_tool
+from src.tools.linkedin_tool import LinkedInTool
+from src.utils import ttl_cache
+
+API = "https://api.linkedin.com/v2"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = json.dumps(body if body is not None else {})
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeLinkedIn:
+    """
+    Answers requests from queued responses per method and URL.
+
+    A URL without queued responses answers 500. Both the sync session and
+    the async arequest helper are routed here.
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.calls = []
+
+    def add(self, method, url, *responses):
+        self.responses.setdefault((method, url), []).extend(responses)
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url.split("?")[0], kwargs))
+        queued = self.responses.get((method, url.split("?")[0]))
+        if not queued:
+            return FakeResponse(500, {"message": "unexpected request"})
+        return queued.pop(0) if len(queued) > 1 else queued[0]
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    async def arequest(self, method, url, **kwargs):
+        return self.request(method, url, **kwargs)
+
+    def urls(self, method="POST"):
+        return [url for call_method, url, _ in self.calls if call_method == method]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeLinkedIn()
+    fake.add("GET", f"{API}/me", FakeResponse(200, {"id": "abc"}))
+    monkeypatch.setattr(linkedin_tool, "arequest", fake.arequest)
+    return fake
+
+
+@pytest.fixture
+def tool(api):
+    tool = LinkedInTool()
+    tool._access_token = "token"
+    tool._http = api
+    return tool
+
+
+def test_author_is_resolved_once_per_token(tool, api):
+    api.add("POST", f"{API}/shares", FakeResponse(201, {"id": "urn:li:share:1"}))
+
+    assert tool._execute("First")["success"]
+    assert tool._execute("Second")["success"]
+    assert asyncio.run(tool.aexecute("Third"))["success"]
+
+    assert api.urls("GET") == [f"{API}/me"]
+    assert api.calls[-1][2]["json"]["owner"] == "urn:li:person:abc"
+
+
+def test_rejected_author_is_resolved_again(tool, api):
+    api.add("POST", f"{API}/shares", FakeResponse(401), FakeResponse(201, {"id": "urn:li:share:1"}))
+    api.add("POST", f"{API}/ugcPosts", FakeResponse(401), FakeResponse(201, {"id": "urn:li:share:1"}))
+
+    assert not tool._execute("First")["success"]
+    assert tool._execute("Second")["success"]
+
+    assert api.urls("GET") == [f"{API}/me", f"{API}/me"]
+
+
+def test_other_tokens_resolve_their_own_author(tool, api):
+    api.add("POST", f"{API}/shares", FakeResponse(201, {"id": "urn:li:share:1"}))
+    tool._execute("First")
+
+    tool._access_token = "other-token"
+    tool._execute("Second")
+
+    assert api.urls("GET") == [f"{API}/me", f"{API}/me"]
+
+
+def test_working_endpoint_is_tried_first(tool, api):
+    api.add("POST", f"{API}/shares", FakeResponse(403, {"message": "ACCESS_DENIED"}))
+    api.add("POST", f"{API}/ugcPosts", FakeResponse(201, {"id": "urn:li:share:1"}))
+
+    assert tool._execute("First")["success"]
+    assert tool._execute("Second")["success"]
+
+    assert api.urls() == [f"{API}/shares", f"{API}/ugcPosts", f"{API}/ugcPosts"]
+
+
+def test_failing_endpoint_is_demoted(tool, api):
+    api.add("POST", f"{API}/shares", FakeResponse(403, {"message": "ACCESS_DENIED"}), FakeResponse(201, {"id": "urn:li:share:2"}))
+    api.add("POST", f"{API}/ugcPosts", FakeResponse(201, {"id": "urn:li:share:1"}), FakeResponse(500))
+    tool._execute("First")
+
+    # ugcPosts breaks; shares works again
+    assert tool._execute("Second")["success"]
+    assert tool._execute("Third")["success"]
+
+    assert api.urls()[2:] == [f"{API}/ugcPosts", f"{API}/shares", f"{API}/shares"]
+
+
+def test_assets_endpoint_is_never_remembered_for_organizations(tool, api):
+    api.add("GET", f"{API}/organizations/42", FakeResponse(200, {"id": 42}))
+    api.add("POST", f"{API}/assets", FakeResponse(200, {"value": {"asset": "urn:li:digitalmediaAsset:1"}}))
+
+    assert tool._post_as_organization("First", org_id="42")["success"]
+    assert tool._post_as_organization("Second", org_id="42")["success"]
+
+    assert api.urls() == [f"{API}/shares", f"{API}/ugcPosts", f"{API}/assets"] * 2
+
+
+def test_organization_permission_is_checked_once(tool, api):
+    api.add("GET", f"{API}/organizations/42", FakeResponse(200, {"id": 42}))
+    api.add("POST", f"{API}/shares", FakeResponse(201, {"id": "urn:li:share:1"}))
+
+    assert tool._post_as_organization("First", org_id="42")["success"]
+    assert tool._post_as_organization("Second", org_id="42")["success"]
+
+    assert api.urls("GET") == [f"{API}/organizations/42"]
+
+
+def test_organization_denial_is_cached_briefly(tool, api, monkeypatch):
+    monkeypatch.setattr(linkedin_tool, "LINKEDIN_ORG_PERMISSION_DENIED_TTL", 0.2)
+    api.add("GET", f"{API}/organizations/42", FakeResponse(403, {"message": "ACCESS_DENIED"}), FakeResponse(200, {"id": 42}))
+    api.add("POST", f"{API}/shares", FakeResponse(201, {"id": "urn:li:share:1"}))
+
+    first = tool._post_as_organization("First", org_id="42")
+    second = tool._post_as_organization("Second", org_id="42")
+    assert not first["success"]
+    assert second == first
+    assert api.urls("GET") == [f"{API}/organizations/42"]
+
+    # Access granted in the meantime is picked up once the denial expires
+    time.sleep(0.3)
+    assert tool._post_as_organization("Third", org_id="42")["success"]
+    assert api.urls("GET") == [f"{API}/organizations/42"] * 2
+
+
+def test_organization_permissions_are_per_token(tool, api):
+    api.add("GET", f"{API}/organizations/42", FakeResponse(200, {"id": 42}))
+    api.add("POST", f"{API}/shares", FakeResponse(201, {"id": "urn:li:share:1"}))
+    tool._post_as_organization("First", org_id="42")
+
+    tool._access_token = "other-token"
+    tool._post_as_organization("Second", org_id="42")
+
+    assert api.urls("GET") == [f"{API}/organizations/42"] * 2
+
+
+def test_ugc_post_follows_redirect(tool, api):
+    api.add("POST", f"{API}/ugcPosts", FakeResponse(302, headers={"Location": f"{API}/ugcPosts/redirected"}))
+    api.add("POST", f"{API}/ugcPosts/redirected", FakeResponse(201, {"id": "urn:li:share:1"}))
+
+    result = tool._execute("Hello")
+
+    assert result["success"], result
+    assert result["post_id"] == "urn:li:share:1"
+    assert api.urls()[-2:] == [f"{API}/ugcPosts", f"{API}/ugcPosts/redirected"]
+
+
+def test_async_ugc_post_follows_redirect(tool, api):
+    api.add("POST", f"{API}/ugcPosts", FakeResponse(302, headers={"Location": f"{API}/ugcPosts/redirected"}))
+    api.add("POST", f"{API}/ugcPosts/redirected", FakeResponse(201, {"id": "urn:li:share:1"}))
+
+    result = asyncio.run(tool.aexecute("Hello"))
+
+    assert result["success"], result
+    assert result["post_id"] == "urn:li:share:1"
+    assert api.urls()[-2:] == [f"{API}/ugcPosts", f"{API}/ugcPosts/redirected"]
+
+
+def comment(time_ms):
+    return {"id": f"c{time_ms}", "created": {"time": time_ms}, "message": {"text": f"comment {time_ms}"}}
+
+
+def comment_pages(*pages):
+    """Responses for a post's comments, newest first, one per page."""
+    total = sum(len(page) for page in pages)
+    return [FakeResponse(200, {"elements": [comment(t) for t in page], "paging": {"total": total}}) for page in pages]
+
+
+COMMENTS = f"{API}/socialActions/urn:li:share:7/comments"
+
+
+@pytest.fixture
+def small_pages(monkeypatch):
+    monkeypatch.setattr(linkedin_tool, "LINKEDIN_COMMENTS_PAGE_SIZE", 2)
+
+
+def comment_ids(result):
+    assert result["success"], result
+    return [c["id"] for c in result["comments"]]
+
+
+def test_new_only_returns_comments_after_the_mark(tool, api, small_pages):
+    api.add("GET", COMMENTS, *comment_pages([5, 4], [3]))
+    assert comment_ids(tool.get_post_comments("7", new_only=True)) == ["c5", "c4", "c3"]
+
+    api.responses[("GET", COMMENTS)] = comment_pages([7, 6], [5, 4], [3])
+    api.calls.clear()
+    result = tool.get_post_comments("7", new_only=True)
+
+    assert comment_ids(result) == ["c7", "c6"]
+    assert result["comments"][0]["text"] == "comment 7"
+    # The second page holds only seen comments, so the third is never requested
+    assert api.urls("GET") == [COMMENTS] * 2
+
+
+def test_full_fetch_ignores_and_keeps_the_mark(tool, api, small_pages):
+    api.add("GET", COMMENTS, *comment_pages([5, 4], [3]))
+    tool.get_post_comments("7", new_only=True)
+
+    api.responses[("GET", COMMENTS)] = comment_pages([5, 4], [3])
+    assert comment_ids(tool.get_post_comments("7")) == ["c5", "c4", "c3"]
+
+    api.responses[("GET", COMMENTS)] = comment_pages([6, 5], [4, 3])
+    assert comment_ids(tool.get_post_comments("7", new_only=True)) == ["c6"]
+
+
+def test_mark_survives_a_restart(tool, api, small_pages, monkeypatch):
+    api.add("GET", COMMENTS, *comment_pages([5, 4], [3]))
+    tool.get_post_comments("7", new_only=True)
+
+    # A new process starts without the in-memory caches
+    monkeypatch.setattr(ttl_cache, "_caches", {})
+    restarted = LinkedInTool()
+    restarted._access_token = "token"
+    restarted._http = api
+    api.responses[("GET", COMMENTS)] = comment_pages([6, 5], [4, 3])
+
+    assert comment_ids(restarted.get_post_comments("7", new_only=True)) == ["c6"]
+
+
+def test_failed_fetch_keeps_the_mark(tool, api, small_pages):
+    api.add("GET", COMMENTS, *comment_pages([5, 4], [3]))
+    tool.get_post_comments("7", new_only=True)
+
+    api.responses[("GET", COMMENTS)] = comment_pages([8, 7], [6, 5])[:1] + [FakeResponse(500)]
+    assert not tool.get_post_comments("7", new_only=True)["success"]
+
+    api.responses[("GET", COMMENTS)] = comment_pages([8, 7], [6, 5])
+    assert comment_ids(tool.get_post_comments("7", new_only=True)) == ["c8", "c7", "c6"]
+
+
+def test_async_new_only_shares_the_mark(tool, api, small_pages):
+    api.add("GET", COMMENTS, *comment_pages([5, 4], [3]))
+    assert comment_ids(asyncio.run(tool.aget_post_comments("7", new_only=True))) == ["c5", "c4", "c3"]
+
+    api.responses[("GET", COMMENTS)] = comment_pages([6, 5], [4, 3])
+    assert comment_ids(tool.get_post_comments("7", new_only=True)) == ["c6"]
@@ -0,0 +1,68 @@
+"""
+Tests for importing a JSON schedule into SQLite.
+"""
+
+import json
+from src.utils.migrate_schedule import migrate_schedule
+from src.utils.schedule_store import JsonScheduleStore, SqliteScheduleStore
+
+
+def make_post(post_id, status="scheduled", **fields):
+    post = {
+        "id": post_id,
+        "platform": "linkedin",
+        "content": f"Post {post_id}",
+        "status": status,
+        "schedule_time": "2030-01-01T10:00:00"
+    }
+    post.update(fields)
+    return post
+
+
+def test_changes_in_the_journal_are_imported(tmp_path):
+    source = str(tmp_path / "schedule.json")
+    json_store = JsonScheduleStore(source)
+    json_store.save({"scheduled_posts": [make_post("published"), make_post("kept")]})
+    json_store.update_post("published", {"status": "published", "platform_post_id": "urn:1"})
+    json_store.add_post(make_post("added"))
+
+    result = migrate_schedule(source, str(tmp_path / "schedule.db"))
+
+    store = SqliteScheduleStore(str(tmp_path / "schedule.db"))
+    assert result["imported"] == 3
+    assert store.get_post("published")["status"] == "published"
+    assert store.get_post("added") is not None
+    assert [post["id"] for post in store.list_posts(status="scheduled")] == ["kept", "added"]
+
+
+def test_archive_is_imported(tmp_path):
+    source = str(tmp_path / "schedule.json")
+    json_store = JsonScheduleStore(source)
+    json_store.add_posts([
+        make_post("old", status="published", published_at="2020-01-01T12:00:00"),
+        make_post("pending")
+    ])
+    json_store.archive_posts()
+
+    result = migrate_schedule(source, str(tmp_path / "schedule.db"))
+
+    store = SqliteScheduleStore(str(tmp_path / "schedule.db"))
+    assert result["archived"] == 1
+    assert [post["id"] for post in store.list_posts()] == ["pending"]
+    assert store.get_archived_post("old")["status"] == "published"
+
+
+def test_existing_posts_are_skipped_or_replaced(tmp_path):
+    source = tmp_path / "schedule.json"
+    source.write_text(json.dumps({"scheduled_posts": [make_post("a", content="New"), make_post("b"), make_post("b")]}))
+    target = str(tmp_path / "schedule.db")
+    SqliteScheduleStore(target).add_post(make_post("a", content="Old"))
+
+    result = migrate_schedule(str(source), target)
+    assert result["imported"] == 2
+    assert result["skipped"] == 1
+    assert result["renamed"] == [{"old_id": "b", "new_id": "b-2"}]
+    assert SqliteScheduleStore(target).get_post("a")["content"] == "Old"
+
+    migrate_schedule(str(source), target, replace=True)
+    assert SqliteScheduleStore(target).get_post("a")["content"] == "New"
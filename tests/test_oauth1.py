@@ -0,0 +1,55 @@
+"""
+Tests for OAuth 1.0a request signing.
+"""
+
+from urllib.parse import unquote
+from src.utils.oauth1 import OAuth1Signer, normalize_url, percent_encode
+
+# Twitter's published signing example ("Creating a signature" in the X API docs)
+CONSUMER_KEY = "xvz1evFS4wEEPTGEFPHBog"
+CONSUMER_SECRET = "kAcSOqF21Fu85e7zjz7ZN2U4ZRhfV3WpwPAoE3Z7kBw"
+TOKEN = "370773112-GmHxMAgYyLbNEtIKZeRNFsMKPR9EyMZeS9weJAEb"
+TOKEN_SECRET = "LswwdoUaIvS8ltyTt5jkRh4J50vUPVVHtR2YPi5kE"
+URL = "https://api.twitter.com/1.1/statuses/update.json?include_entities=true"
+STATUS = "Hello Ladies + Gentlemen, a signed OAuth request!"
+
+
+def make_signer():
+    return OAuth1Signer(CONSUMER_KEY, CONSUMER_SECRET, TOKEN, TOKEN_SECRET)
+
+
+def test_signature_matches_twitters_example():
+    params = {
+        "status": STATUS,
+        "oauth_consumer_key": CONSUMER_KEY,
+        "oauth_nonce": "kYjzVBB8Y0ZFabxSWbWovY3uYSQ2pTgmZeNu2VS4cg",
+        "oauth_signature_method": "HMAC-SHA1",
+        "oauth_timestamp": "1318622958",
+        "oauth_token": TOKEN,
+        "oauth_version": "1.0"
+    }
+
+    assert make_signer().signature("post", URL, params) == "hCtSmYh+iHYCEqBWrE7C7hYmtUk="
+
+
+def test_authorization_header_is_signed_with_its_own_nonce():
+    header = make_signer().authorization_header("POST", URL, {"status": STATUS})
+
+    assert header.startswith("OAuth ")
+    fields = dict(
+        (key, unquote(value.strip('"')))
+        for key, value in (field.split("=", 1) for field in header[len("OAuth "):].split(", "))
+    )
+    assert fields["oauth_consumer_key"] == CONSUMER_KEY
+    assert fields["oauth_token"] == TOKEN
+    signature = fields.pop("oauth_signature")
+    assert make_signer().signature("POST", URL, dict(fields, status=STATUS)) == signature
+
+
+def test_percent_encoding_and_url_normalization():
+    assert percent_encode(STATUS) == "Hello%20Ladies%20%2B%20Gentlemen%2C%20a%20signed%20OAuth%20request%21"
+    assert percent_encode("~-._") == "~-._"
+    assert normalize_url("HTTPS://API.Twitter.com:443/2/tweets?b=2&a=1#x") == (
+        "https://api.twitter.com/2/tweets",
+        [("b", "2"), ("a", "1")]
+    )
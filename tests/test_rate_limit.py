@@ -0,0 +1,89 @@
+"""
+Tests for the sliding-window RateLimiter.
+"""
+
+import time
+import threading
+import pytest
+from src.utils import rate_limit
+from src.utils.rate_limit import RateLimiter
+
+
+class FakeClock:
+    """A monotonic clock that only moves when the limiter sleeps."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limit.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_calls_within_quota_do_not_wait(clock):
+    limiter = RateLimiter(3, period=60)
+
+    assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert clock.sleeps == []
+
+
+def test_call_over_quota_waits_for_the_oldest_to_expire(clock):
+    limiter = RateLimiter(2, period=60)
+    limiter.acquire()
+    clock.now += 10
+    limiter.acquire()
+
+    assert limiter.acquire() == pytest.approx(50)
+    # The window slides: the next slot frees when the second call expires
+    assert limiter.acquire() == pytest.approx(10)
+
+
+def test_calls_outside_the_window_are_forgotten(clock):
+    limiter = RateLimiter(2, period=60)
+    limiter.acquire()
+    limiter.acquire()
+    clock.now += 60
+
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+
+
+def test_zero_disables_the_limit(clock):
+    limiter = RateLimiter(0)
+
+    assert all(limiter.acquire() == 0.0 for _ in range(100))
+    assert clock.sleeps == []
+
+
+def test_quota_is_shared_by_threads():
+    limiter = RateLimiter(4, period=0.3)
+    waits = []
+    lock = threading.Lock()
+
+    def call():
+        waited = limiter.acquire()
+        with lock:
+            waits.append(waited)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(1 for waited in waits if waited == 0.0) == 4
+    # The second four only ran once the window had moved past the first four
+    assert time.monotonic() - started >= 0.3
@@ -0,0 +1,206 @@
+"""
+Tests for the JSON and SQLite schedule stores.
+"""
+
+import os
+import datetime
+import threading
+import sqlite3
+import pytest
+from src.utils.schedule_store import (
+    JsonScheduleStore,
+    SqliteScheduleStore,
+    ScheduleConflictError,
+    to_epoch
+)
+
+
+def make_post(post_id, status="scheduled", schedule_time="2030-01-01T10:00:00", **fields):
+    post = {
+        "id": post_id,
+        "platform": "linkedin",
+        "content": f"Post {post_id}",
+        "status": status,
+        "schedule_time": schedule_time
+    }
+    post.update(fields)
+    return post
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store_factory(request, tmp_path):
+    """Open stores on one schedule, so that tests can play several processes."""
+    if request.param == "json":
+        return lambda: JsonScheduleStore(str(tmp_path / "schedule.json"))
+    return lambda: SqliteScheduleStore(str(tmp_path / "schedule.db"))
+
+
+@pytest.fixture
+def store(store_factory):
+    return store_factory()
+
+
+def test_round_trip(store_factory):
+    store = store_factory()
+    store.add_posts([make_post("a"), make_post("b", schedule_time="2030-01-01T09:00:00")])
+    store.update_post("a", {"status": "published", "platform_post_id": "urn:1"})
+    store.add_post(make_post("c"))
+    store.delete_post("c")
+
+    reopened = store_factory()
+    assert sorted(post["id"] for post in reopened.list_posts()) == ["a", "b"]
+    assert reopened.get_post("a")["status"] == "published"
+    assert [post["id"] for post in reopened.list_posts(status="scheduled")] == ["b"]
+    assert reopened.get_post("c") is None
+
+
+def test_load_and_save_documents(store_factory):
+    store = store_factory()
+    store.save({"scheduled_posts": [make_post("a"), make_post("b")]})
+    schedule = store_factory().load()
+
+    assert [post["id"] for post in schedule["scheduled_posts"]] == ["a", "b"]
+    assert "last_updated" in schedule
+
+
+def test_add_rejects_existing_ids(store):
+    store.add_post(make_post("a"))
+
+    with pytest.raises((ValueError, sqlite3.IntegrityError)):
+        store.add_posts([make_post("b"), make_post("a", content="Duplicate")])
+
+    assert [post["id"] for post in store.list_posts()] == ["a"]
+    assert store.get_post("a")["content"] == "Post a"
+
+
+def test_json_journal_is_replayed_by_other_readers(tmp_path):
+    schedule_file = str(tmp_path / "schedule.json")
+    writer = JsonScheduleStore(schedule_file)
+    reader = JsonScheduleStore(schedule_file)
+    writer.add_posts([make_post("a"), make_post("b")])
+    assert reader.get_post("a") is not None
+
+    writer.update_posts({"a": {"status": "published"}})
+    writer.delete_post("b")
+
+    # The changes live in the journal until the store is compacted
+    assert os.path.exists(f"{schedule_file}.journal")
+    assert reader.get_post("a")["status"] == "published"
+    assert reader.get_post("b") is None
+
+    writer.compact()
+    assert not os.path.exists(f"{schedule_file}.journal")
+    reopened = JsonScheduleStore(schedule_file)
+    assert [(post["id"], post["status"]) for post in reopened.list_posts()] == [("a", "published")]
+    assert reader.get_post("a")["status"] == "published"
+
+
+def test_to_epoch_accepts_offsets_and_local_times():
+    assert to_epoch("2024-01-01T00:00:00Z") == 1704067200
+    assert to_epoch("2024-01-01 02:00:00+02:00") == 1704067200
+    local = datetime.datetime(2024, 1, 1, 12, 30)
+    assert to_epoch(local.isoformat()) == int(local.timestamp())
+    assert to_epoch("") is None
+
+
+def test_schedule_epoch_follows_schedule_time(store):
+    store.add_post(make_post("a", schedule_time="2030-01-01T09:00:00"))
+    assert store.get_post("a")["schedule_epoch"] == to_epoch("2030-01-01T09:00:00")
+
+    store.update_post("a", {"schedule_time": "2031-01-01T09:00:00"})
+    assert store.get_post("a")["schedule_epoch"] == to_epoch("2031-01-01T09:00:00")
+
+
+def test_due_posts_are_ordered_by_schedule_time(store):
+    store.add_posts([
+        make_post("late", schedule_time="2020-01-03T00:00:00"),
+        make_post("early", schedule_time="2020-01-01T00:00:00+02:00"),
+        make_post("future", schedule_time="2030-01-01T00:00:00"),
+        make_post("done", status="published", schedule_time="2020-01-02T00:00:00")
+    ])
+
+    due = store.due_posts(to_epoch("2025-01-01T00:00:00"))
+
+    assert [post["id"] for post in due] == ["early", "late"]
+
+
+def test_lookups_follow_status_and_platform_id_changes(store):
+    store.add_posts([make_post("a"), make_post("b")])
+    store.update_posts({
+        "a": {"status": "published", "platform_post_id": "urn:1"},
+        "b": {"status": "failed"}
+    })
+    store.update_post("a", {"platform_post_id": "urn:2"})
+
+    assert store.get_post_by_platform_id("urn:1") is None
+    assert store.get_post_by_platform_id("urn:2")["id"] == "a"
+    assert [post["id"] for post in store.list_posts(status="failed")] == ["b"]
+    assert store.list_posts(status="scheduled") == []
+    assert [post["id"] for post in store.get_posts(["b", "missing", "a"])] == ["b", "a"]
+
+
+def test_returned_posts_are_copies(store):
+    store.add_post(make_post("a"))
+
+    store.get_post("a")["status"] = "changed"
+    store.list_posts()[0]["content"] = "changed"
+
+    assert store.get_post("a")["status"] == "scheduled"
+    assert store.get_post("a")["content"] == "Post a"
+
+
+def test_concurrent_updates_of_a_post_are_kept(store_factory):
+    store_factory().add_post(make_post("a"))
+
+    def update(prefix):
+        # A store per thread, like separate processes
+        store = store_factory()
+        for i in range(30):
+            store.update_post("a", {f"{prefix}{i}": i})
+
+    threads = [threading.Thread(target=update, args=(prefix,)) for prefix in ("x", "y", "z")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    post = store_factory().get_post("a")
+    assert all(post.get(f"{prefix}{i}") == i for prefix in ("x", "y", "z") for i in range(30))
+
+
+def test_save_rejects_stale_version(store_factory):
+    store = store_factory()
+    store.add_post(make_post("a"))
+    schedule, version = store.load_with_version()
+
+    # Another process changes the schedule after it was loaded
+    store_factory().add_post(make_post("b"))
+
+    schedule["scheduled_posts"].append(make_post("c"))
+    with pytest.raises(ScheduleConflictError):
+        store.save(schedule, expected_version=version)
+    assert sorted(post["id"] for post in store_factory().list_posts()) == ["a", "b"]
+
+
+def test_archive_moves_finished_posts(store_factory):
+    store = store_factory()
+    store.add_posts([
+        make_post("published", status="published", published_at="2020-01-01T12:00:00"),
+        make_post("failed", status="failed", failed_at="2020-01-02T12:00:00"),
+        make_post("recent", status="published", published_at="2020-01-03T12:00:00"),
+        make_post("pending")
+    ])
+
+    archived = store.archive_posts(finished_before=to_epoch("2020-01-02T23:00:00"))
+
+    assert archived == 2
+    reopened = store_factory()
+    assert sorted(post["id"] for post in reopened.list_posts()) == ["pending", "recent"]
+    assert reopened.get_archived_post("published")["status"] == "published"
+    assert [post["id"] for post in reopened.list_archived_posts(status="failed")] == ["failed"]
+    assert [post["id"] for post in reopened.list_archived_posts()] == ["published", "failed"]
+    in_range = reopened.list_archived_posts(start_epoch=to_epoch("2020-01-02T00:00:00"))
+    assert [post["id"] for post in in_range] == ["failed"]
+    recently_published = reopened.recently_published(to_epoch("2020-01-01T00:00:00"))
+    assert sorted(post["id"] for post in recently_published) == ["published", "recent"]
+    assert store.archive_posts(finished_before=to_epoch("2020-01-02T23:00:00")) == 0
@@ -0,0 +1,216 @@
+"""
+Tests for the scheduler's due index and dispatch order.
+"""
+
+import time
+import asyncio
+import datetime
+import threading
+import pytest
+from src.scheduler import PostScheduler
+
+
+def make_post(post_id, platform="linkedin", schedule_time="2020-01-01T10:00:00", **fields):
+    post = {
+        "id": post_id,
+        "platform": platform,
+        "content": f"Post {post_id}",
+        "status": "scheduled",
+        "schedule_time": schedule_time
+    }
+    post.update(fields)
+    return post
+
+
+class FakePublisher:
+    """Stands in for _post_to_platform, recording the order posts start in."""
+
+    def __init__(self, duration=0.05):
+        self.duration = duration
+        self.started = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, post):
+        with self._lock:
+            self.started.append(post["id"])
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.duration)
+        with self._lock:
+            self.active -= 1
+        return {"success": True, "post_id": f"platform-{post['id']}"}
+
+
+@pytest.fixture
+def make_scheduler(tmp_path):
+    schedulers = []
+
+    def make(**kwargs):
+        scheduler = PostScheduler(schedule_file=str(tmp_path / f"schedule{len(schedulers)}.json"), **kwargs)
+        scheduler._post_to_platform = FakePublisher()
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield make
+    for scheduler in schedulers:
+        if scheduler._executor is not None:
+            scheduler._executor.shutdown()
+
+
+def publish_due(scheduler):
+    """Run the thread engine until every due post has been published and saved."""
+    scheduler._rebuild_due_index()
+    scheduler._publish_due_posts()
+    while scheduler._in_flight or scheduler._waiting:
+        scheduler._collect_results(1)
+    scheduler._flush_results(force=True)
+
+
+def test_due_posts_come_out_in_schedule_order(make_scheduler):
+    scheduler = make_scheduler()
+    scheduler.store.add_posts([
+        make_post("third", schedule_time="2020-01-03T00:00:00"),
+        make_post("future", schedule_time="2999-01-01T00:00:00"),
+        make_post("first", schedule_time="2020-01-01T00:00:00"),
+        make_post("cancelled", schedule_time="2020-01-02T00:00:00"),
+        make_post("second", schedule_time="2020-01-02T12:00:00")
+    ])
+    scheduler._rebuild_due_index()
+    scheduler.store.update_post("cancelled", {"status": "cancelled"})
+
+    due = scheduler._take_due_posts()
+
+    assert [post["id"] for post in due] == ["first", "second", "third"]
+    assert [post_id for _, post_id in scheduler._due_heap] == ["future"]
+    assert scheduler._take_due_posts() == []
+
+
+def test_due_index_notices_schedule_changes(make_scheduler):
+    scheduler = make_scheduler()
+    scheduler._rebuild_due_index()
+    assert not scheduler._due_index_is_stale()
+
+    scheduler.store.add_post(make_post("new"))
+
+    assert scheduler._due_index_is_stale()
+    scheduler._rebuild_due_index()
+    assert [post["id"] for post in scheduler._take_due_posts()] == ["new"]
+
+
+def test_sleeps_until_the_next_post_is_due(make_scheduler):
+    scheduler = make_scheduler(change_poll_interval=30)
+    scheduler._rebuild_due_index()
+    assert scheduler._seconds_until_next_check() == 30
+
+    soon = datetime.datetime.now() + datetime.timedelta(seconds=10)
+    scheduler.store.add_post(make_post("soon", schedule_time=soon.isoformat()))
+    scheduler._rebuild_due_index()
+
+    assert 5 < scheduler._seconds_until_next_check() <= 10
+
+
+def test_results_are_written_back(make_scheduler):
+    scheduler = make_scheduler()
+    scheduler.store.add_posts([make_post(f"p{i}") for i in range(5)])
+
+    publish_due(scheduler)
+
+    for post in scheduler.store.list_posts():
+        assert post["status"] == "published"
+        assert post["platform_post_id"] == f"platform-{post['id']}"
+    assert not scheduler._in_flight_ids
+    assert not scheduler._platform_active.get("linkedin")
+
+
+def test_busy_platform_does_not_hold_up_others(make_scheduler):
+    scheduler = make_scheduler(max_workers=2, platform_concurrency={"linkedin": 1, "twitter": 1})
+    scheduler.store.add_posts(
+        [make_post(f"l{i}", schedule_time=f"2020-01-01T10:00:0{i}") for i in range(5)]
+        + [make_post("t0", platform="twitter", schedule_time="2020-01-01T11:00:00")]
+    )
+
+    publish_due(scheduler)
+
+    started = scheduler._post_to_platform.started
+    assert set(started[:2]) == {"l0", "t0"}
+    assert [post_id for post_id in started if post_id.startswith("l")] == [f"l{i}" for i in range(5)]
+
+
+def test_ordered_lanes_publish_one_post_at_a_time(make_scheduler):
+    scheduler = make_scheduler(ordered_platforms=["twitter"])
+    scheduler.store.add_posts([
+        make_post(f"t{i}", platform="twitter", account="brand", schedule_time=f"2020-01-01T10:00:0{i}")
+        for i in range(6)
+    ])
+
+    publish_due(scheduler)
+
+    assert scheduler._post_to_platform.started == [f"t{i}" for i in range(6)]
+    assert scheduler._post_to_platform.max_active == 1
+    assert not scheduler._lanes
+    assert {post["status"] for post in scheduler.store.list_posts()} == {"published"}
+
+
+def test_account_limit_lets_other_accounts_through(make_scheduler):
+    scheduler = make_scheduler(account_concurrency=1)
+    scheduler.store.add_posts(
+        [make_post(f"a{i}", account="a", schedule_time=f"2020-01-01T10:00:0{i}") for i in range(3)]
+        + [make_post("b0", account="b", schedule_time="2020-01-01T11:00:00")]
+    )
+
+    publish_due(scheduler)
+
+    started = scheduler._post_to_platform.started
+    assert set(started[:2]) == {"a0", "b0"}
+    assert not scheduler._account_active
+
+
+class FakeAsyncPublisher(FakePublisher):
+    """Stands in for _apost_to_platform."""
+
+    async def __call__(self, post):
+        self.started.append(post["id"])
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.duration)
+        self.active -= 1
+        return {"success": True, "post_id": f"platform-{post['id']}"}
+
+
+def apublish_due(scheduler):
+    """Run the asyncio engine until every due post has been published and saved."""
+    async def run():
+        scheduler._rebuild_due_index()
+        scheduler._adispatch(scheduler._take_due_posts())
+        while scheduler._tasks:
+            await asyncio.gather(*scheduler._tasks)
+        await scheduler._aflush_results(force=True)
+
+    scheduler._apost_to_platform = FakeAsyncPublisher()
+    asyncio.run(run())
+
+
+def test_async_engine_caps_posts_in_flight(make_scheduler):
+    scheduler = make_scheduler(max_workers=2, platform_concurrency={"linkedin": 10})
+    scheduler.store.add_posts([make_post(f"p{i}") for i in range(6)])
+
+    apublish_due(scheduler)
+
+    assert scheduler._apost_to_platform.max_active == 2
+    assert {post["status"] for post in scheduler.store.list_posts()} == {"published"}
+    assert not scheduler._in_flight_ids
+    assert not scheduler._async_semaphores
+
+
+def test_async_engine_busy_platform_does_not_hold_up_others(make_scheduler):
+    scheduler = make_scheduler(max_workers=2, platform_concurrency={"linkedin": 1, "twitter": 1})
+    scheduler.store.add_posts(
+        [make_post(f"l{i}", schedule_time=f"2020-01-01T10:00:0{i}") for i in range(4)]
+        + [make_post("t0", platform="twitter", schedule_time="2020-01-01T11:00:00")]
+    )
+
+    apublish_due(scheduler)
+
+    assert set(scheduler._apost_to_platform.started[:2]) == {"l0", "t0"}
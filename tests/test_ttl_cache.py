@@ -0,0 +1,80 @@
+"""
+Tests for TTLCache persistence.
+"""
+
+import time
+import multiprocessing
+from src.utils.ttl_cache import TTLCache
+
+
+def _set_keys(path, prefix, count):
+    cache = TTLCache(60, str(path))
+    for i in range(count):
+        cache.set(f"{prefix}{i}", i)
+
+
+def test_entries_survive_a_restart(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = TTLCache(60, str(path))
+    cache.set("kept", {"uri": "files/1"})
+    cache.set("removed", 1)
+    cache.invalidate("removed")
+
+    reopened = TTLCache(60, str(path))
+
+    assert reopened.get("kept") == {"uri": "files/1"}
+    assert reopened.get("removed") is None
+
+
+def test_expired_entries_are_not_returned(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = TTLCache(60, str(path))
+    cache.set("short", 1, ttl=0.05)
+    cache.set("long", 2)
+    time.sleep(0.1)
+
+    assert cache.get("short") is None
+    assert TTLCache(60, str(path)).get("short", "missing") == "missing"
+    assert TTLCache(60, str(path)).get("long") == 2
+
+
+def test_instances_see_each_others_writes(tmp_path):
+    path = tmp_path / "cache.json"
+    first = TTLCache(60, str(path))
+    second = TTLCache(60, str(path))
+
+    first.set("a", 1)
+    second.set("b", 2)
+    assert first.get("b") == 2
+    assert second.get("a") == 1
+
+    first.clear()
+    assert second.get("a") is None
+    assert second.get("b") is None
+
+
+def test_compaction_keeps_entries(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = TTLCache(60, str(path), compact_bytes=512)
+    for i in range(100):
+        cache.set(f"key{i}", i)
+
+    reopened = TTLCache(60, str(path))
+
+    assert [reopened.get(f"key{i}") for i in range(100)] == list(range(100))
+
+
+def test_concurrent_processes_do_not_lose_writes(tmp_path):
+    path = tmp_path / "cache.json"
+    processes = [
+        multiprocessing.get_context("spawn").Process(target=_set_keys, args=(path, prefix, 50))
+        for prefix in ("a", "b", "c")
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    cache = TTLCache(60, str(path))
+    for prefix in ("a", "b", "c"):
+        assert [cache.get(f"{prefix}{i}") for i in range(50)] == list(range(50))
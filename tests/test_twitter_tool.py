@@ -0,0 +1,141 @@
+"""
+Tests for TwitterTool against a fake X API.
+"""
+
+import json
+import asyncio
+import pytest
+from src.tools import twitter_tool
+from src.tools.twitter_tool import TwitterTool
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = json.dumps(body if body is not None else {})
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeSearch:
+    """
+    The recent search endpoint for one conversation, two replies per page.
+
+    A next_token is the ID of the first reply of the next page, so new replies
+    don't shift the pages of a search that is being resumed.
+    """
+
+    page_size = 2
+
+    def __init__(self):
+        self.reply_ids = []
+        self.requests = []
+        self.fail = False
+
+    def get(self, url, headers=None, params=None):
+        self.requests.append(dict(params))
+        if self.fail:
+            return FakeResponse(400, {"title": "Invalid next_token"})
+        ids = sorted((i for i in self.reply_ids if i > int(params.get("since_id", 0))), reverse=True)
+        if params.get("next_token"):
+            ids = [i for i in ids if i <= int(params["next_token"])]
+        page, rest = ids[:self.page_size], ids[self.page_size:]
+        meta = {"result_count": len(page)}
+        if page:
+            meta["newest_id"] = str(page[0])
+        if rest:
+            meta["next_token"] = str(rest[0])
+        return FakeResponse(200, {"data": [{"id": str(i), "text": f"Reply {i}"} for i in page], "meta": meta})
+
+    async def arequest(self, method, url, headers=None, params=None):
+        return self.get(url, headers=headers, params=params)
+
+
+@pytest.fixture
+def search(monkeypatch):
+    fake = FakeSearch()
+    monkeypatch.setattr(twitter_tool, "arequest", fake.arequest)
+    monkeypatch.setattr(twitter_tool, "TWITTER_REPLY_MAX_PAGES", 2)
+    return fake
+
+
+@pytest.fixture
+def tool(search):
+    tool = TwitterTool()
+    tool._api_key = tool._api_secret = tool._access_token = tool._access_token_secret = "secret"
+    tool._http = search
+    return tool
+
+
+def reply_ids(result):
+    assert result["success"], result
+    return [int(reply["id"]) for reply in result["replies"]]
+
+
+def test_new_only_returns_replies_since_the_last_call(tool, search):
+    search.reply_ids = [1, 2, 3]
+    assert reply_ids(tool.get_tweet_replies("t", new_only=True)) == [3, 2, 1]
+
+    search.reply_ids += [4, 5]
+    assert reply_ids(tool.get_tweet_replies("t", new_only=True)) == [5, 4]
+    assert search.requests[-1]["since_id"] == "3"
+
+    assert reply_ids(tool.get_tweet_replies("t", new_only=True)) == []
+
+
+def test_cut_short_search_is_resumed_before_moving_since_id(tool, search):
+    search.reply_ids = [1, 2, 3, 4, 5, 6]
+    first = tool.get_tweet_replies("t", new_only=True)
+    assert reply_ids(first) == [6, 5, 4, 3]
+    assert first["has_more"]
+
+    search.reply_ids.append(7)
+    second = tool.get_tweet_replies("t", new_only=True)
+    assert reply_ids(second) == [2, 1]
+    assert not second["has_more"]
+    assert second["newest_id"] == "6"
+    assert search.requests[-1]["next_token"] == "2"
+    assert "since_id" not in search.requests[-1]
+
+    assert reply_ids(tool.get_tweet_replies("t", new_only=True)) == [7]
+    assert search.requests[-1]["since_id"] == "6"
+
+
+def test_failed_resume_searches_from_since_id_again(tool, search):
+    search.reply_ids = [1, 2]
+    tool.get_tweet_replies("t", new_only=True)
+    search.reply_ids += [3, 4, 5, 6, 7, 8]
+    assert reply_ids(tool.get_tweet_replies("t", new_only=True)) == [8, 7, 6, 5]
+
+    search.fail = True
+    assert not tool.get_tweet_replies("t", new_only=True)["success"]
+    search.fail = False
+
+    assert reply_ids(tool.get_tweet_replies("t", new_only=True)) == [8, 7, 6, 5]
+    assert search.requests[-2]["since_id"] == "2"
+    assert "next_token" not in search.requests[-2]
+
+
+def test_full_fetch_leaves_the_cursor_alone(tool, search):
+    search.reply_ids = [1, 2, 3]
+    assert reply_ids(tool.get_tweet_replies("t")) == [3, 2, 1]
+
+    assert reply_ids(tool.get_tweet_replies("t", new_only=True)) == [3, 2, 1]
+    assert "since_id" not in search.requests[-1]
+
+
+def test_legacy_cursor_is_read_as_since_id(tool, search):
+    search.reply_ids = [1, 2, 3, 4]
+    tool._reply_cursors().set("t", "2")
+
+    assert reply_ids(tool.get_tweet_replies("t", new_only=True)) == [4, 3]
+
+
+def test_async_search_is_resumed_too(tool, search):
+    search.reply_ids = [1, 2, 3, 4, 5, 6]
+    assert reply_ids(asyncio.run(tool.aget_tweet_replies("t", new_only=True))) == [6, 5, 4, 3]
+
+    assert reply_ids(asyncio.run(tool.aget_tweet_replies("t", new_only=True))) == [2, 1]
+    assert reply_ids(asyncio.run(tool.aget_tweet_replies("t", new_only=True))) == []